@@ -0,0 +1,257 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Every benchmark runs against its own throwaway SQLite database so it never
+touches ``db.sqlite3``. Run them from ``backend/employee_project``::
+
+    python benchmarks/bench_indexes.py --rows 1000000
+"""
+import asyncio
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DEPARTMENTS = ['Engineering', 'Finance', 'Marketing', 'Sales', 'Support', 'Legal', 'HR', 'Operations']
+POSITIONS = ['Engineer', 'Manager', 'Analyst', 'Director', 'Associate', 'Intern']
+
+
+def setup_django(db_path=None):
+    """
+    Point the project settings at a scratch database and initialise Django.
+    Returns the database path.
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_project.settings')
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='employee-bench-'), 'bench.sqlite3')
+
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+
+    import django
+    django.setup()
+    return db_path
+
+
+def migrate(target=None):
+    from django.core.management import call_command
+    args = ['employee_app', target] if target else []
+    call_command('migrate', *args, verbosity=0)
+
+
+def seed_employees(count, batch_size=50000, seed=0, search_index=True):
+    """
+    Insert ``count`` users and employees with raw executemany() calls.
+
+    With ``search_index=False`` the FTS5 table and its triggers are dropped
+    first, for benchmarks that don't exercise search and want fast seeding.
+    """
+    from django.db import connection, transaction
+
+    if not search_index:
+        from employee_app.search import DROP_SEARCH_TABLE_SQL
+        with connection.cursor() as cursor:
+            for statement in DROP_SEARCH_TABLE_SQL:
+                cursor.execute(statement)
+
+    rng = random.Random(seed)
+    start = date(2000, 1, 1)
+    employee_columns = [
+        'id', 'user_id', 'first_name', 'last_name', 'email', 'phone', 'department',
+        'position', 'hire_date', 'salary', 'is_active',
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM employee_app_customuser')
+        offset = cursor.fetchone()[0]
+        # Benchmarks may run against older migration states
+        existing = {column.name for column in connection.introspection.get_table_description(cursor, 'models_employee')}
+    versioned = 'version' in existing
+    if versioned:
+        employee_columns += ['updated_at', 'version']
+    for batch_start in range(0, count, batch_size):
+        ids = range(offset + batch_start + 1, offset + min(batch_start + batch_size, count) + 1)
+        users = [
+            (i, '!', f'user{i}', '', '', f'user{i}@example.com', False, False, True, False, '2024-01-01 00:00:00')
+            for i in ids
+        ]
+        employees = [
+            (i, i, f'First{i}', f'Last{i}', f'employee{i}@example.com', '5550100',
+             rng.choice(DEPARTMENTS), rng.choice(POSITIONS),
+             (start + timedelta(days=rng.randrange(9000))).isoformat(),
+             f'{rng.randrange(30000, 200000)}.00', rng.random() > 0.1)
+            for i in ids
+        ]
+        if versioned:
+            employees = [row + ('2024-01-01 00:00:00', 1) for row in employees]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                'INSERT INTO employee_app_customuser (id, password, username, first_name, last_name, email, '
+                'is_superuser, is_staff, is_active, is_admin, date_joined) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+                users,
+            )
+            cursor.executemany(
+                f'INSERT INTO models_employee ({", ".join(employee_columns)}) '
+                f'VALUES ({", ".join(["%s"] * len(employee_columns))})',
+                employees,
+            )
+
+
+def seed_form_responses(form_id, fields, count, batch_size=20000, seed=0):
+    """
+    Insert ``count`` responses to ``form_id`` answering every ``(field_id,
+    field_type)`` in ``fields`` with a random, schema-valid answer.
+    """
+    from django.db import connection, transaction
+    from employee_app.models import FormResponse, FormResponseField
+
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    # (text answer, answer_number, answer_date) per field type
+    answer_for = {
+        'number': lambda: (lambda n: (str(n), n, None))(rng.randrange(18, 70)),
+        'date': lambda: (lambda d: (d, None, d))((start + timedelta(days=rng.randrange(3650))).isoformat()),
+        'text': lambda: (rng.choice(DEPARTMENTS), None, None),
+        'password': lambda: ('secret', None, None),
+    }
+    answer_table = FormResponseField._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {FormResponse._meta.db_table}')
+        offset = cursor.fetchone()[0]
+        # Benchmarks may run against older migration states
+        typed = 'answer_number' in {column.name for column in connection.introspection.get_table_description(cursor, answer_table)}
+    columns = ['form_response_id', 'form_field_id', 'answer'] + (['answer_number', 'answer_date'] if typed else [])
+    for batch_start in range(0, count, batch_size):
+        ids = range(offset + batch_start + 1, offset + min(batch_start + batch_size, count) + 1)
+        answers = [
+            ((response_id, field_id) + answer_for[field_type]())[:len(columns)]
+            for response_id in ids for field_id, field_type in fields
+        ]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FormResponse._meta.db_table} (id, form_id, created_at) VALUES (%s, %s, %s)',
+                [(response_id, form_id, '2024-01-01 00:00:00') for response_id in ids],
+            )
+            cursor.executemany(
+                f'INSERT INTO {answer_table} ({", ".join(columns)}) VALUES ({", ".join(["%s"] * len(columns))})',
+                answers,
+            )
+
+
+async def asgi_request(application, method, path, body=b'', headers=(), query_string=''):
+    """
+    Send one HTTP request straight to an ASGI ``application``, no server in
+    between. Returns ``(status, body)``.
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [
+            (b'host', b'testserver'), (b'content-length', str(len(body)).encode()),
+            *((name.encode(), value.encode()) for name, value in headers),
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # The app only asks again to detect a disconnect
+            await asyncio.Event().wait()
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    response = {'status': None, 'body': []}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['body'].append(message.get('body', b''))
+
+    await application(scope, receive, send)
+    return response['status'], b''.join(response['body'])
+
+
+def wsgi_request(application, method, path, body=b'', headers=(), query_string=''):
+    """
+    Call a WSGI ``application`` directly with one request. Returns
+    ``(status, body)``.
+    """
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers:
+        key = name.upper().replace('-', '_')
+        environ[key if key in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{key}'] = value
+
+    response = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+
+    chunks = application(environ, start_response)
+    try:
+        content = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return response['status'], content
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else float('nan')
+
+
+def timed(fn, repeat=5):
+    """
+    Run ``fn`` ``repeat`` times and return the median wall time in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    line = '  '.join(f'{{:<{width}}}' for width in widths)
+    print(line.format(*headers))
+    print(line.format(*('-' * width for width in widths)))
+    for row in rows:
+        print(line.format(*row))
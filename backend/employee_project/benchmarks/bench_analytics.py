@@ -0,0 +1,64 @@
+"""
+Time to summarise a form's responses with analytics.summarize_form(), and
+the cached read through GET /api/form/<id>/analytics/, plus a number
+filter on the text answer against the typed, indexed column.
+
+    python benchmarks/bench_analytics.py --responses 1000000
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, seed_form_responses, setup_django, timed
+
+FIELD_TYPES = ['number', 'number', 'date', 'text', 'text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--responses', type=int, default=200000)
+    parser.add_argument('--bins', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from employee_app import analytics
+    from employee_app.form_schema import FormSchema
+    from django.db.models import FloatField
+    from django.db.models.functions import Cast
+    from employee_app.models import CustomUser, Form, FormField, FormResponseField
+
+    form = Form.objects.create(title='Survey')
+    fields = FormField.objects.bulk_create([
+        FormField(form=form, label=f'Q{i}', field_type=field_type, order=i) for i, field_type in enumerate(FIELD_TYPES)
+    ])
+    started = time.perf_counter()
+    seed_form_responses(form.pk, [(field.pk, field.field_type) for field in fields], args.responses)
+    print(f'seeded {args.responses:,} responses x {len(fields)} answers in {time.perf_counter() - started:.1f}s')
+
+    schema = FormSchema.build(form.pk)
+    setup_test_environment()
+    client = APIClient()
+    client.force_authenticate(CustomUser.objects.create(username='bench'))
+    url = reverse('form-analytics', args=[form.pk])
+    client.get(url)
+
+    typed_filter = FormResponseField.objects.filter(form_field=fields[0], answer_number__gte=65)
+    text_filter = FormResponseField.objects.annotate(value=Cast('answer', FloatField())).filter(form_field=fields[0], value__gte=65)
+    print_table(('step', 'ms'), [
+        ('filter number >= 65 (CAST on text)', f'{timed(lambda: text_filter.count(), repeat=3):.0f}'),
+        ('filter number >= 65 (typed index)', f'{timed(lambda: typed_filter.count(), repeat=3):.0f}'),
+        ('field_counts (all fields)', f'{timed(lambda: analytics.field_counts(list(schema.fields)), repeat=3):.0f}'),
+        ('number_summaries', f'{timed(lambda: analytics.number_summaries([fields[0].pk, fields[1].pk]), repeat=3):.0f}'),
+        ('number_histogram (one field)', f'{timed(lambda: analytics.number_histogram(fields[0].pk, 18, 69, args.bins), repeat=3):.0f}'),
+        ('date_ranges', f'{timed(lambda: analytics.date_ranges([fields[2].pk]), repeat=3):.0f}'),
+        ('summarize_form (uncached)', f'{timed(lambda: analytics.summarize_form(schema, bins=args.bins), repeat=3):.0f}'),
+        ('GET analytics (cached)', f'{timed(lambda: client.get(url), repeat=20):.1f}'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
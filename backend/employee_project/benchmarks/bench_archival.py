@@ -0,0 +1,64 @@
+"""
+Archival throughput, and the effect of moving old responses out of the hot
+tables on the admin changelist query (latest 100 responses of one form).
+
+    python benchmarks/bench_archival.py --responses 500000 --archive-fraction 0.8
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, seed_form_responses, setup_django, timed
+
+FIELD_TYPES = ['number', 'date', 'text', 'text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--responses', type=int, default=500000)
+    parser.add_argument('--archive-fraction', type=float, default=0.8)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    from datetime import timedelta
+    from django.utils import timezone
+    from employee_app import archival
+    from employee_app.models import Form, FormField, FormResponse, FormResponseField
+
+    form = Form.objects.create(title='Survey')
+    fields = FormField.objects.bulk_create([
+        FormField(form=form, label=f'Q{i}', field_type=field_type, order=i) for i, field_type in enumerate(FIELD_TYPES)
+    ])
+    seed_form_responses(form.pk, [(field.pk, field.field_type) for field in fields], args.responses)
+    # Spread creation times over two years, oldest first
+    now = timezone.now()
+    step = timedelta(days=730) / args.responses
+    FormResponse.objects.bulk_update(
+        [FormResponse(id=i, created_at=now - timedelta(days=730) + step * i) for i in range(1, args.responses + 1)],
+        ['created_at'], batch_size=5000,
+    )
+    cutoff = now - timedelta(days=730) + step * int(args.responses * args.archive_fraction)
+
+    def changelist():
+        return list(FormResponse.objects.filter(form=form).select_related('form').order_by('-created_at')[:100])
+
+    def count():
+        return FormResponse.objects.filter(form=form).count()
+
+    before = (timed(changelist), timed(count), FormResponseField.objects.count())
+    started = time.perf_counter()
+    moved = archival.archive_form_responses(before=cutoff, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    after = (timed(changelist), timed(count), FormResponseField.objects.count())
+
+    print(f'archived {moved:,} responses in {elapsed:.1f}s ({moved / elapsed:,.0f} responses/s)')
+    print_table(('', 'changelist ms', 'COUNT(*) ms', 'hot answer rows'), [
+        ('before', f'{before[0]:.2f}', f'{before[1]:.2f}', f'{before[2]:,}'),
+        ('after', f'{after[0]:.2f}', f'{after[1]:.2f}', f'{after[2]:,}'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Requests per second and latency percentiles of the employee list, employee
+detail and profile endpoints with many concurrent clients: the synchronous
+views behind the WSGI handler (limited to a pool of server threads, like a
+threaded WSGI server) against their async counterparts behind the ASGI
+handler. Each handler is driven in-process, in its own Python process.
+
+    python benchmarks/bench_asgi.py --clients 500 --requests 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from _common import asgi_request, migrate, percentile, print_table, seed_employees, setup_django, wsgi_request
+
+
+def request_plan(count, employees, seed=0):
+    """
+    A reproducible mix of list (with a hire date filter), detail and
+    profile requests, as ``(path, query_string)`` pairs.
+    """
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            plan.append(('/api/employees/', f'page_size=20&hire_date=20{rng.randrange(0, 24):02d}-01-01'))
+        elif kind < 0.8:
+            plan.append((f'/api/employees/{rng.randrange(1, employees + 1)}/', ''))
+        else:
+            plan.append(('/api/profile/', ''))
+    return plan
+
+
+def run_wsgi(plan, headers, clients, threads):
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    server_threads = threading.BoundedSemaphore(threads)
+    latencies = []
+    errors = []
+
+    def client(share):
+        for path, query in share:
+            started = time.perf_counter()
+            with server_threads:
+                status, _ = wsgi_request(application, 'GET', path, headers=headers, query_string=query)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors.append(status)
+
+    workers = [threading.Thread(target=client, args=(plan[index::clients],)) for index in range(clients)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies, errors
+
+
+def run_asgi(plan, headers, clients):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    latencies = []
+    errors = []
+
+    async def client(share):
+        for path, query in share:
+            started = time.perf_counter()
+            status, _ = await asgi_request(application, 'GET', path, headers=headers, query_string=query)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors.append(status)
+
+    async def main():
+        await asyncio.gather(*(client(plan[index::clients]) for index in range(clients)))
+
+    asyncio.run(main())
+    return latencies, errors
+
+
+def serve(args):
+    """
+    Child process: replay the request plan against one handler and print
+    the results as JSON.
+    """
+    # The async views are routed only when the setting is on at startup
+    os.environ['ASYNC_API_VIEWS'] = '1' if args.server == 'asgi' else '0'
+    setup_django(args.db)
+
+    from django.test.utils import setup_test_environment
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from employee_app.models import CustomUser
+
+    setup_test_environment()
+    token = str(RefreshToken.for_user(CustomUser.objects.get(pk=1)).access_token)
+    headers = [('authorization', f'Bearer {token}')]
+    plan = request_plan(args.requests, args.employees)
+
+    started = time.perf_counter()
+    if args.server == 'wsgi':
+        latencies, errors = run_wsgi(plan, headers, args.clients, args.wsgi_threads)
+    else:
+        latencies, errors = run_asgi(plan, headers, args.clients)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'requests_per_second': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5),
+        'p99': percentile(latencies, 0.99),
+        'errors': len(errors),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--wsgi-threads', type=int, default=32, help='server threads for the WSGI run')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.server:
+        serve(args)
+        return
+
+    args.db = setup_django()
+    migrate()
+    seed_employees(args.employees, search_index=False)
+
+    results = []
+    for server in ('wsgi', 'asgi'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--server', server, '--db', args.db,
+             '--employees', str(args.employees), '--clients', str(args.clients),
+             '--requests', str(args.requests), '--wsgi-threads', str(args.wsgi_threads)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        name = f'WSGI ({args.wsgi_threads} threads)' if server == 'wsgi' else 'ASGI (async views)'
+        results.append((
+            name,
+            f"{result['requests_per_second']:,.0f}",
+            f"{result['p50']:.1f}",
+            f"{result['p99']:.1f}",
+            result['errors'],
+        ))
+    print_table(('handler', 'requests/s', 'p50 ms', 'p99 ms', 'errors'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Throughput of the bulk employee import (column-wise validation and
+multi-row inserts) compared with creating the same rows one
+EmployeeSerializer at a time.
+
+    python benchmarks/bench_bulk_import.py --rows 10000
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, setup_django
+
+
+def make_rows(count, prefix):
+    return [
+        {
+            'user': {'username': f'{prefix}{i}', 'email': f'{prefix}{i}@example.com'},
+            'first_name': f'First{i}',
+            'last_name': f'Last{i}',
+            'email': f'{prefix}-employee{i}@example.com',
+            'phone': '5550100',
+            'department': 'Engineering',
+            'position': 'Engineer',
+            'hire_date': '2024-01-15',
+            'salary': '65000.00',
+        }
+        for i in range(count)
+    ]
+
+
+def bulk_import(rows):
+    from employee_app.bulk import import_employees
+
+    employee_ids, errors = import_employees(rows)
+    assert not errors, errors[:3]
+
+
+def serializer_per_row(rows):
+    from employee_app.serializers import EmployeeSerializer
+
+    for row in rows:
+        serializer = EmployeeSerializer(data=row)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    results = []
+    for name, fn, count in [
+        ('EmployeeSerializer per row', serializer_per_row, min(args.rows, 2000)),
+        ('bulk import', bulk_import, args.rows),
+    ]:
+        rows = make_rows(count, prefix=name.split()[0].lower())
+        started = time.perf_counter()
+        fn(rows)
+        elapsed = time.perf_counter() - started
+        results.append((name, count, f'{elapsed:.2f}', f'{count / elapsed:,.0f}'))
+    print_table(('path', 'rows', 'seconds', 'rows/s'), results)
+
+
+if __name__ == '__main__':
+    main()
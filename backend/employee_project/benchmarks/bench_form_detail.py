@@ -0,0 +1,66 @@
+"""
+Reads per second of GET /api/form/<id>/ with a cold cache (prefetch,
+serialize and render on every request) and with the rendered-body cache.
+
+    python benchmarks/bench_form_detail.py --sections 10 --fields 200
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sections', type=int, default=10)
+    parser.add_argument('--fields', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+    from employee_app.cache import form_cache
+    from employee_app.models import CustomUser, Form, FormField, FormSection
+
+    setup_test_environment()
+    form = Form.objects.create(title='Survey')
+    sections = FormSection.objects.bulk_create([
+        FormSection(form=form, title=f'Section {i}', order=i) for i in range(args.sections)
+    ])
+    FormField.objects.bulk_create([
+        FormField(form=form, section=sections[i % args.sections], label=f'Question {i}', field_type='text', order=i)
+        for i in range(args.fields)
+    ])
+    client = APIClient()
+    client.force_authenticate(CustomUser.objects.create(username='bench'))
+    url = reverse('form-detail', args=[form.pk])
+
+    def cold():
+        form_cache.lru.clear()
+        form_cache.backend.clear()
+        client.get(url)
+
+    def warm():
+        client.get(url)
+
+    def not_modified():
+        client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    etag = client.get(url)['ETag']
+    results = []
+    for name, read in (('cold cache', cold), ('cached body', warm), ('If-None-Match (304)', not_modified)):
+        count = args.requests // 10 if read is cold else args.requests
+        started = time.perf_counter()
+        for _ in range(count):
+            read()
+        elapsed = time.perf_counter() - started
+        results.append((name, f'{elapsed / count * 1000:.3f}', f'{count / elapsed:,.0f}'))
+    print_table(('path', 'ms/request', 'requests/s'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Throughput and peak Python memory of the wide form-response export for
+each format. Peak memory should stay flat as --responses grows.
+
+    python benchmarks/bench_form_export.py --responses 200000
+"""
+import argparse
+import time
+import tracemalloc
+
+from _common import migrate, print_table, seed_form_responses, setup_django
+
+FIELD_TYPES = ['number', 'number', 'date', 'text', 'text']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--responses', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    from employee_app import exports
+    from employee_app.models import Form, FormField, FormResponse
+
+    form = Form.objects.create(title='Survey')
+    fields = FormField.objects.bulk_create([
+        FormField(form=form, label=f'Q{i}', field_type=field_type, order=i) for i, field_type in enumerate(FIELD_TYPES)
+    ])
+    seed_form_responses(form.pk, [(field.pk, field.field_type) for field in fields], args.responses)
+    responses = FormResponse.objects.filter(form=form)
+
+    def export(export_format):
+        return sum(len(chunk) for chunk in exports.stream_form_responses(form.pk, responses, export_format))
+
+    results = []
+    for export_format in exports.FORM_EXPORT_CONTENT_TYPES:
+        started = time.perf_counter()
+        size = export(export_format)
+        elapsed = time.perf_counter() - started
+        # Measured on a second run, as tracing slows the export down
+        tracemalloc.start()
+        export(export_format)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append((
+            export_format, f'{size / 1e6:.1f}', f'{elapsed:.2f}',
+            f'{args.responses / elapsed:,.0f}', f'{peak / 1e6:.1f}',
+        ))
+    print_table(('format', 'MB', 'seconds', 'rows/s', 'peak MB'), results)
+
+
+if __name__ == '__main__':
+    main()
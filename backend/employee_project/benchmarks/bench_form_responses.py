@@ -0,0 +1,78 @@
+"""
+Form responses saved per second: one FormResponseSerializer.save() per
+submission with a create() per answer (the old path), against one batched
+submit_form_responses() call.
+
+    python benchmarks/bench_form_responses.py --responses 2000 --fields 10
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, setup_django
+
+
+def per_answer_create(form, items):
+    from django.db import transaction
+    from employee_app.models import FormResponse, FormResponseField
+    from employee_app.serializers import FormResponseSerializer
+
+    for item in items:
+        serializer = FormResponseSerializer(data=item, context={'form': form})
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            response = FormResponse.objects.create(form=form)
+            for answer in serializer.validated_data['response_fields']:
+                FormResponseField.objects.create(form_response=response, **answer)
+
+
+def per_response_save(form, items):
+    from employee_app.serializers import FormResponseSerializer
+
+    for item in items:
+        serializer = FormResponseSerializer(data=item, context={'form': form})
+        serializer.is_valid(raise_exception=True)
+        serializer.save(form=form)
+
+
+def batched(form, items):
+    from employee_app.bulk import submit_form_responses
+
+    _, _, errors = submit_form_responses(form, items)
+    assert not errors, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--responses', type=int, default=2000)
+    parser.add_argument('--fields', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    from employee_app.models import Form, FormField
+
+    form = Form.objects.create(title='Survey')
+    fields = FormField.objects.bulk_create([
+        FormField(form=form, label=f'Question {i}', field_type='text', order=i) for i in range(args.fields)
+    ])
+    items = [
+        {'response_fields': [{'form_field': field.pk, 'answer': f'answer {n}'} for field in fields]}
+        for n in range(args.responses)
+    ]
+
+    results = []
+    for name, submit in (
+        ('create() per answer', per_answer_create),
+        ('serializer.save() per response', per_response_save),
+        ('submit_form_responses() batch', batched),
+    ):
+        started = time.perf_counter()
+        submit(form, items)
+        elapsed = time.perf_counter() - started
+        results.append((name, f'{elapsed * 1000:.0f}', f'{args.responses / elapsed:,.0f}'))
+    print_table(('path', 'total ms', 'responses/s'), results)
+
+
+if __name__ == '__main__':
+    main()
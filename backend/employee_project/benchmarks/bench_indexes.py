@@ -0,0 +1,77 @@
+"""
+Query plans and timings for the Employee hot paths with and without the
+Employee Meta.indexes (added in 0006_employee_indexes).
+
+    python benchmarks/bench_indexes.py --rows 1000000
+"""
+import argparse
+import time
+
+from _common import migrate, print_table, seed_employees, setup_django, timed
+
+
+def build_queries():
+    from employee_app.filters import EmployeeFilter
+    from employee_app.models import Employee
+    from employee_app.pagination import EmployeeCursorPagination
+
+    employees = Employee.objects.select_related('user')
+    middle = Employee.objects.order_by('-hire_date', 'id').values('hire_date', 'id')[Employee.objects.count() // 2]
+
+    paginator = EmployeeCursorPagination()
+    paginator.ordering_fields = [('hire_date', True), ('id', False)]
+    paginator.field_index = {'hire_date': 0, 'id': 1}
+    deep_page = paginator.get_keyset_filter([middle['hire_date'], middle['id']], reverse=False)
+
+    return [
+        ('list first page', employees.order_by('-hire_date', 'id')[:11]),
+        ('list deep page (keyset)', employees.filter(deep_page).order_by('-hire_date', 'id')[:11]),
+        ('hire_date__gte filter', EmployeeFilter({'hire_date': '2023-06-01'}, queryset=employees).qs.order_by('-hire_date', 'id')[:11]),
+        ('active + department', employees.filter(is_active=True, department='Finance').order_by('-hire_date')[:11]),
+        ('admin position filter', employees.filter(position='Director').order_by('-hire_date')[:100]),
+        ('admin department choices', Employee.objects.order_by('department').values_list('department', flat=True).distinct()),
+    ]
+
+
+def measure(label):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    rows = []
+    for name, queryset in build_queries():
+        plan = ' / '.join(line.split(maxsplit=3)[-1] for line in queryset.explain().splitlines() if line.strip())
+        rows.append((label, name, f'{timed(lambda: list(queryset.all())):.2f}', plan))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    migrate()
+
+    from django.db import connection
+    from employee_app.models import Employee
+
+    # "before" is the schema without the Employee Meta.indexes added in 0006
+    with connection.schema_editor() as schema_editor:
+        for index in Employee._meta.indexes:
+            schema_editor.remove_index(Employee, index)
+
+    started = time.perf_counter()
+    seed_employees(args.rows, search_index=False)
+    print(f'Seeded {args.rows} employees into {db_path} in {time.perf_counter() - started:.1f}s\n')
+
+    rows = measure('before')
+    with connection.schema_editor() as schema_editor:
+        for index in Employee._meta.indexes:
+            schema_editor.add_index(Employee, index)
+    rows += measure('after')
+    print_table(('indexes', 'query', 'median ms', 'plan'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Mixed login and employee-list traffic against the ASGI application, with
+password hashing in the bounded pool and with an effectively unbounded one
+(every login hashes at once, as when hashing ran on the request thread).
+Reports list latency while the logins are in flight, login throughput and
+how many logins were shed with a 503.
+
+    python benchmarks/bench_password_hashing.py --logins 16 --readers 4 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from _common import asgi_request, migrate, percentile, print_table, seed_employees, setup_django
+
+
+async def run_mix(application, token, args):
+    list_latencies = []
+    login_statuses = []
+    deadline = time.perf_counter() + args.seconds
+    body = json.dumps({'username': 'bench', 'password': 'Bench-pass-123'}).encode()
+
+    async def login_client():
+        while time.perf_counter() < deadline:
+            status, _ = await asgi_request(application, 'POST', '/api/login/', body, [('content-type', 'application/json')])
+            login_statuses.append(status)
+            if status == 503:
+                await asyncio.sleep(0.05)
+
+    async def list_client():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            status, _ = await asgi_request(
+                application, 'GET', '/api/employees/', headers=[('authorization', f'Bearer {token}')], query_string='page_size=20',
+            )
+            assert status == 200, status
+            list_latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(
+        *(login_client() for _ in range(args.logins)),
+        *(list_client() for _ in range(args.readers)),
+    )
+    return list_latencies, login_statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--logins', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--readers', type=int, default=4, help='concurrent list clients')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--max-queue', type=int, default=4)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+    seed_employees(args.employees, search_index=False)
+
+    from django.core.asgi import get_asgi_application
+    from django.test.utils import setup_test_environment
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from employee_app.hashing import password_hashers
+    from employee_app.models import CustomUser
+
+    setup_test_environment()
+    user = CustomUser.objects.create_user(username='bench', email='bench@example.com', password='Bench-pass-123')
+    token = str(RefreshToken.for_user(user).access_token)
+    application = get_asgi_application()
+
+    results = []
+    modes = (
+        (f'pool ({args.workers} workers, queue {args.max_queue})', args.workers, args.max_queue),
+        ('unbounded', args.logins, args.logins),
+    )
+    for name, workers, max_queue in modes:
+        password_hashers.shutdown()
+        password_hashers.workers, password_hashers.max_queue = workers, max_queue
+        latencies, statuses = asyncio.run(run_mix(application, token, args))
+        results.append((
+            name,
+            f'{percentile(latencies, 0.5):.1f}',
+            f'{percentile(latencies, 0.95):.1f}',
+            f'{len(latencies) / args.seconds:,.0f}',
+            f'{statuses.count(200) / args.seconds:,.1f}',
+            statuses.count(503),
+        ))
+    print_table(('hashing', 'list p50 ms', 'list p95 ms', 'lists/s', 'logins/s', 'logins shed'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Overhead of QueryMetricsMiddleware: per-request latency of the employee
+list and detail endpoints through the WSGI handler with and without the
+middleware, plus the Server-Timing header it adds.
+
+    python benchmarks/bench_query_metrics.py --requests 500
+"""
+import argparse
+import random
+import statistics
+
+from _common import migrate, print_table, seed_employees, setup_django, timed, wsgi_request
+
+METRICS_MIDDLEWARE = 'employee_app.middleware.QueryMetricsMiddleware'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=500, help='requests per timed run')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+    seed_employees(args.employees, search_index=False)
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from employee_app.models import CustomUser
+
+    setup_test_environment()
+    token = str(RefreshToken.for_user(CustomUser.objects.get(pk=1)).access_token)
+    headers = [('authorization', f'Bearer {token}')]
+
+    # The handler builds its middleware chain from the setting when created
+    with_metrics = WSGIHandler()
+    settings.MIDDLEWARE = [name for name in settings.MIDDLEWARE if name != METRICS_MIDDLEWARE]
+    without_metrics = WSGIHandler()
+
+    rng = random.Random(0)
+    endpoints = {
+        'list': [('/api/employees/', f'page_size=20&hire_date=20{rng.randrange(0, 24):02d}-01-01')
+                 for _ in range(args.requests)],
+        'detail': [(f'/api/employees/{rng.randrange(1, args.employees + 1)}/', '') for _ in range(args.requests)],
+    }
+
+    def replay(application, plan):
+        for path, query in plan:
+            wsgi_request(application, 'GET', path, headers=headers, query_string=query)
+
+    rows = []
+    for name, plan in endpoints.items():
+        replay(with_metrics, plan[:50])  # Warm up connections and caches
+        # Interleave the two handlers so drift affects both alike
+        baseline, instrumented = [], []
+        for _ in range(args.repeat):
+            baseline.append(timed(lambda: replay(without_metrics, plan), repeat=1) / args.requests)
+            instrumented.append(timed(lambda: replay(with_metrics, plan), repeat=1) / args.requests)
+        baseline, instrumented = statistics.median(baseline), statistics.median(instrumented)
+        rows.append((
+            name,
+            f'{baseline * 1000:.0f}',
+            f'{instrumented * 1000:.0f}',
+            f'{(instrumented - baseline) * 1000:+.0f}',
+            f'{(instrumented / baseline - 1) * 100:+.1f}%',
+        ))
+    print_table(('endpoint', 'without us/req', 'with us/req', 'overhead us', 'overhead'), rows)
+
+    settings.MIDDLEWARE = [METRICS_MIDDLEWARE, *settings.MIDDLEWARE]
+    response = Client().get('/api/employees/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    print(f"\nServer-Timing: {response['Server-Timing']}")
+
+
+if __name__ == '__main__':
+    main()
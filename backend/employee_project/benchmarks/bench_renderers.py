@@ -0,0 +1,52 @@
+"""
+Render time and response size of the employee list envelope with DRF's
+stdlib JSONRenderer, the orjson renderer and MessagePack.
+
+    python benchmarks/bench_renderers.py --rows 10000
+"""
+import argparse
+
+from _common import migrate, print_table, seed_employees, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+    seed_employees(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from employee_app.models import Employee
+    from employee_app.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+    from employee_app.serializers import EmployeeSerializer
+
+    employees = Employee.objects.select_related('user').order_by('-hire_date', 'id')[:args.rows]
+    payload = {
+        'statuscode': 200,
+        'title': 'Success',
+        'data': EmployeeSerializer(employees, many=True).data,
+        'errors': None,
+        'message': 'Employees retrieved successfully.',
+    }
+
+    renderers = [('DRF JSONRenderer', JSONRenderer())]
+    if orjson is not None:
+        renderers.append(('ORJSONRenderer', ORJSONRenderer()))
+    if msgpack is not None:
+        renderers.append(('MessagePackRenderer', MessagePackRenderer()))
+
+    results = []
+    baseline = None
+    for name, renderer in renderers:
+        body = renderer.render(payload)
+        elapsed = timed(lambda: renderer.render(payload), repeat=7)
+        baseline = baseline or elapsed
+        results.append((name, f'{len(body):,}', f'{elapsed:.2f}', f'{baseline / elapsed:.1f}x'))
+    print_table(('renderer', 'bytes', 'render ms', 'speedup'), results)
+
+
+if __name__ == '__main__':
+    main()
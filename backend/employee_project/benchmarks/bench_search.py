@@ -0,0 +1,76 @@
+"""
+Employee search latency as the table grows: the first page of a ranked
+free-text search (q=), a column filter and, for reference, the LIKE scan
+the icontains filters used to run. The ranked search is timed with the
+index joined once (search.search_employees) and with the correlated
+rank subquery it replaced, which ran MATCH again for every hit.
+
+Selective terms match a handful of rows whatever the table size; broad
+terms (a department) match a fixed share of it, and ranking has to score
+every hit, so those grow with the table.
+
+    python benchmarks/bench_search.py --sizes 10000 100000 1000000
+"""
+import argparse
+
+from _common import migrate, print_table, seed_employees, setup_django, timed
+
+
+def correlated_rank_search(text):
+    # search_employees(rank=True) before the index was joined
+    from django.db.models import FloatField
+    from django.db.models.expressions import RawSQL
+    from employee_app.models import Employee
+    from employee_app.search import SEARCH_TABLE, build_match_expression, split_terms
+
+    match = build_match_expression(split_terms(text))
+    return Employee.objects.filter(
+        id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', (match,))
+    ).annotate(search_rank=RawSQL(
+        f'SELECT rank FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND rowid = models_employee.id',
+        (match,),
+        output_field=FloatField(),
+    ))
+
+
+def build_queries(size, correlated):
+    from employee_app.filters import EmployeeFilter
+    from employee_app.models import Employee
+
+    employees = Employee.objects.all()
+    selective = f'Last{size // 2}'
+    page = slice(0, 21)
+    queries = []
+    for label, text in (('selective', selective), ('broad', 'Marketing')):
+        queries.append((f'q, {label} (joined)', EmployeeFilter({'q': text}, queryset=employees).qs.order_by('search_rank', 'id')[page]))
+        if correlated:
+            queries.append((f'q, {label} (correlated)', correlated_rank_search(text).order_by('search_rank', 'id')[page]))
+    queries += [
+        ('last_name filter', EmployeeFilter({'last_name': selective}, queryset=employees).qs.order_by('-hire_date', 'id')[page]),
+        ('last_name LIKE scan', employees.filter(last_name__icontains=selective).order_by('-hire_date', 'id')[page]),
+    ]
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--correlated-up-to', type=int, default=100_000,
+                        help='largest table to time the correlated subquery on (it is quadratic in the hits)')
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+
+    rows = []
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed_employees(size - seeded, seed=size)
+        seeded = size
+        for name, queryset in build_queries(size, size <= args.correlated_up_to):
+            rows.append((f'{size:,}', name, f'{timed(lambda: list(queryset.all())):.2f}'))
+    print_table(('employees', 'query', 'median ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
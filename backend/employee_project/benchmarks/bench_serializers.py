@@ -0,0 +1,57 @@
+"""
+Payload size and serialization cost per 1,000 employees for the full
+EmployeeSerializer, a sparse fieldset and the slim list serializer.
+
+    python benchmarks/bench_serializers.py --rows 1000
+"""
+import argparse
+
+from _common import migrate, print_table, seed_employees, setup_django, timed
+
+GRID_FIELDS = ['id', 'first_name', 'last_name', 'department', 'position']
+
+
+def variants(rows):
+    from employee_app.models import Employee
+    from employee_app.serializers import EmployeeListItemSerializer, EmployeeSerializer
+
+    ordered = Employee.objects.order_by('-hire_date', 'id')
+    return [
+        ('EmployeeSerializer (all fields)',
+         lambda: ordered.select_related('user')[:rows],
+         lambda page: EmployeeSerializer(page, many=True).data),
+        ('EmployeeSerializer fields=grid',
+         lambda: ordered.only(*GRID_FIELDS, 'hire_date', 'version')[:rows],
+         lambda page: EmployeeSerializer(page, many=True, fields=GRID_FIELDS).data),
+        ('EmployeeListItemSerializer on .values()',
+         lambda: ordered.values(*GRID_FIELDS, 'hire_date', 'version')[:rows],
+         lambda page: EmployeeListItemSerializer(page, many=True).data),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    migrate()
+    seed_employees(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+
+    results = []
+    for name, fetch, serialize in variants(args.rows):
+        page = list(fetch())
+        payload = JSONRenderer().render(serialize(page))
+        results.append((
+            name,
+            f'{len(payload):,}',
+            f'{timed(lambda: serialize(page), repeat=7):.2f}',
+            f'{timed(lambda: serialize(list(fetch())), repeat=7):.2f}',
+        ))
+    print_table(('serializer', 'JSON bytes', 'serialize ms', 'fetch + serialize ms'), results)
+
+
+if __name__ == '__main__':
+    main()
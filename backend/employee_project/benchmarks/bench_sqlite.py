@@ -0,0 +1,136 @@
+"""
+Simultaneous readers (employee list and form response list) and writers
+(form submissions) against the WSGI application, with the default SQLite
+configuration and with SQLITE_TUNING enabled (WAL, synchronous=NORMAL,
+mmap, page cache, IMMEDIATE transactions, persistent connections). Each
+mode runs in its own process on its own copy of the same database.
+
+    python benchmarks/bench_sqlite.py --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from _common import migrate, percentile, print_table, seed_employees, seed_form_responses, setup_django, wsgi_request
+
+
+def serve(args):
+    """
+    Child process: run the reader/writer mix for ``args.seconds`` and print
+    the results as JSON.
+    """
+    os.environ['DJANGO_SQLITE_TUNED'] = '1' if args.mode == 'tuned' else '0'
+    setup_django(args.db)
+
+    from django.core.wsgi import get_wsgi_application
+    from django.test.utils import setup_test_environment
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from employee_app.models import CustomUser, Form, FormField
+
+    setup_test_environment()
+    application = get_wsgi_application()
+    token = str(RefreshToken.for_user(CustomUser.objects.get(pk=1)).access_token)
+    headers = [('authorization', f'Bearer {token}')]
+    form = Form.objects.get(title='Benchmark')
+    fields = list(FormField.objects.filter(form=form).order_by('order').values_list('id', 'field_type'))
+    deadline = time.perf_counter() + args.seconds
+    reads, writes, read_latencies, write_latencies, errors = [], [], [], [], []
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            if rng.random() < 0.5:
+                path, query = '/api/employees/', f'page_size=20&hire_date=20{rng.randrange(0, 24):02d}-{rng.randrange(1, 13):02d}-01'
+            else:
+                path, query = f'/api/form/{form.pk}/responses/', 'page_size=20'
+            started = time.perf_counter()
+            status, _ = wsgi_request(application, 'GET', path, headers=headers, query_string=query)
+            read_latencies.append((time.perf_counter() - started) * 1000)
+            (reads if status == 200 else errors).append(status)
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            body = json.dumps({'response_fields': [
+                {'form_field': field_id, 'answer': str(rng.randrange(18, 70)) if field_type == 'number' else 'Engineering'}
+                for field_id, field_type in fields
+            ]}).encode()
+            started = time.perf_counter()
+            status, _ = wsgi_request(
+                application, 'POST', f'/api/form/{form.pk}/submit/', body,
+                headers=[*headers, ('content-type', 'application/json')],
+            )
+            write_latencies.append((time.perf_counter() - started) * 1000)
+            (writes if status == 201 else errors).append(status)
+
+    threads = [threading.Thread(target=reader, args=(index,)) for index in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + index,)) for index in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        'reads_per_second': len(reads) / args.seconds,
+        'writes_per_second': len(writes) / args.seconds,
+        'read_p99': percentile(read_latencies, 0.99),
+        'write_p99': percentile(write_latencies, 0.99),
+        'errors': len(errors),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--responses', type=int, default=50000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', choices=('default', 'tuned'), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        serve(args)
+        return
+
+    db_path = setup_django()
+    migrate()
+    seed_employees(args.employees, search_index=False)
+
+    from employee_app.models import Form, FormField
+    form = Form.objects.create(title='Benchmark')
+    fields = FormField.objects.bulk_create([
+        FormField(form=form, label=f'Question {i}', field_type='number' if i % 2 else 'text', order=i) for i in range(5)
+    ])
+    seed_form_responses(form.pk, [(field.pk, field.field_type) for field in fields], args.responses)
+
+    results = []
+    for mode in ('default', 'tuned'):
+        # WAL mode is persistent, so each run gets a fresh copy of the database
+        copy = f'{db_path}.{mode}'
+        shutil.copyfile(db_path, copy)
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--db', copy, '--readers', str(args.readers),
+             '--writers', str(args.writers), '--seconds', str(args.seconds)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append((
+            mode,
+            f"{result['reads_per_second']:,.0f}",
+            f"{result['writes_per_second']:,.0f}",
+            f"{result['read_p99']:.1f}",
+            f"{result['write_p99']:.1f}",
+            result['errors'],
+        ))
+    print_table(('sqlite', 'reads/s', 'writes/s', 'read p99 ms', 'write p99 ms', 'errors'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 from django.contrib import admin
 from .models import CustomUser, Employee, Form, FormSection, FormField, FormResponse, FormResponseField
+from .models import ArchivedFormResponse
+from .cache import form_responses
 
 # CustomUser Admin
 class CustomUserAdmin(admin.ModelAdmin):
@@ -91,6 +93,18 @@ class FormResponseAdmin(admin.ModelAdmin):
     list_filter = ('form', 'created_at')
     search_fields = ('form__title',)
     ordering = ('-created_at',)
+    list_select_related = ('form',)  # Avoid a query per row for the form column
+    show_full_result_count = False  # Skip the extra COUNT(*) over the whole table
+
+    # Deletes send no per-row signals, so refresh the forms' analytics here
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        form_responses.invalidate_on_commit([obj.form_id])
+
+    def delete_queryset(self, request, queryset):
+        form_ids = list(queryset.values_list('form_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        form_responses.invalidate_on_commit(form_ids)
 
 # Register FormResponse with the custom admin
 admin.site.register(FormResponse, FormResponseAdmin)
@@ -104,4 +118,23 @@ class FormResponseFieldAdmin(admin.ModelAdmin):
     ordering = ('form_response',)
 
 # Register FormResponseField with the custom admin
-admin.site.register(FormResponseField, FormResponseFieldAdmin)
\ No newline at end of file
+admin.site.register(FormResponseField, FormResponseFieldAdmin)
+
+
+# Archived FormResponse Admin (read-only; rows are written by the archival job)
+class ArchivedFormResponseAdmin(admin.ModelAdmin):
+    list_display = ('id', 'form', 'period', 'created_at', 'archived_at')
+    list_filter = ('period', 'form')
+    search_fields = ('form__title',)
+    ordering = ('-created_at',)
+    list_select_related = ('form',)
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Register ArchivedFormResponse with the custom admin
+admin.site.register(ArchivedFormResponse, ArchivedFormResponseAdmin)
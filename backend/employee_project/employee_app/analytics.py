@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db.models import Avg, Count, F, FloatField, Max, Min, Value
+from django.db.models.functions import Floor, Least
+
+from .archival import RESPONSE_SOURCES
+
+DEFAULT_HISTOGRAM_BINS = 10
+MAX_HISTOGRAM_BINS = 100
+# A cached summary older than the form's latest responses is still served
+# for this many seconds, so a busy form is summarized at most that often
+ANALYTICS_MAX_STALENESS = getattr(settings, 'FORM_CACHE', {}).get('ANALYTICS_MAX_STALENESS', 30)
+
+
+def answers(field_ids, source='live'):
+    """
+    Answers to ``field_ids`` from the live tables or the archive (see
+    archival.RESPONSE_SOURCES); both carry the same typed columns and indexes.
+    """
+    _, answer_model = RESPONSE_SOURCES[source]
+    return answer_model.objects.filter(form_field_id__in=field_ids).order_by()
+
+
+def field_counts(field_ids, source='live'):
+    """
+    Answer count and number of distinct answers per field, in one GROUP BY.
+    """
+    rows = answers(field_ids, source).values('form_field_id').annotate(
+        count=Count('id'), distinct=Count('answer', distinct=True),
+    )
+    return {row['form_field_id']: {'count': row['count'], 'distinct': row['distinct']} for row in rows}
+
+
+def number_summaries(field_ids, source='live'):
+    rows = answers(field_ids, source).values('form_field_id').annotate(
+        min=Min('answer_number'), max=Max('answer_number'), mean=Avg('answer_number'),
+    )
+    return {row['form_field_id']: {'min': row['min'], 'max': row['max'], 'mean': row['mean']} for row in rows}
+
+
+def number_histogram(field_id, low, high, bins, source='live'):
+    """
+    Equal-width histogram of a number field between ``low`` and ``high``,
+    bucketed by the database from the (form_field, answer_number) index.
+    """
+    if low is None:
+        return []
+    numbers = answers([field_id], source).filter(answer_number__isnull=False)
+    if low == high:
+        return [{'start': low, 'end': high, 'count': numbers.count()}]
+
+    width = (high - low) / bins
+    rows = numbers.annotate(
+        # The maximum lands on the upper edge of the last bucket
+        bucket=Least(Floor((F('answer_number') - low) / width), Value(bins - 1.0), output_field=FloatField()),
+    ).values('bucket').annotate(count=Count('id'))
+    counts = {int(row['bucket']): row['count'] for row in rows}
+    return [
+        {'start': low + index * width, 'end': low + (index + 1) * width, 'count': counts.get(index, 0)}
+        for index in range(bins)
+    ]
+
+
+def date_ranges(field_ids, source='live'):
+    rows = answers(field_ids, source).values('form_field_id').annotate(earliest=Min('answer_date'), latest=Max('answer_date'))
+    return {row['form_field_id']: {'earliest': row['earliest'], 'latest': row['latest']} for row in rows}
+
+
+def summarize_form(schema, bins=DEFAULT_HISTOGRAM_BINS, source='live'):
+    """
+    Response count and per-field statistics for the form described by
+    ``schema`` (a form_schema.FormSchema). Everything is computed with
+    aggregate queries over the typed, indexed answer columns: one for
+    counts, one each for number and date fields, and one histogram query
+    per number field. No model instances are loaded.
+    """
+    by_type = {}
+    for field_id, (_, field_type, _) in schema.fields.items():
+        by_type.setdefault(field_type, []).append(field_id)
+
+    counts = field_counts(list(schema.fields), source)
+    numbers = number_summaries(by_type['number'], source) if by_type.get('number') else {}
+    dates = date_ranges(by_type['date'], source) if by_type.get('date') else {}
+
+    summary = []
+    for field_id, (label, field_type, required) in schema.fields.items():
+        entry = {
+            'field': field_id,
+            'label': label,
+            'field_type': field_type,
+            'required': required,
+            **counts.get(field_id, {'count': 0, 'distinct': 0}),
+        }
+        if field_type == 'number':
+            stats = numbers.get(field_id, {'min': None, 'max': None, 'mean': None})
+            entry.update(stats, histogram=number_histogram(field_id, stats['min'], stats['max'], bins, source))
+        elif field_type == 'date':
+            entry.update(dates.get(field_id, {'earliest': None, 'latest': None}))
+        summary.append(entry)
+    response_model, _ = RESPONSE_SOURCES[source]
+    return {
+        'responses': response_model.objects.filter(form_id=schema.form_id).count(),
+        'fields': summary,
+    }
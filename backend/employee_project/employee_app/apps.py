@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EmployeeAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employee_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401  Register signal handlers
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import form_responses
+from .models import ArchivedFormResponse, ArchivedFormResponseField, FormResponse, FormResponseField
+
+_archive_settings = getattr(settings, 'FORM_RESPONSE_ARCHIVE', {})
+
+# Responses older than this many days are moved to the archive tables
+ARCHIVE_AFTER_DAYS = _archive_settings.get('AFTER_DAYS', 365)
+# Responses moved per transaction; keeps every IN (...) below SQLite's parameter limit
+ARCHIVE_BATCH_SIZE = _archive_settings.get('BATCH_SIZE', 500)
+
+
+# Where form responses can be read from: (response model, answer model)
+RESPONSE_SOURCES = {
+    'live': (FormResponse, FormResponseField),
+    'archive': (ArchivedFormResponse, ArchivedFormResponseField),
+}
+
+
+def archive_cutoff(days=None, now=None):
+    days = ARCHIVE_AFTER_DAYS if days is None else days
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def period_of(created_at):
+    """
+    Archive period of a response: the YYYY-MM of its creation time, stored
+    in ArchivedFormResponse.period (a column, not a separate table).
+    """
+    return created_at.strftime('%Y-%m')
+
+
+def archive_batch(responses, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move up to ``batch_size`` of the oldest ``responses`` and their answers
+    into the archive tables (in the same database) in one transaction.
+    Returns the number moved.
+    """
+    with transaction.atomic():
+        # Oldest first, straight off the created_at index (which ends in the rowid)
+        batch = list(responses.order_by('created_at', 'id').values_list('id', 'form_id', 'created_at')[:batch_size])
+        if not batch:
+            return 0
+        ids = [response_id for response_id, _, _ in batch]
+        ArchivedFormResponse.objects.bulk_create([
+            ArchivedFormResponse(id=response_id, form_id=form_id, created_at=created_at, period=period_of(created_at))
+            for response_id, form_id, created_at in batch
+        ])
+        # Answers are copied inside the database with INSERT ... SELECT, then
+        # the moved rows are removed with plain DELETEs: no rows are loaded
+        # and no per-row delete signals are sent (analytics are invalidated
+        # once below)
+        answer_columns = 'id, form_response_id, form_field_id, answer, answer_number, answer_date'
+        placeholders = ', '.join(['%s'] * len(ids))
+        live_answers = connection.ops.quote_name(FormResponseField._meta.db_table)
+        live_responses = connection.ops.quote_name(FormResponse._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {connection.ops.quote_name(ArchivedFormResponseField._meta.db_table)} ({answer_columns}) '
+                f'SELECT {answer_columns} FROM {live_answers} WHERE form_response_id IN ({placeholders})',
+                ids,
+            )
+            cursor.execute(f'DELETE FROM {live_answers} WHERE form_response_id IN ({placeholders})', ids)
+            cursor.execute(f'DELETE FROM {live_responses} WHERE id IN ({placeholders})', ids)
+        form_responses.invalidate_on_commit(form_id for _, form_id, _ in batch)
+    return len(batch)
+
+
+def archive_form_responses(before=None, form_id=None, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None):
+    """
+    Move responses created before ``before`` (default: ARCHIVE_AFTER_DAYS
+    ago) into the archive, one batch per transaction so the hot tables are
+    never locked for long. Returns the number of responses moved.
+    """
+    responses = FormResponse.objects.filter(created_at__lt=before or archive_cutoff())
+    if form_id is not None:
+        responses = responses.filter(form_id=form_id)
+
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = archive_batch(responses, batch_size)
+        if not count:
+            break
+        moved += count
+        batches += 1
+    return moved
+
+
+def scheduled_archive():
+    """
+    Entry point for a periodic scheduler (cron, Celery beat...). Archives
+    everything past the configured age and returns the number moved.
+    """
+    return archive_form_responses()
@@ -0,0 +1,104 @@
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, permissions
+from rest_framework.views import APIView
+
+from .permissions import IsAppAdmin
+
+# Permissions that only read attributes of the authenticated user
+EVENT_LOOP_PERMISSIONS = (
+    permissions.AllowAny,
+    permissions.IsAuthenticated,
+    permissions.IsAuthenticatedOrReadOnly,
+    permissions.IsAdminUser,
+    IsAppAdmin,
+)
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines (``async def post(...)``).
+
+    Authentication, permission and throttle checks run on the event loop
+    when they cannot block: authenticators with an ``aauthenticate()``
+    coroutine (CachedJWTAuthentication), the EVENT_LOOP_PERMISSIONS and no
+    throttles. Otherwise they may query the database, so they run in a
+    worker thread. The handler itself runs on the event loop and must use
+    the async ORM or sync_to_async for database work.
+    Django only serves such views without blocking under ASGI
+    (employee_project/asgi.py); under WSGI they still work, one request
+    per thread.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            if self.checks_run_on_event_loop():
+                await self.ainitial(request, *args, **kwargs)
+            else:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            # OPTIONS and 405 responses come from the synchronous base handlers
+            if isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def checks_run_on_event_loop(self):
+        return not self.get_throttles() and all(
+            type(permission) in EVENT_LOOP_PERMISSIONS for permission in self.get_permissions()
+        )
+
+    async def ainitial(self, request, *args, **kwargs):
+        """
+        initial(), with the authenticators awaited.
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """
+        Request._authenticate(), awaiting ``aauthenticate()`` where the
+        authenticator has one and running ``authenticate()`` in a thread
+        where it does not.
+        """
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
@@ -0,0 +1,108 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import LRUCache
+
+# CustomUser columns kept in the cache; any other field is loaded from the
+# database the first time a view reads it (e.g. the password hash)
+CACHED_USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_admin', 'is_active', 'is_staff', 'is_superuser',
+)
+
+_auth_cache_settings = getattr(settings, 'AUTH_USER_CACHE', {})
+
+# user id -> (field names, their values, md5 of the password hash or None).
+# Saves and deletes evict the entry in this process; other processes pick the
+# change up once the TTL runs out.
+user_cache = LRUCache(
+    maxsize=_auth_cache_settings.get('LRU_SIZE', 1024),
+    ttl=_auth_cache_settings.get('TTL', 60),
+)
+
+
+def user_cache_key(user_id):
+    # Tokens carry the id as a string, model instances as an int
+    return str(user_id)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a short-TTL
+    in-process cache instead of querying CustomUser on every request.
+
+    Each request gets its own user instance, built from the cached column
+    values, so views are free to modify and save it.
+    """
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        key = user_cache_key(user_id)
+        entry = user_cache.get(key)
+        if entry is None:
+            entry = self.load_user(user_id)
+            user_cache.set(key, entry)
+        return self.build_user(validated_token, entry)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views: only a user cache miss leaves the
+        event loop, to query the user in a thread.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        key = user_cache_key(user_id)
+        entry = user_cache.get(key)
+        if entry is None:
+            entry = await sync_to_async(self.load_user)(user_id)
+            user_cache.set(key, entry)
+        return self.build_user(validated_token, entry)
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    def build_user(self, validated_token, entry):
+        """
+        A user instance from a cache entry, once the token is checked against it.
+        """
+        fields, values, password_hash = entry
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not values[fields.index('is_active')]:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return self.user_model.from_db(self.user_model.objects.db, fields, values)
+
+    def load_user(self, user_id):
+        """
+        Fetch the cached columns (and the password hash only when tokens are
+        checked for revocation) with one query.
+        """
+        # from_db() expects the values in model field order
+        fields = tuple(field.attname for field in self.user_model._meta.concrete_fields if field.attname in CACHED_USER_FIELDS)
+        columns = fields + (('password',) if api_settings.CHECK_REVOKE_TOKEN else ())
+        try:
+            row = self.user_model.objects.values_list(*columns).get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        password_hash = get_md5_hash_password(row[-1]) if api_settings.CHECK_REVOKE_TOKEN else None
+        return fields, row[:len(fields)], password_hash
@@ -0,0 +1,325 @@
+import csv
+import io
+from collections.abc import Mapping
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, models, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.fields import SkipField, empty, get_error_detail
+from rest_framework.settings import api_settings
+
+from .cache import employee_cache, form_responses
+from .models import CustomUser, Employee, EmployeeChange, FormResponse, FormResponseField
+from .serializers import BulkEmployeeSerializer, FormResponseSerializer
+
+# Keeps every IN (...) lookup well below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 900
+# Largest accepted import, to bound memory and transaction size
+MAX_IMPORT_ROWS = 50000
+# Largest accepted batch of form responses in one request
+MAX_SUBMIT_RESPONSES = 5000
+
+
+def parse_csv(uploaded_file):
+    """
+    Read an uploaded CSV into the nested row shape used by the JSON import.
+    Columns prefixed with ``user.`` (``user.username``, ``user.email``,
+    ``user.is_admin``) go into the nested ``user`` object.
+    """
+    text = io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+    rows = []
+    for record in csv.DictReader(text):
+        row = {'user': {}}
+        for column, value in record.items():
+            if column is None:
+                continue
+            column = column.strip()
+            if column.startswith('user.'):
+                row['user'][column[len('user.'):]] = value
+            else:
+                row[column] = value
+        rows.append(row)
+    return rows
+
+
+def _ids_by(queryset, field, values):
+    """
+    Map each of ``values`` already stored in ``field`` to its row's id,
+    querying in chunks.
+    """
+    values = list(values)
+    found = {}
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(queryset.filter(**{f'{field}__in': chunk}).values_list(field, 'id'))
+    return found
+
+
+def _add_error(errors, index, field, message):
+    errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+
+def _distinct_key(value):
+    # 1, True and '1' validate differently, so the type is part of the key
+    key = (type(value), value)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _run_field(field, value):
+    """
+    ``field.run_validation(value)`` as Serializer.to_internal_value() sees
+    it: ``(True, value)``, ``(True, empty)`` when the field is skipped, or
+    ``(False, error detail)``.
+    """
+    try:
+        return True, field.run_validation(value)
+    except serializers.ValidationError as exc:
+        return False, exc.detail
+    except DjangoValidationError as exc:
+        return False, get_error_detail(exc)
+    except SkipField:
+        return True, empty
+
+
+def _validate_column(field, values):
+    """
+    Run ``field`` over ``{index: value}``, validating each distinct value
+    once: imports repeat most departments, positions, dates and salaries.
+    Nested serializers are validated column by column in turn.
+    """
+    if isinstance(field, serializers.Serializer):
+        results = {}
+        present = []
+        for index, value in values.items():
+            try:
+                is_empty, data = field.validate_empty_values(value)
+            except serializers.ValidationError as exc:
+                results[index] = (False, exc.detail)
+            except SkipField:
+                results[index] = (True, empty)
+            else:
+                if is_empty:
+                    results[index] = (True, data)
+                else:
+                    present.append((index, value))
+        validated, errors = validate_columns(field, present)
+        results.update((index, (True, data)) for index, data in validated.items())
+        results.update((index, (False, detail)) for index, detail in errors.items())
+        return results
+
+    seen = {}
+    results = {}
+    for index, value in values.items():
+        key = _distinct_key(value)
+        if key is None:
+            results[index] = _run_field(field, value)
+            continue
+        if key not in seen:
+            seen[key] = _run_field(field, value)
+        results[index] = seen[key]
+    return results
+
+
+def validate_columns(serializer, items):
+    """
+    ``serializer.run_validation()`` for each ``(index, data)`` of ``items``,
+    one field at a time over the whole batch instead of one item at a time.
+    Returns ``(validated, errors)``, both keyed by index, with the same
+    values and error details the serializer would give.
+    """
+    errors = {}
+    rows = {}
+    for index, data in items:
+        if isinstance(data, Mapping):
+            rows[index] = data
+        else:
+            message = serializer.error_messages['invalid'].format(datatype=type(data).__name__)
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [ErrorDetail(message, code='invalid')]}
+
+    validated = {index: {} for index in rows}
+    for field in serializer._writable_fields:
+        validate_method = getattr(serializer, 'validate_' + field.field_name, None)
+        results = _validate_column(field, {index: field.get_value(data) for index, data in rows.items()})
+        for index, (ok, value) in results.items():
+            if ok and value is not empty and validate_method is not None:
+                try:
+                    value = validate_method(value)
+                except serializers.ValidationError as exc:
+                    ok, value = False, exc.detail
+                except DjangoValidationError as exc:
+                    ok, value = False, get_error_detail(exc)
+            if not ok:
+                errors.setdefault(index, {})[field.field_name] = value
+            elif value is not empty:
+                serializer.set_value(validated[index], field.source_attrs, value)
+
+    checks_rows = serializer.validators or type(serializer).validate is not serializers.Serializer.validate
+    for index in list(validated):
+        if index in errors:
+            del validated[index]
+        elif checks_rows:
+            try:
+                serializer.run_validators(validated[index])
+                validated[index] = serializer.validate(validated[index])
+            except (serializers.ValidationError, DjangoValidationError) as exc:
+                del validated[index]
+                errors[index] = serializers.as_serializer_error(exc)
+    return validated, errors
+
+
+def validate_rows(rows):
+    """
+    Validate every row and check uniqueness of usernames and emails, both
+    within the batch and against the database, with set-based queries.
+    Returns ``(validated_rows, errors)`` where ``errors`` maps row index to
+    field errors.
+    """
+    validated, errors = validate_columns(BulkEmployeeSerializer(), enumerate(rows))
+    validated = sorted(validated.items())
+
+    # (label, getter, queryset, field) for every unique column we write
+    unique_columns = [
+        ('user.username', lambda data: data['user']['username'], CustomUser.objects, 'username'),
+        ('user.email', lambda data: data['user']['email'], CustomUser.objects, 'email'),
+        ('email', lambda data: data['email'], Employee.objects, 'email'),
+    ]
+    for label, getter, queryset, field in unique_columns:
+        first_seen = {}
+        for index, data in validated:
+            value = getter(data)
+            if value in first_seen:
+                _add_error(errors, index, label, f'Duplicate of row {first_seen[value]}.')
+            else:
+                first_seen[value] = index
+        for value in _ids_by(queryset, field, first_seen):
+            _add_error(errors, first_seen[value], label, 'This value is already taken.')
+
+    return [data for index, data in validated if index not in errors], errors
+
+
+def insert_rows(model, rows):
+    """
+    INSERT ``rows`` (dicts keyed by field attname) into ``model``'s table
+    with multi-row INSERT statements and return the new ids in row order,
+    or None on backends that cannot return them. Unlike bulk_create(), no
+    instances are built and each distinct value of a column is converted
+    to its database value once. Missing fields get their default (auto_now
+    fields the current time). Like bulk_create(), no signals are sent.
+    """
+    if not rows:
+        return []
+    now = timezone.now()
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    columns = []
+    for field in fields:
+        if field.attname in rows[0]:
+            raw = [row[field.attname] for row in rows]
+        else:
+            default = now if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False) else field.get_default()
+            raw = [default] * len(rows)
+        if type(field) in (models.CharField, models.EmailField) and all(type(value) is str for value in raw):
+            # Strings are stored as they are
+            columns.append(raw)
+            continue
+        converted = {}
+        column = []
+        for value in raw:
+            key = _distinct_key(value)
+            if key is None:
+                column.append(field.get_db_prep_save(value, connection))
+                continue
+            if key not in converted:
+                converted[key] = field.get_db_prep_save(value, connection)
+            column.append(converted[key])
+        columns.append(column)
+
+    quote = connection.ops.quote_name
+    returning = connection.features.can_return_rows_from_bulk_insert
+    sql = f'INSERT INTO {quote(model._meta.db_table)} ({", ".join(quote(field.column) for field in fields)}) VALUES '
+    placeholders = f'({", ".join(["%s"] * len(fields))})'
+    batch_size = max(1, connection.features.max_query_params // len(fields))
+    params = list(zip(*columns))
+    ids = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(params), batch_size):
+            batch = params[start:start + batch_size]
+            statement = sql + ', '.join([placeholders] * len(batch))
+            if returning:
+                statement += f' RETURNING {quote(model._meta.pk.column)}'
+            cursor.execute(statement, [value for row in batch for value in row])
+            if returning:
+                ids.extend(row[0] for row in cursor.fetchall())
+    return ids if returning else None
+
+
+def import_employees(rows):
+    """
+    Create users and employees for ``rows`` with multi-row inserts in one
+    transaction. Nothing is written when any row is invalid.
+
+    Returns ``(employee_ids, errors)``; ``errors`` is a list of
+    ``{'row': index, 'errors': {...}}`` ordered by row.
+    """
+    validated, errors = validate_rows(rows)
+    if errors:
+        return [], [{'row': index, 'errors': errors[index]} for index in sorted(errors)]
+
+    # All imported accounts start with an unusable password, as with EmployeeSerializer
+    password = make_password(None)
+    with transaction.atomic():
+        user_ids = insert_rows(CustomUser, [{**data['user'], 'password': password} for data in validated])
+        if user_ids is None:
+            by_username = _ids_by(CustomUser.objects, 'username', [data['user']['username'] for data in validated])
+            user_ids = [by_username[data['user']['username']] for data in validated]
+        employee_ids = insert_rows(Employee, [
+            {**{key: value for key, value in data.items() if key != 'user'}, 'user_id': user_id}
+            for user_id, data in zip(user_ids, validated)
+        ])
+        if employee_ids is None:
+            by_email = _ids_by(Employee.objects, 'email', [data['email'] for data in validated])
+            employee_ids = [by_email[data['email']] for data in validated]
+        # Neither insert sends post_save signals
+        insert_rows(EmployeeChange, [{'employee_id': pk, 'action': EmployeeChange.UPSERT} for pk in employee_ids])
+        employee_cache.invalidate_on_commit()
+    return employee_ids, []
+
+
+def submit_form_responses(form, items):
+    """
+    Validate a batch of responses to ``form`` and save the valid ones with
+    one insert for the responses and one for all of their answers.
+
+    Unlike the employee import this is not all-or-nothing: each submission
+    stands on its own. Returns ``(responses, created, errors)`` where
+    ``created`` lists ``{'index', 'id'}`` and ``errors`` lists
+    ``{'index', 'errors'}``, both ordered by position in ``items``.
+    """
+    serializer = FormResponseSerializer(context={'form': form})
+    validated = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            validated.append((index, serializer.run_validation(item)))
+        except serializers.ValidationError as exc:
+            errors.append({'index': index, 'errors': exc.detail})
+
+    if not validated:
+        return [], [], errors
+
+    with transaction.atomic():
+        responses = FormResponse.objects.bulk_create([FormResponse(form=form) for _ in validated])
+        FormResponseField.objects.bulk_create([
+            FormResponseField(form_response=response, **answer)
+            for response, (_, data) in zip(responses, validated)
+            for answer in data['response_fields']
+        ])
+        form_responses.invalidate_on_commit([form.pk])
+    created = [{'index': index, 'id': response.pk} for response, (index, _) in zip(responses, validated)]
+    return responses, created, errors
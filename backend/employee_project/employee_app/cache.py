@@ -0,0 +1,311 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+class LRUCache:
+    """
+    A small thread-safe in-process LRU with an optional per-entry TTL.
+    """
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        # The live value for key, or None; call with the lock held
+        entry = self._data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] < time.monotonic()):
+            if entry is not None:
+                del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        """
+        get() without counting a hit or a miss, for callers that keep
+        their own counts.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            return default if value is None else value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+
+def start_generation(backend, key):
+    """
+    Initialise a missing generation number in ``backend`` and return it.
+    """
+    # Start from the clock so a flushed backend never reuses an old generation
+    backend.add(key, time.time_ns(), timeout=None)
+    return backend.get(key)
+
+
+def blocks(backend):
+    """
+    Whether calls to a cache backend may block on I/O. LocMemCache (a dict
+    in this process) and DummyCache never do, so async code calls them
+    directly instead of through a thread.
+    """
+    return not isinstance(backend, (LocMemCache, DummyCache))
+
+
+def read_stamps(stamps, alias=None, keys=()):
+    """
+    Current values of the generation numbers ``stamps``, given as ``(cache
+    alias, key)`` pairs, initialising missing ones, with one get_many() per
+    backend. ``keys`` are read from the ``alias`` backend in the same round
+    trip. Returns the stamps as a tuple and a dict of the keys found.
+    """
+    wanted = {}
+    for stamp_alias, key in stamps:
+        wanted.setdefault(stamp_alias, []).append(key)
+    if keys:
+        wanted.setdefault(alias, []).extend(keys)
+    found = {backend_alias: caches[backend_alias].get_many(backend_keys) for backend_alias, backend_keys in wanted.items()}
+    current = []
+    for stamp_alias, key in stamps:
+        value = found[stamp_alias].get(key)
+        current.append(start_generation(caches[stamp_alias], key) if value is None else value)
+    return tuple(current), {key: value for key, value in found.get(alias, {}).items() if key in keys}
+
+
+class ResponseCache:
+    """
+    Two-tier cache for serialized API payloads: an in-process LRU in front
+    of a Django cache backend.
+
+    Entries are stored with the generation number they were built under,
+    kept in the Django cache, and invalidation simply bumps it, so stale
+    entries in either tier (and in other worker processes sharing the
+    backend) are never served again and get replaced or age out. A lookup
+    is a single get_many() from the backend: the generation (and those of
+    other caches the entry depends on), and the shared entry when the LRU
+    has none.
+    """
+    def __init__(self, namespace, alias='default', lru_size=256, timeout=300):
+        self.namespace = namespace
+        self.alias = alias
+        self.timeout = timeout
+        self.lru = LRUCache(maxsize=lru_size)
+        self.local_hits = 0
+        self.local_misses = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @property
+    def generation_key(self):
+        return f'{self.namespace}:generation'
+
+    def generation(self):
+        generation = self.backend.get(self.generation_key)
+        return start_generation(self.backend, self.generation_key) if generation is None else generation
+
+    def make_key(self, *parts):
+        return f'{self.namespace}:' + ':'.join(str(part) for part in parts)
+
+    def make_query_key(self, prefix, query_params):
+        """
+        Key for a query string, insensitive to parameter order and empty values.
+        """
+        normalized = sorted(
+            (name, sorted(value for value in query_params.getlist(name) if value != ''))
+            for name in query_params
+        )
+        normalized = [(name, values) for name, values in normalized if values]
+        digest = hashlib.sha1(repr(normalized).encode('utf-8')).hexdigest()
+        return self.make_key(prefix, digest)
+
+    def lookup(self, key, stamps=()):
+        """
+        The value cached under ``key``, or None, and the current stamps to
+        store() a rebuilt value with. ``stamps`` are generation numbers kept
+        by other caches, as ``(alias, key)`` pairs; the entry is only served
+        while they and this cache's generation hold the values it was
+        stored with. Reads the shared entry only when the LRU has none.
+        """
+        local = self.lru.peek(key)
+        current, found = read_stamps(
+            [(self.alias, self.generation_key), *stamps], self.alias, [key] if local is None else [],
+        )
+
+        if local is not None:
+            if local[0] == current:
+                self.local_hits += 1
+                return local[1], current
+            # Built before the last invalidation. The shared entry wasn't
+            # fetched, so this counts as a miss (once per invalidation)
+            self.lru.delete(key)
+        self.local_misses += 1
+        shared = found.get(key)
+        if shared is None or shared[0] != current:
+            self.shared_misses += 1
+            return None, current
+        self.shared_hits += 1
+        self.lru.set(key, shared)
+        return shared[1], current
+
+    def store(self, key, value, stamps):
+        entry = (stamps, value)
+        self.lru.set(key, entry)
+        self.backend.set(key, entry, timeout=self.timeout)
+
+    def get(self, key):
+        return self.lookup(key)[0]
+
+    def set(self, key, value):
+        self.store(key, value, (self.generation(),))
+
+    # Remote backends are called from a thread, never from the event loop
+    async def alookup(self, key, stamps=()):
+        if blocks(self.backend):
+            return await sync_to_async(self.lookup)(key, stamps)
+        return self.lookup(key, stamps)
+
+    async def astore(self, key, value, stamps):
+        if blocks(self.backend):
+            return await sync_to_async(self.store)(key, value, stamps)
+        return self.store(key, value, stamps)
+
+    async def aget(self, key):
+        return (await self.alookup(key))[0]
+
+    async def aset(self, key, value):
+        if blocks(self.backend):
+            return await sync_to_async(self.set)(key, value)
+        return self.set(key, value)
+
+    def invalidate(self):
+        try:
+            self.backend.incr(self.generation_key)
+        except ValueError:
+            self.backend.set(self.generation_key, time.time_ns(), timeout=None)
+        self.lru.clear()
+
+    def invalidate_on_commit(self):
+        """
+        Invalidate now, and again once the surrounding transaction commits
+        so that a read racing the commit cannot re-cache the old rows.
+        """
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def clear(self):
+        self.lru.clear()
+        self.invalidate()
+
+    def stats(self):
+        return {
+            'local': {
+                'hits': self.local_hits, 'misses': self.local_misses,
+                'size': len(self.lru), 'maxsize': self.lru.maxsize,
+            },
+            'shared': {'hits': self.shared_hits, 'misses': self.shared_misses},
+        }
+
+
+class FormGenerations:
+    """
+    Per-form generation numbers kept in the Django cache. Bumping one makes
+    keys built from it stale for that form only, in every worker process.
+    """
+    def __init__(self, namespace, alias='default'):
+        self.namespace = namespace
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def generation_key(self, form_id):
+        return f'{self.namespace}:{form_id}:generation'
+
+    def generation_stamp(self, form_id):
+        # For ResponseCache.lookup() and read_stamps()
+        return self.alias, self.generation_key(form_id)
+
+    def generation(self, form_id):
+        key = self.generation_key(form_id)
+        generation = self.backend.get(key)
+        return start_generation(self.backend, key) if generation is None else generation
+
+    def invalidate(self, form_ids):
+        generation = time.time_ns()
+        self.backend.set_many({self.generation_key(form_id): generation for form_id in form_ids}, timeout=None)
+
+    def invalidate_on_commit(self, form_ids):
+        """
+        Invalidate now, and again once the surrounding transaction commits
+        so that a read racing the commit cannot re-cache the old data.
+        """
+        form_ids = set(form_ids)
+        self.invalidate(form_ids)
+        transaction.on_commit(lambda: self.invalidate(form_ids))
+
+
+_employee_cache_settings = getattr(settings, 'EMPLOYEE_CACHE', {})
+
+employee_cache = ResponseCache(
+    'employees',
+    alias=_employee_cache_settings.get('ALIAS', 'default'),
+    lru_size=_employee_cache_settings.get('LRU_SIZE', 256),
+    timeout=_employee_cache_settings.get('TIMEOUT', 300),
+)
+
+_form_cache_settings = getattr(settings, 'FORM_CACHE', {})
+
+form_cache = ResponseCache(
+    'forms',
+    alias=_form_cache_settings.get('ALIAS', 'default'),
+    lru_size=_form_cache_settings.get('LRU_SIZE', 256),
+    timeout=_form_cache_settings.get('TIMEOUT', 3600),
+)
+
+# Bumped once per transaction that adds, archives or deletes a form's responses
+form_responses = FormGenerations('form-responses', alias=_form_cache_settings.get('ALIAS', 'default'))
@@ -0,0 +1,42 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    Strong ETag from the repr of ``parts`` (ids, versions, cursors...).
+    """
+    return '"%s"' % hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def negotiated_etag(request, etag):
+    """
+    ``etag`` narrowed to the media type negotiated for ``request``, so the
+    JSON and MessagePack bodies of the same data never share a validator.
+    """
+    media_type = getattr(request, 'accepted_media_type', None)
+    if etag is None or not media_type:
+        return etag
+    return make_etag(etag, media_type)
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """
+    Return a 304 response when the request's If-None-Match/If-Modified-Since
+    validators still match, otherwise None. ``last_modified`` is a datetime.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
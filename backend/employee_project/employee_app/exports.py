@@ -0,0 +1,234 @@
+import csv
+import io
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import FormField
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional: Parquet exports are only offered when installed
+    pyarrow = None
+
+# Rows fetched from the database per round-trip while streaming
+EXPORT_CHUNK_SIZE = 2000
+# Flush the output buffer to the client once it grows past this many bytes
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# (output column, queryset lookup) for the employee directory export
+EMPLOYEE_EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('username', 'user__username'),
+    ('user_email', 'user__email'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('department', 'department'),
+    ('position', 'position'),
+    ('hire_date', 'hire_date'),
+    ('salary', 'salary'),
+    ('is_active', 'is_active'),
+)
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+FORM_EXPORT_CONTENT_TYPES = dict(EXPORT_CONTENT_TYPES)
+if pyarrow is not None:
+    FORM_EXPORT_CONTENT_TYPES['parquet'] = 'application/vnd.apache.parquet'
+
+
+async def iterate_in_thread(chunks):
+    """
+    Async iterator over a sync chunk iterator. Chunks are pulled one at a
+    time on the request's sync thread, so database cursors stay on their
+    connection and only one chunk is held in memory.
+    """
+    next_chunk = sync_to_async(next)
+    done = object()
+    try:
+        while (chunk := await next_chunk(chunks, done)) is not done:
+            yield chunk
+    finally:
+        # Release the cursor when the client goes away mid-export
+        if hasattr(chunks, 'close'):
+            await sync_to_async(chunks.close)()
+
+
+def streaming_body(request, chunks):
+    """
+    The streaming content to serve ``chunks`` with. Under ASGI, Django
+    would buffer a sync iterator whole before sending the first byte, so
+    it gets an async iterator there.
+    """
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return iterate_in_thread(iter(chunks))
+    return chunks
+
+
+def employee_rows(queryset):
+    """
+    Yield plain value tuples for the export columns, fetched in chunks.
+    No model instances are built.
+    """
+    lookups = [lookup for _, lookup in EMPLOYEE_EXPORT_COLUMNS]
+    return queryset.order_by('-hire_date', 'id').values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(header, rows):
+    """
+    Encode rows as CSV, yielding roughly EXPORT_BUFFER_SIZE bytes at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_BUFFER_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def stream_ndjson(header, rows):
+    """
+    Encode rows as newline-delimited JSON objects keyed by ``header``.
+    """
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    chunk = []
+    size = 0
+    for row in rows:
+        line = encoder.encode(dict(zip(header, row))) + '\n'
+        chunk.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield ''.join(chunk).encode('utf-8')
+            chunk = []
+            size = 0
+    yield ''.join(chunk).encode('utf-8')
+
+
+def stream_employees(queryset, export_format):
+    header = [column for column, _ in EMPLOYEE_EXPORT_COLUMNS]
+    rows = employee_rows(queryset)
+    if export_format == 'ndjson':
+        return stream_ndjson(header, rows)
+    return stream_csv(header, rows)
+
+
+def form_export_fields(form_id):
+    """
+    ``(field_id, column, field_type)`` for every exported field of the form,
+    in form order. Password answers are never exported.
+    """
+    fields = list(
+        FormField.objects.filter(form_id=form_id).exclude(field_type='password')
+        .order_by('order', 'id').values_list('id', 'label', 'field_type')
+    )
+    labels = [label for _, label, _ in fields]
+    return [
+        (field_id, label if labels.count(label) == 1 else f'{label} ({field_id})', field_type)
+        for field_id, label, field_type in fields
+    ]
+
+
+def form_response_rows(responses, fields, typed=False):
+    """
+    Pivot the answers to ``responses`` into one row per response:
+    ``[response_id, submitted_at, *answers]`` with one answer per field.
+
+    Answers are streamed in form_response_id order in chunks and each row is
+    yielded as soon as the next response starts, so memory is bounded by the
+    chunk size. With ``typed=True`` number and date answers come from their
+    typed columns instead of the text. Responses without answers are skipped.
+    ``responses`` may be live or archived responses.
+    """
+    answer_model = responses.model.response_fields.rel.related_model
+    column_of = {field_id: index for index, (field_id, _, _) in enumerate(fields)}
+    types = {field_id: field_type for field_id, _, field_type in fields}
+    answers = answer_model.objects.filter(
+        form_response__in=responses.values('id'), form_field_id__in=list(column_of),
+    ).order_by('form_response_id').values_list(
+        'form_response_id', 'form_response__created_at', 'form_field_id', 'answer', 'answer_number', 'answer_date',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    row = None
+    for response_id, created_at, field_id, answer, number, day in answers:
+        if row is None or row[0] != response_id:
+            if row is not None:
+                yield row
+            row = [response_id, created_at] + [None] * len(fields)
+        if typed and types[field_id] == 'number':
+            answer = number
+        elif typed and types[field_id] == 'date':
+            answer = day
+        row[2 + column_of[field_id]] = answer
+    if row is not None:
+        yield row
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands back what was written since the last drain().
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_parquet(header, types, rows):
+    """
+    Encode rows as Parquet, one row group per EXPORT_CHUNK_SIZE rows,
+    yielding the bytes of each row group as soon as it is written.
+    """
+    schema = pyarrow.schema([(name, column_type) for name, column_type in zip(header, types)])
+    sink = _ChunkSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        while True:
+            batch = list(islice(rows, EXPORT_CHUNK_SIZE))
+            if not batch:
+                break
+            columns = [pyarrow.array(column, type=column_type) for column, column_type in zip(zip(*batch), types)]
+            writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_form_responses(form_id, responses, export_format):
+    """
+    Stream the wide table of ``responses`` to form ``form_id``: one row per
+    response and one column per field. ``responses`` is a queryset or a list
+    of querysets (e.g. archived then live) exported one after the other.
+    """
+    sources = responses if isinstance(responses, (list, tuple)) else [responses]
+    fields = form_export_fields(form_id)
+    header = ['response_id', 'submitted_at'] + [column for _, column, _ in fields]
+    if export_format == 'parquet':
+        arrow_types = {'number': pyarrow.float64(), 'date': pyarrow.date32()}
+        types = [pyarrow.int64(), pyarrow.timestamp('us', tz='UTC')]
+        types += [arrow_types.get(field_type, pyarrow.string()) for _, _, field_type in fields]
+        rows = chain.from_iterable(form_response_rows(source, fields, typed=True) for source in sources)
+        return stream_parquet(header, types, rows)
+    rows = chain.from_iterable(form_response_rows(source, fields) for source in sources)
+    if export_format == 'ndjson':
+        return stream_ndjson(header, rows)
+    return stream_csv(header, rows)
@@ -1,14 +1,68 @@
 import django_filters
-from .models import Employee
+from rest_framework.exceptions import ValidationError
+from .models import Employee, FormResponse
+from .search import search_employees
 
 class EmployeeFilter(django_filters.FilterSet):
-    first_name = django_filters.CharFilter(field_name='first_name', lookup_expr='icontains', label='First Name')
-    last_name = django_filters.CharFilter(field_name='last_name', lookup_expr='icontains', label='Last Name')
-    email = django_filters.CharFilter(field_name='email', lookup_expr='icontains', label='Email')
-    department = django_filters.CharFilter(field_name='department', lookup_expr='icontains', label='Department')
-    position = django_filters.CharFilter(field_name='position', lookup_expr='icontains', label='Position')
+    # Text filters go through the FTS5 search index instead of LIKE '%x%' scans
+    q = django_filters.CharFilter(method='filter_search', label='Search')
+    first_name = django_filters.CharFilter(field_name='first_name', method='filter_column', label='First Name')
+    last_name = django_filters.CharFilter(field_name='last_name', method='filter_column', label='Last Name')
+    email = django_filters.CharFilter(field_name='email', method='filter_column', label='Email')
+    department = django_filters.CharFilter(field_name='department', method='filter_column', label='Department')
+    position = django_filters.CharFilter(field_name='position', method='filter_column', label='Position')
     hire_date = django_filters.DateFilter(field_name='hire_date', lookup_expr='gte', label='Hire Date (Greater Than or Equal)')
 
     class Meta:
         model = Employee
-        fields = ['first_name', 'last_name', 'email', 'department', 'position', 'hire_date']
+        fields = ['q', 'first_name', 'last_name', 'email', 'department', 'position', 'hire_date']
+
+    def filter_search(self, queryset, name, value):
+        """
+        Free-text search across all text columns, annotated with ``search_rank``.
+        """
+        return search_employees(queryset, value, rank=True)
+
+    def filter_column(self, queryset, name, value):
+        """
+        Case-insensitive substring match on a single column.
+        """
+        return search_employees(queryset, value, column=name)
+
+
+class FormResponseFilter(django_filters.FilterSet):
+    """
+    Filter responses by the answer to one field (``field``), using the
+    typed, indexed answer columns. Works on live and archived responses.
+    """
+    # Filter name -> lookup on FormResponseField
+    ANSWER_LOOKUPS = {
+        'answer': 'answer',
+        'number_min': 'answer_number__gte',
+        'number_max': 'answer_number__lte',
+        'date_from': 'answer_date__gte',
+        'date_to': 'answer_date__lte',
+    }
+
+    field = django_filters.NumberFilter(method='filter_field', label='Form Field')
+    answer = django_filters.CharFilter(method='filter_answer', label='Answer (Exact)')
+    number_min = django_filters.NumberFilter(method='filter_answer', label='Number Answer (Greater Than or Equal)')
+    number_max = django_filters.NumberFilter(method='filter_answer', label='Number Answer (Less Than or Equal)')
+    date_from = django_filters.DateFilter(method='filter_answer', label='Date Answer (On or After)')
+    date_to = django_filters.DateFilter(method='filter_answer', label='Date Answer (On or Before)')
+
+    class Meta:
+        model = FormResponse
+        fields = ['field', 'answer', 'number_min', 'number_max', 'date_from', 'date_to']
+
+    def filter_field(self, queryset, name, value):
+        # Only selects the field the answer filters apply to
+        return queryset
+
+    def filter_answer(self, queryset, name, value):
+        field = self.form.cleaned_data.get('field')
+        if field is None:
+            raise ValidationError({'field': ['Required when filtering by answer.']})
+        answer_model = queryset.model.response_fields.rel.related_model
+        answers = answer_model.objects.filter(form_field_id=field, **{self.ANSWER_LOOKUPS[name]: value})
+        return queryset.filter(id__in=answers.values('form_response_id'))
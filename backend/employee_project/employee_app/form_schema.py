@@ -0,0 +1,160 @@
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework import serializers
+
+from .cache import LRUCache, start_generation
+from .models import FormField
+from .routers import reading_from_primary
+
+
+def coerce_text(value):
+    return value
+
+
+def coerce_number(value):
+    try:
+        number = Decimal(value.strip())
+    except InvalidOperation:
+        raise ValueError('Enter a number.')
+    if not number.is_finite():
+        raise ValueError('Enter a number.')
+    return number
+
+
+def coerce_date(value):
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError('Enter a date in YYYY-MM-DD format.')
+
+
+# field_type -> callable turning the submitted string into a typed value
+COERCERS = {
+    'text': coerce_text,
+    'password': coerce_text,
+    'number': coerce_number,
+    'date': coerce_date,
+}
+
+
+class FormSchema:
+    """
+    Everything needed to validate a submission to one form, built from a
+    single query so that validating answers touches no database.
+    """
+    def __init__(self, form_id, fields):
+        self.form_id = form_id
+        # field id -> (label, field_type, required)
+        self.fields = {field_id: (label, field_type, required) for field_id, label, field_type, required in fields}
+        self.required = frozenset(field_id for field_id, (_, _, required) in self.fields.items() if required)
+
+    @classmethod
+    def build(cls, form_id):
+        # Always from the primary: submissions are validated against it
+        fields = FormField.objects.using(DEFAULT_DB_ALIAS).filter(form_id=form_id).values_list(
+            'id', 'label', 'field_type', 'required',
+        )
+        return cls(form_id, list(fields))
+
+    def clean(self, answers):
+        """
+        Validate ``answers`` (dicts with ``form_field_id`` and ``answer``)
+        and return them with the answer normalised for its field type and
+        its typed ``answer_number``/``answer_date`` set.
+        Raises ValidationError keyed by field id.
+        """
+        errors = {}
+        cleaned = []
+        seen = set()
+        for answer in answers:
+            field_id = answer['form_field_id']
+            field = self.fields.get(field_id)
+            if field is None:
+                errors[str(field_id)] = ['This field does not belong to this form.']
+                continue
+            if field_id in seen:
+                errors[str(field_id)] = ['This field was answered more than once.']
+                continue
+            seen.add(field_id)
+            try:
+                value = COERCERS[field[1]](answer['answer'])
+            except ValueError as exc:
+                errors[str(field_id)] = [str(exc)]
+                continue
+            cleaned.append({
+                **answer,
+                'answer': value.isoformat() if isinstance(value, date) else str(value),
+                # Typed copies for indexed filtering and aggregation
+                'answer_number': float(value) if field[1] == 'number' else None,
+                'answer_date': value if field[1] == 'date' else None,
+            })
+
+        for field_id in sorted(self.required - seen):
+            errors.setdefault(str(field_id), []).append(f'"{self.fields[field_id][0]}" is required.')
+        if errors:
+            raise serializers.ValidationError(errors)
+        return cleaned
+
+
+class FormSchemaCache:
+    """
+    Compiled schemas kept in an in-process LRU. Each form has a generation
+    number in the Django cache that is bumped whenever its fields change,
+    so every worker process drops its stale copy on the next lookup. The
+    generation also serves as the version of the form definition for
+    ETags and the rendered form cache.
+    """
+    def __init__(self, alias='default', lru_size=512):
+        self.alias = alias
+        self.lru = LRUCache(maxsize=lru_size)
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def generation_key(self, form_id):
+        return f'form-schema:{form_id}:generation'
+
+    def generation_stamp(self, form_id):
+        # For ResponseCache.lookup() and read_stamps()
+        return self.alias, self.generation_key(form_id)
+
+    def generation(self, form_id):
+        key = self.generation_key(form_id)
+        generation = self.backend.get(key)
+        return start_generation(self.backend, key) if generation is None else generation
+
+    def get(self, form_id):
+        key = (form_id, self.generation(form_id))
+        schema = self.lru.get(key)
+        if schema is None:
+            schema = FormSchema.build(form_id)
+            if reading_from_primary():
+                self.lru.set(key, schema)
+        return schema
+
+    def invalidate(self, form_id):
+        self.backend.set(self.generation_key(form_id), time.time_ns(), timeout=None)
+
+    def invalidate_on_commit(self, form_id):
+        self.invalidate(form_id)
+        transaction.on_commit(lambda: self.invalidate(form_id))
+
+    def clear(self):
+        self.lru.clear()
+
+    def stats(self):
+        return self.lru.stats()
+
+
+_form_schema_settings = getattr(settings, 'FORM_SCHEMA_CACHE', {})
+
+form_schemas = FormSchemaCache(
+    alias=_form_schema_settings.get('ALIAS', 'default'),
+    lru_size=_form_schema_settings.get('LRU_SIZE', 512),
+)
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
+
+
+class PoolSaturated(Exception):
+    """
+    Raised instead of queueing when every worker is busy and the queue is full.
+    """
+
+
+class PasswordHashPool:
+    """
+    A small, bounded thread pool for password hashing.
+
+    PBKDF2 holds a core for hundreds of milliseconds but releases the GIL,
+    so a few dedicated threads keep a burst of logins from competing with
+    every other request for the CPU. At most ``workers + max_queue`` jobs
+    are accepted at a time; beyond that ``submit`` raises PoolSaturated so
+    the view can answer 503 right away rather than time out in a queue.
+
+    Only pure functions of the password (make_password, verify_password)
+    should run here: pool threads never touch the database.
+    """
+    def __init__(self, workers=2, max_queue=16):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.peak_pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            return self._executor
+
+    def submit(self, fn, *args):
+        """
+        Schedule ``fn(*args)`` and return a concurrent.futures.Future.
+        """
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated()
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+            self.submitted += 1
+        return self.executor.submit(self._run, time.perf_counter(), fn, args)
+
+    def _run(self, queued_at, fn, args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+                self.wait_seconds += started - queued_at
+                self.max_wait_seconds = max(self.max_wait_seconds, started - queued_at)
+                self.run_seconds += finished - started
+
+    async def run(self, fn, *args):
+        """
+        Await ``fn(*args)`` from an async view without blocking the event loop.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        completed = self.completed or 1
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'pending': self.pending,
+            'peak_pending': self.peak_pending,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'avg_wait_ms': round(self.wait_seconds / completed * 1000, 3),
+            'max_wait_ms': round(self.max_wait_seconds * 1000, 3),
+            'avg_run_ms': round(self.run_seconds / completed * 1000, 3),
+        }
+
+
+_hash_pool_settings = getattr(settings, 'PASSWORD_HASH_POOL', {})
+
+password_hashers = PasswordHashPool(
+    workers=_hash_pool_settings.get('WORKERS', max(1, (os.cpu_count() or 2) // 2)),
+    max_queue=_hash_pool_settings.get('MAX_QUEUE', 16),
+)
+
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+async def authenticate_user(username, password, request=None, pool=password_hashers):
+    """
+    Async counterpart of django.contrib.auth.authenticate() that does the
+    hashing in ``pool``. Returns the active user whose password matches, or
+    None. Outdated hashes are upgraded, as check_password() would, and
+    failures send user_login_failed like authenticate() does.
+
+    The shortcut only stands in for the default ModelBackend; with other
+    AUTHENTICATION_BACKENDS the real authenticate() runs (outside the pool).
+    """
+    if list(settings.AUTHENTICATION_BACKENDS) != [MODEL_BACKEND]:
+        return await sync_to_async(authenticate)(request, username=username, password=password)
+
+    user = await _check_password(username, password, pool)
+    if user is None:
+        # Same sender as authenticate(), so receivers filtering on it see these too
+        await user_login_failed.asend(
+            sender='django.contrib.auth',
+            credentials={'username': username, 'password': '********************'},
+            request=request,
+        )
+    return user
+
+
+async def _check_password(username, password, pool):
+    UserModel = get_user_model()
+    try:
+        user = await UserModel._default_manager.aget_by_natural_key(username)
+    except UserModel.DoesNotExist:
+        # Hash anyway so an unknown username takes as long as a wrong password
+        await pool.run(make_password, password)
+        return None
+
+    is_correct, must_update = await pool.run(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+    if must_update:
+        user.password = await pool.run(make_password, password)
+        await user.asave(update_fields=['password'])
+    return user
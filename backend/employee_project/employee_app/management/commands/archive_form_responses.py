@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from employee_app import archival
+from employee_app.models import FormResponse
+
+
+class Command(BaseCommand):
+    help = 'Move form responses older than the configured age into the archive tables, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=archival.ARCHIVE_AFTER_DAYS,
+                            help='Archive responses older than this many days.')
+        parser.add_argument('--form', type=int, dest='form_id', help='Only archive responses to this form.')
+        parser.add_argument('--batch-size', type=int, default=archival.ARCHIVE_BATCH_SIZE,
+                            help='Responses moved per transaction.')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many responses would move.')
+
+    def handle(self, *args, days, form_id, batch_size, max_batches, dry_run, **options):
+        cutoff = archival.archive_cutoff(days)
+        if dry_run:
+            responses = FormResponse.objects.filter(created_at__lt=cutoff)
+            if form_id is not None:
+                responses = responses.filter(form_id=form_id)
+            self.stdout.write(f'{responses.count()} responses created before {cutoff:%Y-%m-%d} would be archived.')
+            return
+
+        moved = archival.archive_form_responses(
+            before=cutoff, form_id=form_id, batch_size=batch_size, max_batches=max_batches,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} responses created before {cutoff:%Y-%m-%d}.'))
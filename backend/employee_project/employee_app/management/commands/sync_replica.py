@@ -0,0 +1,53 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database into the replica aliases in DATABASE_REPLICAS, '
+        'for running with local replicas. Uses the SQLite online backup API, so the '
+        'primary stays writable while it runs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', action='append', dest='aliases',
+                            help='Replica alias to refresh (repeatable). Defaults to all of them.')
+        parser.add_argument('--interval', type=float,
+                            help='Keep running, refreshing the replicas every this many seconds.')
+
+    def handle(self, *args, aliases, interval, **options):
+        configured = getattr(settings, 'DATABASE_REPLICAS', {}).get('ALIASES', [])
+        aliases = aliases or configured
+        if not aliases:
+            raise CommandError('No replicas configured; see DATABASE_REPLICAS (or DJANGO_SQLITE_REPLICAS).')
+        for alias in [DEFAULT_DB_ALIAS, *aliases]:
+            if alias != DEFAULT_DB_ALIAS and alias not in configured:
+                raise CommandError(f'"{alias}" is not a configured replica.')
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError('sync_replica only copies SQLite databases.')
+
+        while True:
+            started = time.perf_counter()
+            for alias in aliases:
+                self.sync(alias)
+            self.stdout.write(self.style.SUCCESS(
+                f'Synced {", ".join(aliases)} in {(time.perf_counter() - started) * 1000:.0f} ms.'
+            ))
+            if interval is None:
+                return
+            time.sleep(interval)
+
+    def sync(self, alias):
+        # Drop this process's connection so it reopens on the new copy
+        connections[alias].close()
+        source = sqlite3.connect(connections[DEFAULT_DB_ALIAS].settings_dict['NAME'])
+        target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
@@ -0,0 +1,147 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_metrics_settings = getattr(settings, 'QUERY_METRICS', {})
+
+# Upper bounds of the latency buckets, in seconds
+DURATION_BUCKETS = _metrics_settings.get(
+    'DURATION_BUCKETS', (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+# Upper bounds of the query count buckets
+QUERY_COUNT_BUCKETS = _metrics_settings.get('QUERY_COUNT_BUCKETS', (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500))
+
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_bound(bound):
+    return repr(float(bound)) if bound != int(bound) else f'{int(bound)}.0'
+
+
+class Histogram:
+    """
+    A Prometheus-style histogram with one series per label combination.
+    Observing is a bisect and three additions under a lock; buckets are
+    only made cumulative when exposed.
+    """
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        """
+        Lines of the text exposition format for this histogram.
+        """
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in sorted(self._series.items())]
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip((*map(format_bound, self.buckets), '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{format_labels(self.label_names, labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.label_names, labels)} {total}')
+            lines.append(f'{self.name}_count{format_labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+ENDPOINT_LABELS = ('view', 'method')
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Time spent handling the request.', ENDPOINT_LABELS, DURATION_BUCKETS,
+)
+request_db_duration = Histogram(
+    'http_request_db_duration_seconds', 'Time spent executing SQL while handling the request.',
+    ENDPOINT_LABELS, DURATION_BUCKETS,
+)
+request_db_queries = Histogram(
+    'http_request_db_queries', 'SQL queries executed while handling the request.', ENDPOINT_LABELS, QUERY_COUNT_BUCKETS,
+)
+request_serialize_duration = Histogram(
+    'http_request_serialize_duration_seconds', 'Time spent in serializers building the response data.',
+    ENDPOINT_LABELS, DURATION_BUCKETS,
+)
+request_render_duration = Histogram(
+    'http_request_render_duration_seconds', 'Time spent encoding the response data (renderer.render()).',
+    ENDPOINT_LABELS, DURATION_BUCKETS,
+)
+
+REQUEST_HISTOGRAMS = (
+    request_duration, request_db_duration, request_db_queries, request_serialize_duration, request_render_duration,
+)
+
+# Methods labelled by name; anything else shares the "other" series
+LABELLED_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+def method_label(method):
+    return method if method in LABELLED_METHODS else 'other'
+
+
+# RequestMetrics of the request being measured by QueryMetricsMiddleware.
+# Database connections are per thread, but context variables follow the
+# request into the sync_to_async() threads where the ORM runs under ASGI.
+active_request = ContextVar('active_request_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper installed on every database connection (see
+    signals.install_query_recorder); times the query for the request
+    being measured, if any.
+    """
+    request_metrics = active_request.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics.record_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def serializing(request):
+    """
+    Count the time spent in the block (serializer ``.data``) as the
+    request's serialization time, when QueryMetricsMiddleware is installed.
+    """
+    request_metrics = getattr(request, 'query_metrics', None)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if request_metrics is not None:
+            request_metrics.serialize_seconds = (request_metrics.serialize_seconds or 0.0) + time.perf_counter() - started
+
+
+def render_metrics():
+    """
+    Every request histogram in the Prometheus text exposition format.
+    """
+    return '\n'.join(line for histogram in REQUEST_HISTOGRAMS for line in histogram.expose()) + '\n'
@@ -0,0 +1,367 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.core.cache import caches
+from django.middleware import clickjacking, common, csrf, security
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import metrics
+from .routers import choose_replica, replica_alias, replica_settings
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_jwt = JWTAuthentication()
+
+
+def get_user_key(request):
+    """
+    Id of the user behind the request, read from the JWT or the session
+    without querying the user table. None for anonymous requests.
+    """
+    header = _jwt.get_header(request)
+    if header is not None:
+        try:
+            raw_token = _jwt.get_raw_token(header)
+            return str(_jwt.get_validated_token(raw_token)[api_settings.USER_ID_CLAIM]) if raw_token else None
+        except (AuthenticationFailed, InvalidToken, KeyError):
+            return None
+    session = getattr(request, 'session', None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+def _read_from(alias, content):
+    # Streamed bodies (exports) are generated after the middleware returns
+    token = replica_alias.set(alias)
+    try:
+        yield from content
+    finally:
+        replica_alias.reset(token)
+
+
+async def _aread_from(alias, content):
+    # _read_from() for the async iterators exports use under ASGI
+    token = replica_alias.set(alias)
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        replica_alias.reset(token)
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under both handlers: ``__call__``
+    must hand over to ``__acall__`` when ``async_mode`` is set, as
+    MiddlewareMixin does. Under ASGI, the hooks named in ``async_hooks``
+    are replaced by their ``a``-prefixed coroutine versions, so Django
+    awaits them on the event loop instead of running them in a thread.
+    """
+    sync_capable = True
+    async_capable = True
+    async_hooks = ()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            for hook in self.async_hooks:
+                setattr(self, hook, getattr(self, f'a{hook}'))
+
+
+
+class EventLoopMiddlewareMixin:
+    """
+    For subclasses of Django's MiddlewareMixin middleware. Under ASGI,
+    MiddlewareMixin runs process_request() and process_response() in a
+    thread on every request; this runs them on the event loop and only
+    hands them to a thread when request_blocks()/response_blocks() say
+    they may do I/O for this request.
+    """
+    def request_blocks(self, request):
+        return False
+
+    def response_blocks(self, request, response):
+        return False
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            if self.request_blocks(request):
+                response = await sync_to_async(self.process_request, thread_sensitive=True)(request)
+            else:
+                response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            if self.response_blocks(request, response):
+                response = await sync_to_async(self.process_response, thread_sensitive=True)(request, response)
+            else:
+                response = self.process_response(request, response)
+        return response
+
+
+# Headers, redirects and a lazy request.user: never any I/O
+class SecurityMiddleware(EventLoopMiddlewareMixin, security.SecurityMiddleware):
+    pass
+
+
+class CommonMiddleware(EventLoopMiddlewareMixin, common.CommonMiddleware):
+    pass
+
+
+class AuthenticationMiddleware(EventLoopMiddlewareMixin, auth_middleware.AuthenticationMiddleware):
+    pass
+
+
+class XFrameOptionsMiddleware(EventLoopMiddlewareMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
+
+
+class SessionMiddleware(EventLoopMiddlewareMixin, sessions_middleware.SessionMiddleware):
+    def response_blocks(self, request, response):
+        # The session is loaded lazily; saving it is the only I/O left here
+        session = getattr(request, 'session', None)
+        return session is not None and (session.modified or settings.SESSION_SAVE_EVERY_REQUEST)
+
+
+class MessageMiddleware(EventLoopMiddlewareMixin, messages_middleware.MessageMiddleware):
+    def response_blocks(self, request, response):
+        # Storing messages may write to the session
+        storage = getattr(request, '_messages', None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class CsrfViewMiddleware(EventLoopMiddlewareMixin, csrf.CsrfViewMiddleware):
+    """
+    Checks the token on the event loop unless it is kept in the session
+    (CSRF_USE_SESSIONS) or the request body has to be read for it.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.async_mode:
+            self.process_view = self.aprocess_view
+
+    def request_blocks(self, request):
+        return settings.CSRF_USE_SESSIONS
+
+    def response_blocks(self, request, response):
+        return settings.CSRF_USE_SESSIONS
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        # Exempt views (every API view), safe methods and requests already
+        # checked are accepted without reading the secret or the body
+        if (
+            getattr(request, 'csrf_processing_done', False)
+            or getattr(callback, 'csrf_exempt', False)
+            or request.method in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+        ):
+            return super().process_view(request, callback, callback_args, callback_kwargs)
+        return await sync_to_async(super().process_view, thread_sensitive=True)(
+            request, callback, callback_args, callback_kwargs,
+        )
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Lets safe requests to the configured URL names and namespaces (employee
+    reads, reports, the admin) read from a replica, unless their user made
+    a successful write within the last STICKY_SECONDS; those keep reading
+    from the primary so they see their own writes. The sticky marks live
+    in the Django cache, so every process sharing it honours them.
+    """
+    async_hooks = ('process_view',)
+
+    @property
+    def cache(self):
+        return caches[replica_settings().get('CACHE_ALIAS', 'default')]
+
+    def sticky_key(self, user_key):
+        return f'replica-sticky:{user_key}'
+
+    def sticky_seconds(self):
+        return replica_settings().get('STICKY_SECONDS', 10)
+
+    def wrap_streaming(self, response, alias):
+        # Streamed bodies are read after the middleware returns, sync or async
+        read_from = _aread_from if response.is_async else _read_from
+        response.streaming_content = read_from(alias, response.streaming_content)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = replica_alias.set(None)
+        try:
+            response = self.get_response(request)
+            alias = replica_alias.get()
+        finally:
+            replica_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_key = get_user_key(request)
+            if user_key is not None:
+                self.cache.set(self.sticky_key(user_key), True, self.sticky_seconds())
+        elif alias is not None and response.streaming:
+            self.wrap_streaming(response, alias)
+        return response
+
+    async def __acall__(self, request):
+        token = replica_alias.set(None)
+        try:
+            response = await self.get_response(request)
+            alias = replica_alias.get()
+        finally:
+            replica_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_key = get_user_key(request)
+            if user_key is not None:
+                await self.cache.aset(self.sticky_key(user_key), True, self.sticky_seconds())
+        elif alias is not None and response.streaming:
+            self.wrap_streaming(response, alias)
+        return response
+
+    def may_use_replica(self, request):
+        """
+        Whether the request is a safe one to a listed view, with replicas configured.
+        """
+        options = replica_settings()
+        if request.method not in SAFE_METHODS or not options.get('ALIASES'):
+            return False
+        match = request.resolver_match
+        return match.url_name in options.get('URL_NAMES', ()) or match.namespace in options.get('NAMESPACES', ())
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.may_use_replica(request):
+            return None
+        user_key = get_user_key(request)
+        if user_key is not None and self.cache.get(self.sticky_key(user_key)):
+            return None
+        replica_alias.set(choose_replica())
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not self.may_use_replica(request):
+            return None
+        user_key = get_user_key(request)
+        if user_key is not None and await self.cache.aget(self.sticky_key(user_key)):
+            return None
+        replica_alias.set(choose_replica())
+        return None
+
+
+class RequestMetrics:
+    """
+    Query count and timings of one request.
+    """
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = None
+        self.render_started = None
+        self.render_seconds = None
+
+    def record_query(self, execute, sql, params, many, context):
+        # Called by metrics.record_query
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+    def rendered(self, response):
+        self.render_seconds = time.perf_counter() - self.render_started
+
+
+def endpoint_name(request):
+    # URL names keep the label set small; unknown paths share one label
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else 'unmatched'
+
+
+class QueryMetricsMiddleware(HybridMiddleware):
+    """
+    Counts the SQL queries of each request and times them, the serializers
+    (views report it with metrics.serializing()), the encoding of the
+    response body by its renderer and the whole request. Adds them to the response
+    as a Server-Timing header and to the per-endpoint histograms served by
+    /api/metrics/. Costs a few perf_counter() calls per query and per request.
+
+    Queries are seen through metrics.record_query, which every connection
+    runs, so those made from sync_to_async() threads under ASGI count too.
+    Streamed bodies (exports) are produced after the response is returned,
+    so their queries and time are not included.
+    """
+    async_hooks = ('process_template_response',)
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.server_timing = getattr(settings, 'QUERY_METRICS', {}).get('SERVER_TIMING', True)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request_metrics = request.query_metrics = RequestMetrics()
+        token = metrics.active_request.set(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.active_request.reset(token)
+        self.report(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        request_metrics = request.query_metrics = RequestMetrics()
+        token = metrics.active_request.set(request_metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.active_request.reset(token)
+        self.report(request, response, time.perf_counter() - started)
+        return response
+
+    def report(self, request, response, total_seconds):
+        """
+        Observe the request's histograms and add its Server-Timing header.
+        """
+        request_metrics = request.query_metrics
+        labels = (endpoint_name(request), metrics.method_label(request.method))
+        metrics.request_duration.observe(labels, total_seconds)
+        metrics.request_db_duration.observe(labels, request_metrics.db_seconds)
+        metrics.request_db_queries.observe(labels, request_metrics.queries)
+        if request_metrics.serialize_seconds is not None:
+            metrics.request_serialize_duration.observe(labels, request_metrics.serialize_seconds)
+        if request_metrics.render_seconds is not None:
+            metrics.request_render_duration.observe(labels, request_metrics.render_seconds)
+
+        if self.server_timing:
+            timings = [f'db;dur={request_metrics.db_seconds * 1000:.2f};desc="{request_metrics.queries} queries"']
+            if request_metrics.serialize_seconds is not None:
+                timings.append(f'serialize;dur={request_metrics.serialize_seconds * 1000:.2f}')
+            if request_metrics.render_seconds is not None:
+                timings.append(f'render;dur={request_metrics.render_seconds * 1000:.2f}')
+            timings.append(f'total;dur={total_seconds * 1000:.2f}')
+            response['Server-Timing'] = ', '.join(timings)
+
+    def time_rendering(self, request, response):
+        # DRF responses are rendered (encoded) right after process_template_response()
+        request_metrics = getattr(request, 'query_metrics', None)
+        if request_metrics is not None:
+            request_metrics.render_started = time.perf_counter()
+            response.add_post_render_callback(request_metrics.rendered)
+        return response
+
+    def process_template_response(self, request, response):
+        return self.time_rendering(request, response)
+
+    async def aprocess_template_response(self, request, response):
+        return self.time_rendering(request, response)
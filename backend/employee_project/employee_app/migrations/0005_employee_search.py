@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from employee_app.search import create_search_index, drop_search_index
+
+
+def create_search_table(apps, schema_editor):
+    create_search_index(schema_editor)
+
+
+def drop_search_table(apps, schema_editor):
+    drop_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0004_form_models'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
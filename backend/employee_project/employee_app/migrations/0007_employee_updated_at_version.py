@@ -0,0 +1,32 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+from employee_app.search import create_search_index
+
+
+def recreate_search_index(apps, schema_editor):
+    # Adding NOT NULL columns rebuilds models_employee on SQLite, which drops
+    # the triggers that keep the search table in sync
+    create_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0006_employee_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(recreate_search_index, migrations.RunPython.noop),
+    ]
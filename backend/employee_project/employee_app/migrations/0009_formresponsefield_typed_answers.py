@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:04
+
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+
+# Rows read and written per round-trip while backfilling
+BACKFILL_BATCH_SIZE = 5000
+
+
+def parse_number(value):
+    try:
+        number = Decimal(value.strip())
+    except InvalidOperation:
+        return None
+    return float(number) if number.is_finite() else None
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        return None
+
+
+def backfill_typed_answers(apps, schema_editor):
+    """
+    Fill answer_number/answer_date for existing answers to number and date
+    fields, walking the table by primary key in batches. Answers that don't
+    parse are left NULL.
+    """
+    FormResponseField = apps.get_model('employee_app', 'FormResponseField')
+    table = schema_editor.quote_name(FormResponseField._meta.db_table)
+    answers = FormResponseField.objects.filter(form_field__field_type__in=['number', 'date']).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(answers.filter(pk__gt=last_pk).values_list('pk', 'form_field__field_type', 'answer')[:BACKFILL_BATCH_SIZE])
+        if not batch:
+            break
+        updates = [
+            (parse_number(answer), None, pk) if field_type == 'number' else (None, parse_date(answer), pk)
+            for pk, field_type, answer in batch
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {table} SET answer_number = %s, answer_date = %s WHERE id = %s',
+                updates,
+            )
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0008_employee_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formresponsefield',
+            name='answer_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='formresponsefield',
+            name='answer_number',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        # Backfill before indexing so the indexes are built once
+        migrations.RunPython(backfill_typed_answers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='formresponsefield',
+            index=models.Index(fields=['form_field', 'answer'], name='response_field_answer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formresponsefield',
+            index=models.Index(fields=['form_field', 'answer_number'], name='response_field_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formresponsefield',
+            index=models.Index(fields=['form_field', 'answer_date'], name='response_field_date_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_app', '0009_formresponsefield_typed_answers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedFormResponse',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('period', models.CharField(max_length=7)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedFormResponseField',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('answer', models.TextField()),
+                ('answer_number', models.FloatField(blank=True, null=True)),
+                ('answer_date', models.DateField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='formresponse',
+            index=models.Index(fields=['created_at'], name='response_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formresponse',
+            index=models.Index(fields=['form', 'created_at'], name='response_form_created_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedformresponse',
+            name='form',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_responses', to='employee_app.form'),
+        ),
+        migrations.AddField(
+            model_name='archivedformresponsefield',
+            name='form_field',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='employee_app.formfield'),
+        ),
+        migrations.AddField(
+            model_name='archivedformresponsefield',
+            name='form_response',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='response_fields', to='employee_app.archivedformresponse'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponse',
+            index=models.Index(fields=['period'], name='archived_response_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponse',
+            index=models.Index(fields=['form', 'period'], name='archived_response_form_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponse',
+            index=models.Index(fields=['created_at', 'id'], name='archived_response_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponsefield',
+            index=models.Index(fields=['form_field', 'answer'], name='archived_field_answer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponsefield',
+            index=models.Index(fields=['form_field', 'answer_number'], name='archived_field_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedformresponsefield',
+            index=models.Index(fields=['form_field', 'answer_date'], name='archived_field_date_idx'),
+        ),
+    ]
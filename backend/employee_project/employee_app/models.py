@@ -30,16 +30,57 @@ class Employee(models.Model):
     hire_date = models.DateField()
     salary = models.DecimalField(max_digits=10, decimal_places=2)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Last-Modified for conditional GETs
+    version = models.PositiveIntegerField(default=1)  # Bumped on every save, feeds the ETag
 
     class Meta:
         db_table = 'models_employee'  # Custom database table name
         verbose_name = _('employee')  # Singular verbose name
         verbose_name_plural = _('employees')  # Plural verbose name
         ordering = ('-hire_date',)  # Default ordering: newest hire_date first
+        indexes = [
+            # Default ordering and keyset pagination, also serves hire_date__gte
+            models.Index(fields=['-hire_date', 'id'], name='employee_hire_date_id_idx'),
+            # Active roster of a department, newest first
+            models.Index(fields=['is_active', 'department', '-hire_date'], name='employee_active_dept_hire_idx'),
+            # Admin list_filter on department/position (exact match + ordering)
+            models.Index(fields=['department', '-hire_date'], name='employee_dept_hire_idx'),
+            models.Index(fields=['position', '-hire_date'], name='employee_position_hire_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.position}"
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+        super().save(*args, **kwargs)
+
+
+# Append-only log of employee changes for delta sync. The auto-increment id
+# is the sync watermark: SQLite serializes writers, so ids are handed out
+# in commit order.
+class EmployeeChange(models.Model):
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = (
+        (UPSERT, 'Created or updated'),
+        (DELETE, 'Deleted'),
+    )
+
+    employee_id = models.BigIntegerField()  # Plain id, the row may be gone (tombstone)
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
+
+    def __str__(self):
+        return f"{self.action} employee {self.employee_id}"
+
+    @classmethod
+    def record(cls, employee_ids, action):
+        cls.objects.bulk_create([cls(employee_id=employee_id, action=action) for employee_id in employee_ids])
 
 
 # Model to store dynamic form structure (forms)
@@ -94,11 +135,67 @@ class FormResponse(models.Model):
     def __str__(self):
         return f"Response to {self.form.title} - {self.created_at}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='response_created_at_idx'),
+            models.Index(fields=['form', 'created_at'], name='response_form_created_at_idx'),
+        ]
+
 # Model to store the actual answers to form fields
 class FormResponseField(models.Model):
     form_response = models.ForeignKey(FormResponse, related_name='response_fields', on_delete=models.CASCADE)
     form_field = models.ForeignKey(FormField, on_delete=models.CASCADE)  # The specific field
     answer = models.TextField()  # The user's answer to the field (could be text, number, etc.)
+    # Typed copies of the answer for number/date fields, filled in from the form schema
+    answer_number = models.FloatField(null=True, blank=True)
+    answer_date = models.DateField(null=True, blank=True)
 
     def __str__(self):
         return f"Response for {self.form_field.label}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['form_field', 'answer'], name='response_field_answer_idx'),
+            models.Index(fields=['form_field', 'answer_number'], name='response_field_number_idx'),
+            models.Index(fields=['form_field', 'answer_date'], name='response_field_date_idx'),
+        ]
+
+
+# Responses moved out of the hot tables by employee_app.archival, keeping
+# their original ids. Every period shares these tables, in the same database;
+# ``period`` (YYYY-MM of created_at) is an indexed column for per-month reads.
+class ArchivedFormResponse(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    form = models.ForeignKey(Form, related_name='archived_responses', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+    period = models.CharField(max_length=7)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived response to {self.form.title} - {self.created_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period'], name='archived_response_period_idx'),
+            models.Index(fields=['form', 'period'], name='archived_response_form_idx'),
+            # Admin changelist order (-created_at, then -pk as the tie-breaker)
+            models.Index(fields=['created_at', 'id'], name='archived_response_created_idx'),
+        ]
+
+class ArchivedFormResponseField(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    form_response = models.ForeignKey(ArchivedFormResponse, related_name='response_fields', on_delete=models.CASCADE)
+    form_field = models.ForeignKey(FormField, on_delete=models.CASCADE)
+    answer = models.TextField()
+    answer_number = models.FloatField(null=True, blank=True)
+    answer_date = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Archived response for {self.form_field.label}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['form_field', 'answer'], name='archived_field_answer_idx'),
+            models.Index(fields=['form_field', 'answer_number'], name='archived_field_number_idx'),
+            models.Index(fields=['form_field', 'answer_date'], name='archived_field_date_idx'),
+        ]
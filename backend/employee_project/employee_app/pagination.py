@@ -0,0 +1,174 @@
+import base64
+import json
+
+from django.core import exceptions
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the full ordering tuple.
+
+    Every page is fetched with a ``WHERE (a, b) < (x, y)`` style predicate
+    built from the last row of the previous page, so a deep page costs the
+    same as the first one (no OFFSET). The cursors handed to the client are
+    opaque base64 tokens.
+    """
+    ordering = ('id',)
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def get_ordering(self, request, queryset, view=None):
+        """
+        Return the ordering tuple. Views may override it (e.g. by relevance).
+        """
+        return getattr(view, 'pagination_ordering', None) or self.ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps([1 if reverse else 0] + list(values), default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def get_ordering_field(self, queryset, name):
+        """
+        The model field, or annotation output field, behind an ordering column.
+        """
+        try:
+            return queryset.model._meta.get_field(name)
+        except exceptions.FieldDoesNotExist:
+            return queryset.query.annotations[name].output_field
+
+    def decode_cursor(self, request, queryset):
+        """
+        Return ``(reverse, values)`` for the cursor in the request, or None.
+        Values are converted to the types of the ordering fields, so a
+        tampered cursor is rejected instead of failing in the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            reverse, values = payload[0], payload[1:]
+            if reverse not in (0, 1) or len(values) != len(self.ordering_fields):
+                raise ValueError
+            values = [
+                self.get_ordering_field(queryset, field).to_python(value)
+                for (field, _), value in zip(self.ordering_fields, values)
+            ]
+            # Ordering columns are never null
+            if any(value is None for value in values):
+                raise ValueError
+        except (TypeError, ValueError, IndexError, KeyError, UnicodeError, exceptions.ValidationError):
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return bool(reverse), values
+
+    def get_keyset_filter(self, values, reverse):
+        """
+        Build the row-value comparison ``ordering > values`` as OR-ed Q objects.
+
+        The redundant bound on the leading column lets the database seek into
+        an index on the ordering instead of filtering it from the start.
+        """
+        field, descending = self.ordering_fields[0]
+        bound = Q(**{f'{field}__{"lte" if descending != reverse else "gte"}': values[0]})
+        condition = Q()
+        for index, (field, descending) in enumerate(self.ordering_fields):
+            lookup = 'lt' if descending != reverse else 'gt'
+            term = Q(**{f'{field}__{lookup}': values[index]})
+            for previous_field, _ in self.ordering_fields[:index]:
+                term &= Q(**{previous_field: values[self.field_index[previous_field]]})
+            condition |= term
+        return bound & condition
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Order ``queryset`` and apply the cursor; the result is sliced to one
+        row more than the page size, to find out whether there is another page.
+        """
+        ordering = self.get_ordering(request, queryset, view)
+        self.ordering_fields = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        self.field_index = {field: index for index, (field, _) in enumerate(self.ordering_fields)}
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset)
+        self.reverse, self.cursor_values = cursor if cursor else (False, None)
+
+        if self.reverse:
+            order_by = [field if descending else f'-{field}' for field, descending in self.ordering_fields]
+        else:
+            order_by = list(ordering)
+        queryset = queryset.order_by(*order_by)
+        if self.cursor_values is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.cursor_values, self.reverse))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        page = results[:self.page_size]
+        if self.reverse:
+            page.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.cursor_values is not None
+        self.page = page
+        return page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for async views; the page is fetched with async iteration.
+        """
+        return self.set_page([row async for row in self.get_page_queryset(queryset, request, view)])
+
+    def get_row_values(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field, _ in self.ordering_fields]
+        return [getattr(row, field) for field, _ in self.ordering_fields]
+
+    def get_next_cursor(self):
+        if not self.page or not self.has_next:
+            return None
+        return self.encode_cursor(self.get_row_values(self.page[-1]), reverse=False)
+
+    def get_previous_cursor(self):
+        if not self.page or not self.has_previous:
+            return None
+        return self.encode_cursor(self.get_row_values(self.page[0]), reverse=True)
+
+    def get_pagination_data(self):
+        return {
+            'next': self.get_next_cursor(),
+            'previous': self.get_previous_cursor(),
+            'page_size': self.page_size,
+        }
+
+
+class EmployeeCursorPagination(KeysetPagination):
+    """
+    Matches ``Employee.Meta.ordering`` with ``id`` as a unique tie-breaker.
+    """
+    ordering = ('-hire_date', 'id')
+
+
+class FormResponseCursorPagination(KeysetPagination):
+    """
+    Newest responses first.
+    """
+    ordering = ('-id',)
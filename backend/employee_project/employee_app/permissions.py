@@ -0,0 +1,10 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAppAdmin(BasePermission):
+    """
+    Allows access only to the application's admins (``CustomUser.is_admin``),
+    not to Django staff.
+    """
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.is_admin)
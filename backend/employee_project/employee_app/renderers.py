@@ -0,0 +1,129 @@
+import decimal
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to DRF's stdlib json renderer/parser
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: application/msgpack is only offered when installed
+    msgpack = None
+
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback for types the fast encoders don't know. Decimals become strings
+    so values like salary keep their exact precision; everything else
+    follows DRF's JSONEncoder (lazy strings, querysets, timedeltas...).
+    """
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    return _drf_encoder.default(obj)
+
+
+def encode_msgpack_default(obj):
+    # MessagePack has no date types; send ISO 8601 strings like the JSON API
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return encode_default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSON renderer backed by orjson. Its output matches DRF's JSONRenderer
+    byte for byte except for:
+
+    - Decimals, which are rendered as strings (see encode_default);
+    - floats in exponent notation, written without the '+' and leading
+      zero ('1e16', '1.5e-7' where DRF writes '1e+16', '1.5e-07');
+    - NaN and Infinity, rendered as null where DRF raises ValueError.
+
+    orjson only indents by two spaces, so other indents, non-compact
+    output and integers wider than 64 bits are left to DRF's renderer.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent not in (None, 2) or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=option)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer: JavaScript treats them as line terminators
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSON parser backed by orjson.
+    """
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renders responses as MessagePack for clients sending
+    ``Accept: application/msgpack``.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_msgpack_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses ``Content-Type: application/msgpack`` request bodies.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """
+    Renders the text exposition format served to Prometheus scrapers.
+    Errors (e.g. a missing permission) are rendered as their detail text.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            data = f"{data.get('detail', data)}\n"
+        return (data or '').encode(self.charset)
@@ -0,0 +1,58 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Replica alias the current request may read from, set by ReplicaRoutingMiddleware
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+def replica_settings():
+    return getattr(settings, 'DATABASE_REPLICAS', {})
+
+
+def reading_from_primary():
+    """
+    False while the current request may read from a replica. Shared caches
+    are keyed by the primary's generations and versions, so they must not
+    be filled with what a lagging replica returned.
+    """
+    return replica_alias.get() is None
+
+
+def choose_replica():
+    """
+    One of the configured replica aliases, or None when there are none.
+    """
+    aliases = replica_settings().get('ALIASES', [])
+    return random.choice(aliases) if aliases else None
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a replica only while a request that was cleared for it
+    (see middleware.ReplicaRoutingMiddleware) is being served, and never
+    inside a transaction on the primary. User lookups, everything else
+    and every write go to the primary.
+    """
+    def db_for_read(self, model, **hints):
+        alias = replica_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        # Authentication must see new accounts, deactivations and password
+        # changes straight away
+        if model._meta.label == settings.AUTH_USER_MODEL:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary (see the sync_replica command)
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,155 @@
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# SQLite FTS5 shadow table over the searchable Employee columns. The trigram
+# tokenizer keeps the substring semantics of the old icontains filters while
+# letting the lookups use the full-text index. Triggers keep it in sync with
+# every insert/update/delete, including bulk_create() and queryset.update().
+SEARCH_TABLE = 'employee_search'
+SEARCH_COLUMNS = ('first_name', 'last_name', 'email', 'department', 'position')
+
+# Trigram queries need at least three characters to hit the index
+MIN_TERM_LENGTH = 3
+
+_columns = ', '.join(SEARCH_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+CREATE_SEARCH_TABLE_SQL = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        {_columns}, content='models_employee', content_rowid='id', tokenize='trigram'
+    )
+"""
+
+CREATE_SEARCH_TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON models_employee BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON models_employee BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON models_employee BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {SEARCH_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+]
+
+REBUILD_SEARCH_TABLE_SQL = f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+
+DROP_SEARCH_TABLE_SQL = [
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {SEARCH_TABLE}_au',
+    f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+]
+
+
+def search_index_supported(conn=None):
+    """
+    The FTS5 trigram tokenizer needs SQLite 3.34+; other backends use icontains.
+    """
+    conn = conn or connection
+    return conn.vendor == 'sqlite' and conn.Database.sqlite_version_info >= (3, 34, 0)
+
+
+def create_search_index(schema_editor):
+    """
+    Create (or re-create) the search table and its triggers, then index
+    the existing rows. Safe to call again from migrations that rebuild
+    ``models_employee``, since SQLite drops triggers with the old table.
+    """
+    if not search_index_supported(schema_editor.connection):
+        return
+    schema_editor.execute(CREATE_SEARCH_TABLE_SQL)
+    for statement in CREATE_SEARCH_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+    schema_editor.execute(REBUILD_SEARCH_TABLE_SQL)
+
+
+def drop_search_index(schema_editor):
+    if not search_index_supported(schema_editor.connection):
+        return
+    for statement in DROP_SEARCH_TABLE_SQL:
+        schema_editor.execute(statement)
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def split_terms(text, column=None):
+    """
+    Free-text queries match every whitespace separated term; a column filter
+    matches its whole value as one substring, like the old icontains lookup.
+    """
+    if column:
+        return [text.strip()] if text.strip() else []
+    return text.split()
+
+
+def build_match_expression(terms, column=None):
+    """
+    Turn search terms into an FTS5 MATCH expression in which every term must
+    appear as a substring. Terms too short for the trigram index are left
+    out; returns None when nothing indexable is left.
+    """
+    indexed = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    if not indexed:
+        return None
+    expression = ' AND '.join(_quote(term) for term in indexed)
+    if column:
+        return f'{{{column}}} : ({expression})'
+    return expression
+
+
+def _icontains(queryset, terms, columns):
+    condition = Q()
+    for term in terms:
+        term_condition = Q()
+        for column in columns:
+            term_condition |= Q(**{f'{column}__icontains': term})
+        condition &= term_condition
+    return queryset.filter(condition)
+
+
+def search_employees(queryset, text, column=None, rank=False):
+    """
+    Filter an Employee queryset down to rows matching ``text``, optionally
+    restricted to one column. With ``rank=True`` a ``search_rank`` annotation
+    is added (FTS5 bm25, lower is more relevant).
+    """
+    columns = (column,) if column else SEARCH_COLUMNS
+    terms = split_terms(text, column)
+    match = build_match_expression(terms, column) if search_index_supported() else None
+    if match is None:
+        # Only short terms or no FTS5: fall back to the plain substring scan
+        queryset = _icontains(queryset, terms, columns)
+        if rank:
+            queryset = queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset
+
+    table = queryset.model._meta.db_table
+    if rank:
+        # Join the index: MATCH runs once and each hit is looked up by rowid,
+        # instead of a correlated rank subquery running MATCH again per row
+        queryset = queryset.extra(
+            tables=[SEARCH_TABLE],
+            where=[f'{SEARCH_TABLE} MATCH %s', f'{SEARCH_TABLE}.rowid = {table}.id'],
+            params=[match],
+        ).annotate(search_rank=RawSQL(f'{SEARCH_TABLE}.rank', (), output_field=FloatField()))
+    else:
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', (match,))
+        )
+    # Terms below the trigram minimum are checked on the (already narrowed) rows
+    short_terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+    if short_terms:
+        queryset = _icontains(queryset, short_terms, columns)
+    return queryset
@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from .models import CustomUser, Employee
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
 from .models import Form, FormField, FormResponse, FormResponseField, FormSection
+from .cache import form_responses
+from .form_schema import form_schemas
 
 
 # Serializer for User Registration
@@ -45,8 +49,21 @@ class UserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("This email is already taken.")
         return value
 
+# Lets callers pick a subset of fields with fields=[...] / exclude=[...]
+class DynamicFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in exclude or ():
+            self.fields.pop(name, None)
+
 # Employee Serializer
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer()  # Nested User Serializer for handling user creation
 
     class Meta:
@@ -92,17 +109,51 @@ class EmployeeSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+# Slim Employee Serializer for list grids: no nested user, and it reads
+# plain dicts from .values() as well as model instances
+class EmployeeListItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Employee
+        fields = ['id', 'first_name', 'last_name', 'department', 'position']
+
+
+# Row serializers for the bulk import. They carry no unique validators, so
+# validating a row never touches the database; uniqueness is checked for the
+# whole batch at once in bulk.import_employees().
+class BulkUserSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(max_length=254)
+    is_admin = serializers.BooleanField(default=False)
+
+class BulkEmployeeSerializer(serializers.Serializer):
+    user = BulkUserSerializer()
+    first_name = serializers.CharField(max_length=100)
+    last_name = serializers.CharField(max_length=100)
+    email = serializers.EmailField(max_length=254)
+    phone = serializers.CharField(max_length=15)
+    department = serializers.CharField(max_length=100)
+    position = serializers.CharField(max_length=100)
+    hire_date = serializers.DateField()
+    salary = serializers.DecimalField(max_digits=10, decimal_places=2)
+    is_active = serializers.BooleanField(default=True)
 
 
 class FormSectionSerializer(serializers.ModelSerializer):
+    # Client-side handle that fields can use to point at a section created in the same request
+    key = serializers.CharField(write_only=True, required=False, max_length=100)
+
     class Meta:
         model = FormSection
-        fields = ['id', 'title', 'order']
+        fields = ['id', 'key', 'title', 'order']
 
 class FormFieldSerializer(serializers.ModelSerializer):
+    # A section ``key`` or, failing that, a section ``order`` from the same request
+    section = serializers.CharField(write_only=True, required=False, allow_null=True)
+    section_id = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = FormField
-        fields = ['id', 'label', 'field_type', 'required', 'order']
+        fields = ['id', 'label', 'field_type', 'required', 'order', 'section', 'section_id']
 
 class FormSerializer(serializers.ModelSerializer):
     sections = FormSectionSerializer(many=True)
@@ -112,24 +163,80 @@ class FormSerializer(serializers.ModelSerializer):
         model = Form
         fields = ['id', 'title', 'sections', 'fields']
 
+    def validate(self, attrs):
+        sections = attrs.get('sections', [])
+        by_key = {}
+        by_order = {}
+        errors = {}
+        for index, section in enumerate(sections):
+            key = section.get('key')
+            if key is not None:
+                if key in by_key:
+                    errors.setdefault('sections', {})[index] = {'key': ['Duplicate section key.']}
+                by_key[key] = index
+            by_order.setdefault(str(section.get('order', 0)), index)
+
+        for index, field in enumerate(attrs.get('fields', [])):
+            reference = field.pop('section', None)
+            if reference in (None, ''):
+                field['section_index'] = None
+            elif reference in by_key:
+                field['section_index'] = by_key[reference]
+            elif reference in by_order:
+                field['section_index'] = by_order[reference]
+            else:
+                errors.setdefault('fields', {})[index] = {'section': [f'Unknown section "{reference}".']}
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def create(self, validated_data):
+        """
+        Create the form, its sections and its fields with one insert each,
+        resolving field-to-section links in memory.
+        """
         sections_data = validated_data.pop('sections')
         fields_data = validated_data.pop('fields')
-        form = Form.objects.create(**validated_data)
+        with transaction.atomic():
+            form = Form.objects.create(**validated_data)
+            sections = FormSection.objects.bulk_create([
+                FormSection(form=form, **{key: value for key, value in data.items() if key != 'key'})
+                for data in sections_data
+            ])
+            FormField.objects.bulk_create([
+                FormField(
+                    form=form,
+                    section=sections[data['section_index']] if data['section_index'] is not None else None,
+                    **{key: value for key, value in data.items() if key != 'section_index'},
+                )
+                for data in fields_data
+            ])
+            # bulk_create() sends no post_save signals
+            form_schemas.invalidate_on_commit(form.pk)
+        return form
 
-        # Create sections
-        for section_data in sections_data:
-            section = FormSection.objects.create(form=form, **section_data)
+# Read-only representation of a whole form: sections with their nested
+# fields, plus the fields that sit outside any section
+class FormSectionDetailSerializer(serializers.ModelSerializer):
+    fields = FormFieldSerializer(many=True, read_only=True)
 
-        # Create fields
-        for field_data in fields_data:
-            section = FormSection.objects.get(id=field_data.get('section', None))
-            field_data['section'] = section if section else None
-            FormField.objects.create(form=form, **field_data)
+    class Meta:
+        model = FormSection
+        fields = ['id', 'title', 'order', 'fields']
 
-        return form
+class FormDetailSerializer(serializers.ModelSerializer):
+    sections = FormSectionDetailSerializer(many=True, read_only=True)
+    fields = FormFieldSerializer(many=True, read_only=True, source='unsectioned_fields')
+
+    class Meta:
+        model = Form
+        fields = ['id', 'title', 'sections', 'fields']
 
 class FormResponseFieldSerializer(serializers.ModelSerializer):
+    # A plain id: membership and type checks use the cached form schema, not a query per answer
+    form_field = serializers.IntegerField(source='form_field_id')
+
     class Meta:
         model = FormResponseField
         fields = ['form_field', 'answer']
@@ -140,12 +247,25 @@ class FormResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = FormResponse
         fields = ['id', 'form', 'created_at', 'response_fields']
+        read_only_fields = ['form']  # Taken from the URL
+
+    def validate_response_fields(self, response_fields):
+        """
+        Check the answers against the form's compiled schema: fields must
+        belong to the form, required fields must be answered and answers
+        must match the field type.
+        """
+        return form_schemas.get(self.context['form'].pk).clean(response_fields)
 
     def create(self, validated_data):
         response_fields_data = validated_data.pop('response_fields')
-        form_response = FormResponse.objects.create(**validated_data)
-        for response_field_data in response_fields_data:
-            FormResponseField.objects.create(form_response=form_response, **response_field_data)
+        with transaction.atomic():
+            form_response = FormResponse.objects.create(**validated_data)
+            FormResponseField.objects.bulk_create([
+                FormResponseField(form_response=form_response, **response_field_data)
+                for response_field_data in response_fields_data
+            ])
+            form_responses.invalidate_on_commit([form_response.form_id])
         return form_response
 
 
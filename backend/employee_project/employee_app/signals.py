@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import metrics
+from .authentication import user_cache, user_cache_key
+from .cache import employee_cache
+from .form_schema import form_schemas
+from .models import CustomUser, Employee, EmployeeChange, Form, FormField, FormSection
+
+# CustomUser fields rendered inside EmployeeSerializer (via UserSerializer)
+NESTED_USER_FIELDS = {'username', 'email', 'is_admin'}
+
+
+# Any change to an employee, or to the user nested in its representation,
+# invalidates the cached employee list and detail payloads
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_employee_cache(sender, **kwargs):
+    employee_cache.invalidate_on_commit()
+
+
+# Drop the cached authentication entry whenever the user changes (profile
+# edits, deactivation, password changes); again on commit so a request
+# racing the transaction can't re-cache the old row
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def evict_cached_user(sender, instance, **kwargs):
+    key = user_cache_key(instance.pk)
+    user_cache.delete(key)
+    transaction.on_commit(lambda: user_cache.delete(key))
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_employee_for_user(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Bump the version/updated_at of the user's employee so its ETag changes
+    when the nested user data does.
+    """
+    if created or (update_fields is not None and not NESTED_USER_FIELDS.intersection(update_fields)):
+        return
+    employee_ids = list(Employee.objects.filter(user=instance).values_list('id', flat=True))
+    if employee_ids:
+        Employee.objects.filter(id__in=employee_ids).update(version=F('version') + 1, updated_at=timezone.now())
+        EmployeeChange.record(employee_ids, EmployeeChange.UPSERT)
+
+
+# Change log for the delta-sync endpoint
+@receiver(post_save, sender=Employee)
+def record_employee_upsert(sender, instance, **kwargs):
+    EmployeeChange.record([instance.pk], EmployeeChange.UPSERT)
+
+
+@receiver(post_delete, sender=Employee)
+def record_employee_delete(sender, instance, **kwargs):
+    EmployeeChange.record([instance.pk], EmployeeChange.DELETE)
+
+
+# Compiled schemas and cached form payloads are rebuilt after any change to the form
+@receiver(post_save, sender=FormField)
+@receiver(post_delete, sender=FormField)
+@receiver(post_save, sender=FormSection)
+@receiver(post_delete, sender=FormSection)
+def invalidate_form_schema(sender, instance, **kwargs):
+    form_schemas.invalidate_on_commit(instance.form_id)
+
+
+@receiver(post_save, sender=Form)
+@receiver(post_delete, sender=Form)
+def invalidate_form(sender, instance, **kwargs):
+    form_schemas.invalidate_on_commit(instance.pk)
+
+
+# Each thread opens its own connections; all of them time their queries for
+# QueryMetricsMiddleware
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if metrics.record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(metrics.record_query)
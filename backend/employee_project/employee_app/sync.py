@@ -0,0 +1,58 @@
+from rest_framework.exceptions import ValidationError
+
+from .models import Employee, EmployeeChange
+from .serializers import EmployeeSerializer
+
+DEFAULT_CHANGES_LIMIT = 500
+MAX_CHANGES_LIMIT = 5000
+
+
+def parse_token(value):
+    """
+    Sync tokens are the id of the last change log entry a client has seen.
+    """
+    try:
+        token = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({'since': ['Invalid sync token.']})
+    if token < 0:
+        raise ValidationError({'since': ['Invalid sync token.']})
+    return token
+
+
+def current_token():
+    last = EmployeeChange.objects.order_by('-id').values_list('id', flat=True).first()
+    return str(last or 0)
+
+
+def get_changes(since, limit=DEFAULT_CHANGES_LIMIT):
+    """
+    Collapse the change log entries after ``since`` into the current state
+    of every touched employee plus tombstones for deleted ones.
+
+    Only the log range and the touched rows are read, so the cost follows
+    the number of changes rather than headcount.
+    """
+    entries = list(
+        EmployeeChange.objects.filter(id__gt=since).order_by('id').values_list('id', 'employee_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # The last action per employee wins
+    latest = {}
+    for _, employee_id, action in entries:
+        latest[employee_id] = action
+
+    upserted_ids = [employee_id for employee_id, action in latest.items() if action == EmployeeChange.UPSERT]
+    employees = list(Employee.objects.select_related('user').filter(id__in=upserted_ids).order_by('id'))
+    found = {employee.pk for employee in employees}
+    # Rows deleted after this window are already gone; report them as deleted now
+    deleted = sorted(employee_id for employee_id in latest if employee_id not in found)
+
+    return {
+        'updated': EmployeeSerializer(employees, many=True).data,
+        'deleted': deleted,
+        'next_token': str(entries[-1][0]) if entries else str(since),
+        'has_more': has_more,
+    }
@@ -1,3 +1,1418 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import os
+import runpy
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from . import analytics, archival, bulk, exports, metrics
+from .admin import FormResponseAdmin
+from .authentication import user_cache, user_cache_key
+from .cache import employee_cache, form_cache
+from .form_schema import form_schemas
+from .hashing import password_hashers
+from .middleware import CsrfViewMiddleware, ReplicaRoutingMiddleware, SessionMiddleware
+from .models import ArchivedFormResponse, CustomUser, Employee, Form, FormField, FormResponse, FormResponseField
+from .renderers import ORJSONRenderer, msgpack
+from .routers import ReplicaRouter, replica_alias
+from .search import search_index_supported
+from .serializers import BulkEmployeeSerializer, FormResponseSerializer
+from .views import (
+    AsyncEmployeeDetailView, AsyncEmployeeListView, AsyncFormDetailView, AsyncProfileView, AsyncSubmitFormResponseView,
+    EmployeeDetailView, EmployeeListView,
+)
+
+
+def create_employees(count, start=0):
+    """
+    Bulk-create ``count`` employees (and their users) for list tests.
+    """
+    users = CustomUser.objects.bulk_create([
+        CustomUser(username=f'user{i}', email=f'user{i}@example.com')
+        for i in range(start, start + count)
+    ])
+    return Employee.objects.bulk_create([
+        Employee(
+            user=user,
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            email=f'employee{i}@example.com',
+            phone='5550100',
+            department='Engineering' if i % 2 else 'Finance',
+            position='Engineer',
+            # Several employees share each hire date to exercise the id tie-breaker
+            hire_date=date(2020, 1, 1) + timedelta(days=i // 3),
+            salary='50000.00',
+        )
+        for i, user in zip(range(start, start + count), users)
+    ])
+
+
+class EmployeeAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            username='admin', email='admin@example.com', password='s3cret-pass'
+        )
+        self.client.force_authenticate(self.admin)
+        employee_cache.clear()
+        form_schemas.clear()
+
+
+class EmployeeListPaginationTests(EmployeeAPITestCase):
+    def test_cursor_pages_cover_all_rows_in_order(self):
+        create_employees(25)
+        expected = list(Employee.objects.order_by('-hire_date', 'id').values_list('id', flat=True))
+
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': 7}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(reverse('employee-list'), params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['data'])
+            cursor = response.data['pagination']['next']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        create_employees(10)
+        first = self.client.get(reverse('employee-list'), {'page_size': 4})
+        second = self.client.get(reverse('employee-list'), {
+            'page_size': 4, 'cursor': first.data['pagination']['next'],
+        })
+        back = self.client.get(reverse('employee-list'), {
+            'page_size': 4, 'cursor': second.data['pagination']['previous'],
+        })
+        self.assertEqual(
+            [row['id'] for row in back.data['data']],
+            [row['id'] for row in first.data['data']],
+        )
+
+    def test_page_size_is_capped(self):
+        create_employees(3)
+        response = self.client.get(reverse('employee-list'), {'page_size': 10 ** 6})
+        self.assertEqual(response.data['pagination']['page_size'], 1000)
+
+    def test_invalid_cursor_is_bad_request(self):
+        create_employees(1)
+        response = self.client.get(reverse('employee-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tampered_cursor_values_are_bad_request(self):
+        create_employees(1)
+        for values in ([0, ['garbage', 1], 1], [0, '2020-01-01', 'abc'], [0, None, 1], [0, '2020-01-01', {}]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            with self.subTest(values=values):
+                response = self.client.get(reverse('employee-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data['errors'])
+        cursor = base64.urlsafe_b64encode(json.dumps([0, 'high', 1]).encode()).decode()
+        response = self.client.get(reverse('employee-list'), {'q': 'example', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+
+class EmployeeQueryCountTests(EmployeeAPITestCase):
+    def assertListQueries(self, count):
+        create_employees(count)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('employee-list'), {'page_size': count})
+        self.assertEqual(len(response.data['data']), count)
+        self.assertIn('username', response.data['data'][0]['user'])
+
+    def test_list_of_1_employee_is_one_query(self):
+        self.assertListQueries(1)
+
+    def test_list_of_100_employees_is_one_query(self):
+        self.assertListQueries(100)
+
+    def test_list_of_1000_employees_is_one_query(self):
+        self.assertListQueries(1000)
+
+    def test_detail_is_one_query(self):
+        employee = create_employees(1)[0]
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('employee-detail', args=[employee.pk]))
+        self.assertEqual(response.data['data']['user']['username'], employee.user.username)
+
+
+class EmployeeSearchTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        create_employees(3)
+        Employee.objects.filter(pk=Employee.objects.order_by('id')[0].pk).update(
+            first_name='Johanna', department='Marketing'
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse('employee-list'), params)
+        if response.status_code == 404:
+            return []
+        return [row['first_name'] for row in response.data['data']]
+
+    def test_column_filter_matches_substrings_case_insensitively(self):
+        self.assertEqual(self.search(first_name='HANN'), ['Johanna'])
+        self.assertEqual(self.search(department='market'), ['Johanna'])
+
+    def test_index_follows_updates_and_deletes(self):
+        employee = Employee.objects.get(first_name='Johanna')
+        employee.first_name = 'Joanne'
+        employee.save()
+        self.assertEqual(self.search(first_name='hanna'), [])
+        self.assertEqual(self.search(first_name='oanne'), ['Joanne'])
+        employee.delete()
+        self.assertEqual(self.search(first_name='oanne'), [])
+
+    def test_free_text_query_requires_every_term(self):
+        self.assertEqual(self.search(q='johanna marketing'), ['Johanna'])
+        self.assertEqual(self.search(q='johanna finance'), [])
+
+    def test_free_text_query_is_ranked_and_paginated(self):
+        first = self.client.get(reverse('employee-list'), {'q': 'example', 'page_size': 2})
+        second = self.client.get(reverse('employee-list'), {
+            'q': 'example', 'page_size': 2, 'cursor': first.data['pagination']['next'],
+        })
+        ids = [row['id'] for row in first.data['data'] + second.data['data']]
+        self.assertEqual(sorted(ids), sorted(Employee.objects.values_list('id', flat=True)))
+
+    @skipUnless(search_index_supported(), 'SQLite FTS5 trigram tokenizer is not available')
+    def test_ranked_query_matches_the_index_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search(q='johanna'), ['Johanna'])
+        self.assertEqual([query['sql'].count('MATCH') for query in queries if 'MATCH' in query['sql']], [1])
+
+
+def import_row(i, **overrides):
+    row = {
+        'user': {'username': f'import{i}', 'email': f'import{i}@example.com'},
+        'first_name': f'Imported{i}',
+        'last_name': 'Employee',
+        'email': f'imported{i}@example.com',
+        'phone': '5550199',
+        'department': 'Support',
+        'position': 'Agent',
+        'hire_date': '2024-03-01',
+        'salary': '42000.00',
+    }
+    row.update(overrides)
+    return row
+
+
+class EmployeeBulkImportTests(EmployeeAPITestCase):
+    def test_json_import_creates_all_rows_in_constant_queries(self):
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                reverse('employee-bulk-import'), [import_row(i) for i in range(50)], format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], 50)
+        self.assertEqual(Employee.objects.filter(department='Support').count(), 50)
+
+    def test_csv_upload(self):
+        csv_file = SimpleUploadedFile('employees.csv', (
+            'user.username,user.email,first_name,last_name,email,phone,department,position,hire_date,salary\n'
+            'csv1,csv1@example.com,Ann,Lee,ann@example.com,555,Legal,Counsel,2024-01-02,90000\n'
+        ).encode())
+        response = self.client.post(reverse('employee-bulk-import'), {'file': csv_file})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Employee.objects.filter(user__username='csv1', first_name='Ann').exists())
+
+    def test_errors_are_reported_per_row_and_nothing_is_written(self):
+        rows = [
+            import_row(0),
+            import_row(1, user={'username': 'admin', 'email': 'new@example.com'}),
+            import_row(2, email='imported0@example.com'),
+            import_row(3, hire_date='not-a-date'),
+        ]
+        response = self.client.post(reverse('employee-bulk-import'), rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2, 3])
+        self.assertIn('user.username', response.data['errors'][0]['errors'])
+        self.assertIn('email', response.data['errors'][1]['errors'])
+        self.assertIn('hire_date', response.data['errors'][2]['errors'])
+        self.assertFalse(Employee.objects.filter(department='Support').exists())
+
+    def test_column_validation_matches_the_serializer(self):
+        rows = [
+            import_row(0),
+            import_row(1, salary='12.345', is_active='yes'),
+            import_row(2, user={'username': 'bad name!', 'email': 'x'}, hire_date=None),
+            import_row(3, user='not an object'),
+            import_row(4, user={'username': 'u4', 'email': 'u4@example.com', 'is_admin': 1}),
+            import_row(5, salary=42000, phone=''),
+            {'first_name': 'Only'},
+            'not an object',
+        ]
+        serializer = BulkEmployeeSerializer()
+        validated, errors = bulk.validate_columns(serializer, enumerate(rows))
+        for index, row in enumerate(rows):
+            try:
+                expected = serializer.run_validation(row)
+            except ValidationError as exc:
+                self.assertEqual(errors[index], exc.detail)
+                self.assertNotIn(index, validated)
+            else:
+                self.assertEqual(validated[index], expected)
+                self.assertNotIn(index, errors)
+        self.assertEqual(sorted(validated), [0, 4])
+
+
+class EmployeeExportTests(EmployeeAPITestCase):
+    def export(self, **params):
+        response = self.client.get(reverse('employee-export'), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_honours_filters(self):
+        create_employees(6)
+        lines = self.export(department='Finance').splitlines()
+        self.assertTrue(lines[0].startswith('id,username,user_email,first_name'))
+        self.assertEqual(len(lines), 1 + Employee.objects.filter(department='Finance').count())
+
+    def test_ndjson_export(self):
+        employee = create_employees(1)[0]
+        rows = [json.loads(line) for line in self.export(export_format='ndjson').splitlines()]
+        self.assertEqual(rows[0]['username'], employee.user.username)
+        self.assertEqual(rows[0]['salary'], '50000.00')
+        self.assertEqual(rows[0]['hire_date'], '2020-01-01')
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse('employee-export'), {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.object(exports, 'EXPORT_BUFFER_SIZE', 1)
+    async def test_asgi_export_streams_chunk_by_chunk(self):
+        await sync_to_async(create_employees)(3)
+        token = await sync_to_async(AccessToken.for_user)(self.admin)
+        response = await self.async_client.get(
+            reverse('employee-export'), headers={'authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        # An async iterator, so Django doesn't buffer the export into a list
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(len(b''.join(chunks).decode().splitlines()), 4)
+
+
+class EmployeeCacheTests(EmployeeAPITestCase):
+    def test_repeated_list_is_served_without_queries(self):
+        create_employees(3)
+        first = self.client.get(reverse('employee-list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('employee-list'))
+        self.assertEqual(first.data['data'], second.data['data'])
+
+    def test_query_parameter_order_does_not_matter(self):
+        create_employees(3)
+        self.client.get(reverse('employee-list') + '?department=Finance&page_size=2')
+        with self.assertNumQueries(0):
+            self.client.get(reverse('employee-list') + '?page_size=2&department=Finance')
+
+    def test_saving_an_employee_or_user_invalidates(self):
+        employee = create_employees(1)[0]
+        url = reverse('employee-detail', args=[employee.pk])
+        self.client.get(url)
+        self.client.get(reverse('employee-list'))
+
+        employee.first_name = 'Renamed'
+        employee.save()
+        self.assertEqual(self.client.get(url).data['data']['first_name'], 'Renamed')
+
+        employee.user.username = 'renamed-user'
+        employee.user.save()
+        response = self.client.get(reverse('employee-list'))
+        self.assertEqual(response.data['data'][0]['user']['username'], 'renamed-user')
+
+    def test_bulk_import_invalidates(self):
+        create_employees(1)
+        self.client.get(reverse('employee-list'))
+        self.client.post(reverse('employee-bulk-import'), [import_row(0)], format='json')
+        response = self.client.get(reverse('employee-list'))
+        self.assertEqual(len(response.data['data']), 2)
+
+    def test_a_hit_is_one_backend_round_trip(self):
+        create_employees(1)
+        self.client.get(reverse('employee-list'))
+        backend = employee_cache.backend
+        with mock.patch.object(backend, 'get_many', wraps=backend.get_many) as get_many:
+            self.assertEqual(self.client.get(reverse('employee-list')).status_code, 200)
+            # From the LRU: only the generation is read
+            self.assertEqual(get_many.call_args.args[0], [employee_cache.generation_key])
+            employee_cache.lru.clear()
+            self.assertEqual(self.client.get(reverse('employee-list')).status_code, 200)
+            self.assertEqual(len(get_many.call_args.args[0]), 2)
+        self.assertEqual(get_many.call_count, 2)
+
+    def test_invalidation_by_another_process_is_seen(self):
+        employee_cache.set('entry', {'id': 1})
+        self.assertEqual(employee_cache.get('entry'), {'id': 1})
+        # Another worker bumps the shared generation; this LRU still holds the entry
+        employee_cache.backend.incr(employee_cache.generation_key)
+        self.assertIsNone(employee_cache.get('entry'))
+
+    async def test_async_lookups_use_a_thread_for_remote_backends_only(self):
+        await employee_cache.aset('entry', {'id': 1})
+        with mock.patch('employee_app.cache.sync_to_async', wraps=sync_to_async) as to_thread:
+            self.assertEqual(await employee_cache.aget('entry'), {'id': 1})
+            to_thread.assert_not_called()
+            with mock.patch('employee_app.cache.blocks', return_value=True):
+                self.assertEqual(await employee_cache.aget('entry'), {'id': 1})
+            to_thread.assert_called_once()
+
+    def test_stats_are_exposed_to_admins_only(self):
+        self.admin.is_staff = True
+        self.admin.save()
+        self.assertEqual(self.client.get(reverse('runtime-stats')).status_code, 403)
+
+        self.admin.is_admin = True
+        self.admin.save()
+        create_employees(1)
+        self.client.get(reverse('employee-list'))
+        self.client.get(reverse('employee-list'))
+        stats = self.client.get(reverse('runtime-stats')).data['data']['employee_cache']
+        self.assertGreaterEqual(stats['local']['hits'], 1)
+        self.assertGreaterEqual(stats['local']['misses'], 1)
+
+
+class EmployeeConditionalGetTests(EmployeeAPITestCase):
+    def test_detail_returns_304_for_matching_etag_without_serializing(self):
+        employee = create_employees(1)[0]
+        url = reverse('employee-detail', args=[employee.pk])
+        etag = self.client.get(url)['ETag']
+        employee_cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_detail_honours_if_modified_since(self):
+        employee = create_employees(1)[0]
+        url = reverse('employee-detail', args=[employee.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_employee_or_user_changes(self):
+        employee = create_employees(1)[0]
+        url = reverse('employee-detail', args=[employee.pk])
+        first = self.client.get(url)['ETag']
+
+        employee.phone = '5550000'
+        employee.save()
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(second.status_code, 200)
+
+        employee.user.email = 'changed@example.com'
+        employee.user.save()
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.data['data']['user']['email'], 'changed@example.com')
+
+    def test_list_returns_304_until_the_page_changes(self):
+        employees = create_employees(3)
+        etag = self.client.get(reverse('employee-list'))['ETag']
+        employee_cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('employee-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        employees[0].delete()
+        response = self.client.get(reverse('employee-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class EmployeeChangesTests(EmployeeAPITestCase):
+    def changes(self, since, **params):
+        response = self.client.get(reverse('employee-changes'), {'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_changes_since_token(self):
+        employee = create_employees(1)[0]
+        token = self.client.get(reverse('employee-changes')).data['data']['next_token']
+
+        employee.position = 'Lead'
+        employee.save()
+        self.client.post(reverse('employee-bulk-import'), [import_row(0)], format='json')
+
+        data = self.changes(token)
+        self.assertEqual(
+            sorted(row['id'] for row in data['updated']),
+            sorted([employee.pk, Employee.objects.get(first_name='Imported0').pk]),
+        )
+        self.assertEqual(data['deleted'], [])
+        self.assertEqual(self.changes(data['next_token'])['updated'], [])
+
+    def test_deletes_are_reported_as_tombstones(self):
+        employee = create_employees(1)[0]
+        token = self.client.get(reverse('employee-changes')).data['data']['next_token']
+        pk = employee.pk
+        self.client.delete(reverse('employee-detail', args=[pk]))
+
+        data = self.changes(token)
+        self.assertEqual(data['deleted'], [pk])
+        self.assertEqual(data['updated'], [])
+
+    def test_limit_pages_through_the_log(self):
+        token = self.client.get(reverse('employee-changes')).data['data']['next_token']
+        self.client.post(reverse('employee-bulk-import'), [import_row(i) for i in range(5)], format='json')
+        first = self.changes(token, limit=3)
+        second = self.changes(first['next_token'], limit=3)
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['updated']) + len(second['updated']), 5)
+
+    def test_invalid_token(self):
+        response = self.client.get(reverse('employee-changes'), {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+
+class EmployeeSparseFieldsetTests(EmployeeAPITestCase):
+    def test_fields_parameter_limits_output_and_columns(self):
+        create_employees(2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employee-list'), {'fields': 'id,first_name,department'})
+        self.assertEqual(set(response.data['data'][0]), {'id', 'first_name', 'department'})
+        sql = queries[0]['sql']
+        self.assertNotIn('salary', sql)
+        self.assertNotIn('employee_app_customuser', sql)
+
+    def test_exclude_parameter(self):
+        create_employees(1)
+        response = self.client.get(reverse('employee-list'), {'exclude': 'user,salary'})
+        self.assertNotIn('user', response.data['data'][0])
+        self.assertNotIn('salary', response.data['data'][0])
+        self.assertIn('email', response.data['data'][0])
+
+    def test_slim_view_and_pagination(self):
+        create_employees(5)
+        first = self.client.get(reverse('employee-list'), {'view': 'slim', 'page_size': 3})
+        self.assertEqual(set(first.data['data'][0]), {'id', 'first_name', 'last_name', 'department', 'position'})
+        second = self.client.get(reverse('employee-list'), {
+            'view': 'slim', 'page_size': 3, 'cursor': first.data['pagination']['next'],
+        })
+        self.assertEqual(len(first.data['data']) + len(second.data['data']), 5)
+
+    def test_detail_fields_and_unknown_field(self):
+        employee = create_employees(1)[0]
+        url = reverse('employee-detail', args=[employee.pk])
+        self.assertEqual(set(self.client.get(url, {'fields': 'id,user'}).data['data']), {'id', 'user'})
+        self.assertEqual(self.client.get(url, {'fields': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('employee-list'), {'exclude': 'nope'}).status_code, 400)
+
+
+class RendererTests(EmployeeAPITestCase):
+    def test_json_response_is_rendered_with_exact_decimals_and_iso_dates(self):
+        rendered = ORJSONRenderer().render({
+            'salary': Decimal('12345.10'), 'hire_date': date(2024, 2, 29),
+            'updated_at': datetime(2024, 2, 29, 8, 30, tzinfo=dt_timezone.utc),
+        })
+        self.assertEqual(json.loads(rendered), {
+            'salary': '12345.10', 'hire_date': '2024-02-29', 'updated_at': '2024-02-29T08:30:00Z',
+        })
+
+    def test_json_output_matches_drf_renderer(self):
+        data = {
+            'updated_at': datetime(2024, 2, 29, 8, 30, 1, 123456, tzinfo=dt_timezone.utc),
+            'name': 'Zo\u00eb\u2028\u2029', 'ids': (1, 2 ** 70), 'ratio': 0.25, 'nested': {1: [], 'b': {}},
+        }
+        for media_type in (None, 'application/json; indent=2', 'application/json; indent=4'):
+            with self.subTest(media_type=media_type):
+                self.assertEqual(ORJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+    def test_json_output_differs_from_drf_only_in_decimals_and_float_exponents(self):
+        data = {'salary': Decimal('12345.10'), 'big': 1e16, 'small': 1.5e-7}
+        self.assertEqual(ORJSONRenderer().render(data), b'{"salary":"12345.10","big":1e16,"small":1.5e-7}')
+        self.assertEqual(JSONRenderer().render(data), b'{"salary":12345.1,"big":1e+16,"small":1.5e-07}')
+
+    def test_employee_list_as_json(self):
+        create_employees(2)
+        response = self.client.get(reverse('employee-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(json.loads(response.content)['data']), 2)
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_employee_list_as_msgpack(self):
+        create_employees(2)
+        response = self.client.get(reverse('employee-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        payload = msgpack.unpackb(response.content)
+        self.assertEqual(payload['data'][0]['salary'], '50000.00')
+
+    def test_representations_vary_on_accept_and_have_their_own_etags(self):
+        employee = create_employees(1)[0]
+        for url in (reverse('employee-list'), reverse('employee-detail', args=[employee.pk])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn('Accept', response['Vary'])
+                etag = response['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                # The browsable API's HTML must not be validated by the JSON ETag
+                html = self.client.get(url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(html.status_code, 200)
+                self.assertNotEqual(html['ETag'], etag)
+                self.assertIn('Accept', html['Vary'])
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_request_body(self):
+        body = msgpack.packb([import_row(0)])
+        response = self.client.post(reverse('employee-bulk-import'), body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, 201)
+
+
+def form_payload(section_count, field_count):
+    return {
+        'title': 'Onboarding',
+        'sections': [{'key': f's{i}', 'title': f'Section {i}', 'order': i} for i in range(section_count)],
+        'fields': [
+            {'label': f'Field {i}', 'field_type': 'text', 'order': i, 'section': f's{i % section_count}'}
+            for i in range(field_count)
+        ],
+    }
+
+
+class FormCreateTests(EmployeeAPITestCase):
+    def test_fields_are_linked_to_sections_by_key_or_order(self):
+        payload = form_payload(2, 2)
+        payload['fields'].append({'label': 'By order', 'field_type': 'date', 'section': 1})
+        payload['fields'].append({'label': 'Loose', 'field_type': 'number'})
+        response = self.client.post(reverse('create-form'), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        form = Form.objects.get(pk=response.data['id'])
+        sections = {section.title: section.pk for section in form.sections.all()}
+        links = dict(form.fields.values_list('label', 'section_id'))
+        self.assertEqual(links, {
+            'Field 0': sections['Section 0'], 'Field 1': sections['Section 1'],
+            'By order': sections['Section 1'], 'Loose': None,
+        })
+        self.assertEqual(response.data['fields'][0]['section_id'], sections['Section 0'])
+
+    def test_unknown_section_is_rejected(self):
+        payload = form_payload(1, 1)
+        payload['fields'][0]['section'] = 'missing'
+        response = self.client.post(reverse('create-form'), payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Form.objects.exists())
+
+    def test_query_count_does_not_grow_with_form_size(self):
+        counts = []
+        # 150 fields still fit in one INSERT under Django's 999-parameter SQLite batches
+        for sections, fields in ((1, 2), (20, 150)):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(reverse('create-form'), form_payload(sections, fields), format='json')
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class FormResponseBatchTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = Form.objects.create(title='Survey')
+        self.name = FormField.objects.create(form=self.form, label='Name', field_type='text')
+        self.age = FormField.objects.create(form=self.form, label='Age', field_type='number')
+        self.url = reverse('submit-form-response', args=[self.form.pk])
+
+    def answers(self, name, age):
+        return {'response_fields': [
+            {'form_field': self.name.pk, 'answer': name},
+            {'form_field': self.age.pk, 'answer': age},
+        ]}
+
+    def test_single_response_is_still_accepted(self):
+        response = self.client.post(self.url, self.answers('Ada', '36'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['response_fields']), 2)
+
+    def test_batch_reports_failed_items_and_saves_the_rest(self):
+        other = FormField.objects.create(form=Form.objects.create(title='Other'), label='X', field_type='text')
+        items = [
+            self.answers('Ada', '36'),
+            {'response_fields': [{'form_field': other.pk, 'answer': 'nope'}]},
+            {'response_fields': [{'answer': 'missing field'}]},
+            self.answers('Grace', '45'),
+        ]
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item['index'] for item in response.data['data']['created']], [0, 3])
+        self.assertEqual([item['index'] for item in response.data['errors']], [1, 2])
+        self.assertEqual(FormResponse.objects.filter(form=self.form).count(), 2)
+        self.assertEqual(FormResponseField.objects.count(), 4)
+
+    def test_batch_inserts_do_not_grow_with_batch_size(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, [self.answers(f'N{i}', str(i)) for i in range(50)], format='json')
+        self.assertEqual(response.status_code, 201)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 2)
+
+
+class FormSchemaValidationTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.form = Form.objects.create(title='Survey')
+        self.fields = FormField.objects.bulk_create([
+            FormField(form=self.form, label=f'Q{i}', field_type=('text', 'number', 'date', 'password')[i % 4], required=i % 2 == 0)
+            for i in range(100)
+        ])
+
+    def answer(self, field):
+        return {'text': 'hello', 'number': ' 4.50', 'date': '2024-02-29', 'password': 'secret'}[field.field_type]
+
+    def test_answers_are_checked_against_the_form(self):
+        number, date_field = self.fields[1], self.fields[2]
+        payload = {'response_fields': [
+            {'form_field': number.pk, 'answer': 'many'},
+            {'form_field': date_field.pk, 'answer': '29/02/2024'},
+            {'form_field': 999999, 'answer': 'x'},
+        ]}
+        response = self.client.post(reverse('submit-form-response', args=[self.form.pk]), payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['response_fields']
+        self.assertEqual(errors[str(number.pk)], ['Enter a number.'])
+        self.assertIn('YYYY-MM-DD', errors[str(date_field.pk)][0])
+        self.assertIn('does not belong', errors['999999'][0])
+        self.assertIn('"Q0" is required.', errors[str(self.fields[0].pk)])
+
+    def test_valid_answers_are_normalised(self):
+        payload = {'response_fields': [{'form_field': field.pk, 'answer': self.answer(field)} for field in self.fields]}
+        response = self.client.post(reverse('submit-form-response', args=[self.form.pk]), payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(FormResponseField.objects.get(form_field=self.fields[1]).answer, '4.50')
+
+    def test_validating_100_answers_runs_no_queries_once_compiled(self):
+        payload = {'response_fields': [{'form_field': field.pk, 'answer': self.answer(field)} for field in self.fields]}
+        FormResponseSerializer(data=payload, context={'form': self.form}).is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            serializer = FormResponseSerializer(data=payload, context={'form': self.form})
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(len(queries), 0)
+
+    def test_schema_is_rebuilt_when_fields_change(self):
+        payload = {'response_fields': [{'form_field': field.pk, 'answer': self.answer(field)} for field in self.fields]}
+        self.assertTrue(FormResponseSerializer(data=payload, context={'form': self.form}).is_valid())
+        extra = FormField.objects.create(form=self.form, label='Late', field_type='number')
+        serializer = FormResponseSerializer(data=payload, context={'form': self.form})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn(str(extra.pk), serializer.errors['response_fields'])
+        extra.delete()
+        self.assertTrue(FormResponseSerializer(data=payload, context={'form': self.form}).is_valid())
+
+
+class FormDetailTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        form_cache.clear()
+        response = self.client.post(reverse('create-form'), form_payload(3, 30), format='json')
+        self.form = Form.objects.get(pk=response.data['id'])
+        FormField.objects.create(form=self.form, label='Loose', field_type='text', order=99)
+        self.url = reverse('form-detail', args=[self.form.pk])
+
+    def test_form_is_returned_with_nested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        # form, sections, their fields, and the unsectioned fields
+        self.assertEqual(len(queries), 4)
+        data = json.loads(response.content)
+        self.assertEqual([len(section['fields']) for section in data['sections']], [10, 10, 10])
+        self.assertEqual([field['label'] for field in data['fields']], ['Loose'])
+
+    def test_repeat_reads_are_served_from_cache(self):
+        first = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(first.content, second.content)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 0)
+
+    def test_changes_to_the_form_invalidate_the_cache(self):
+        first = self.client.get(self.url)
+        FormField.objects.filter(label='Loose').get().delete()
+        response = self.client.get(self.url)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(json.loads(response.content)['fields'], [])
+        self.form.title = 'Renamed'
+        self.form.save()
+        self.assertEqual(json.loads(self.client.get(self.url).content)['title'], 'Renamed')
+
+    def test_missing_form(self):
+        self.assertEqual(self.client.get(reverse('form-detail', args=[999999])).status_code, 404)
+
+    def test_a_hit_is_one_backend_round_trip(self):
+        first = self.client.get(self.url)
+        backend = form_cache.backend
+        with mock.patch.object(backend, 'get_many', wraps=backend.get_many) as get_many:
+            self.assertEqual(self.client.get(self.url).content, first.content)
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        self.assertEqual(get_many.call_count, 2)
+
+    def test_async_view_matches_and_hits_stay_on_the_event_loop(self):
+        expected = self.client.get(self.url)
+        form_cache.clear()
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, user=self.admin)
+        view = AsyncFormDetailView.as_view()
+        response = async_to_sync(view)(request, form_id=self.form.pk)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['ETag'], expected['ETag'])
+
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, user=self.admin)
+        with mock.patch('employee_app.cache.sync_to_async') as to_thread, self.assertNumQueries(0):
+            response = async_to_sync(view)(request, form_id=self.form.pk)
+        to_thread.assert_not_called()
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(async_to_sync(view)(request, form_id=999999).status_code, 404)
+
+
+class FormResponsesTestCase(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        form_cache.clear()
+        self.form = Form.objects.create(title='Survey')
+        self.age = FormField.objects.create(form=self.form, label='Age', field_type='number')
+        self.start = FormField.objects.create(form=self.form, label='Start', field_type='date', required=False)
+        self.team = FormField.objects.create(form=self.form, label='Team', field_type='text', required=False)
+        items = [
+            {'response_fields': [
+                {'form_field': self.age.pk, 'answer': str(age)},
+                {'form_field': self.start.pk, 'answer': start},
+                {'form_field': self.team.pk, 'answer': team},
+            ]}
+            for age, start, team in ((20, '2024-03-01', 'A'), (30, '2023-01-15', 'B'), (40, '2024-12-31', 'A'))
+        ]
+        self.client.post(reverse('submit-form-response', args=[self.form.pk]), items, format='json')
+        self.url = reverse('form-analytics', args=[self.form.pk])
+
+
+class FormAnalyticsTests(FormResponsesTestCase):
+    def test_field_statistics(self):
+        response = self.client.get(self.url, {'bins': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['responses'], 3)
+        fields = {field['label']: field for field in response.data['fields']}
+        self.assertEqual((fields['Age']['min'], fields['Age']['max'], fields['Age']['mean']), (20, 40, 30))
+        self.assertEqual([bucket['count'] for bucket in fields['Age']['histogram']], [1, 2])
+        self.assertEqual((fields['Start']['earliest'], fields['Start']['latest']), (date(2023, 1, 15), date(2024, 12, 31)))
+        self.assertEqual((fields['Team']['count'], fields['Team']['distinct']), (3, 2))
+
+    def submit_age(self, age, form=None):
+        form = form or self.form
+        self.client.post(reverse('submit-form-response', args=[form.pk]), {'response_fields': [
+            {'form_field': form.fields.get(label='Age').pk, 'answer': str(age)},
+        ]}, format='json')
+
+    @mock.patch.object(analytics, 'ANALYTICS_MAX_STALENESS', 0)
+    def test_new_responses_refresh_the_cached_summary(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        # Form lookup only
+        self.assertEqual(len(queries), 1)
+        self.submit_age(90)
+        fields = {field['label']: field for field in self.client.get(self.url).data['fields']}
+        self.assertEqual(fields['Age']['max'], 90)
+        newest = FormResponse.objects.filter(form=self.form).order_by('-id')[:1]
+        FormResponseAdmin(FormResponse, admin.site).delete_queryset(None, FormResponse.objects.filter(pk__in=newest))
+        self.assertEqual(self.client.get(self.url).data['responses'], 3)
+
+    def test_busy_forms_are_summarized_at_most_once_per_staleness_window(self):
+        self.client.get(self.url)
+        self.submit_age(90)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).data['responses'], 3)
+        self.assertEqual(len(queries), 1)
+        with mock.patch.object(analytics, 'ANALYTICS_MAX_STALENESS', 0):
+            self.assertEqual(self.client.get(self.url).data['responses'], 4)
+
+    @mock.patch.object(analytics, 'ANALYTICS_MAX_STALENESS', 0)
+    def test_responses_only_invalidate_their_own_form(self):
+        other = Form.objects.create(title='Other')
+        FormField.objects.create(form=other, label='Age', field_type='number')
+        other_url = reverse('form-analytics', args=[other.pk])
+        self.client.get(self.url)
+        self.client.get(other_url)
+        self.client.get(reverse('form-detail', args=[self.form.pk]))
+        self.submit_age(90, form=other)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+            self.client.get(reverse('form-detail', args=[self.form.pk]))
+        self.assertEqual(len(queries), 1)  # The analytics form lookup
+        self.assertEqual(self.client.get(other_url).data['responses'], 1)
+
+    def test_invalid_bins(self):
+        self.assertEqual(self.client.get(self.url, {'bins': 'x'}).status_code, 400)
+
+
+class FormResponseFilterTests(FormResponsesTestCase):
+    def test_answers_are_stored_typed(self):
+        answer = FormResponseField.objects.filter(form_field=self.start).order_by('id').first()
+        self.assertEqual(answer.answer_date, date(2024, 3, 1))
+        self.assertIsNone(answer.answer_number)
+        self.assertEqual(FormResponseField.objects.filter(form_field=self.age).order_by('id').first().answer_number, 20)
+
+    def test_filter_by_number_and_date_range(self):
+        url = reverse('form-response-list', args=[self.form.pk])
+        response = self.client.get(url, {'field': self.age.pk, 'number_min': 25})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(url, {'field': self.start.pk, 'date_from': '2024-01-01', 'date_to': '2024-06-30'})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(self.client.get(url, {'number_min': 25}).status_code, 400)
+
+    def test_number_filter_uses_the_typed_index(self):
+        answers = FormResponseField.objects.filter(form_field=self.age, answer_number__gte=25)
+        plan = answers.explain()
+        self.assertIn('response_field_number_idx', plan)
+
+
+class FormResponseExportTests(FormResponsesTestCase):
+    def export(self, **params):
+        response = self.client.get(reverse('form-response-export', args=[self.form.pk]), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv_has_one_row_per_response_and_one_column_per_field(self):
+        lines = self.export().decode().splitlines()
+        self.assertEqual(lines[0], 'response_id,submitted_at,Age,Start,Team')
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[2].endswith(',30,2023-01-15,B'))
+
+    def test_missing_answers_and_filters(self):
+        self.client.post(reverse('submit-form-response', args=[self.form.pk]), {'response_fields': [
+            {'form_field': self.age.pk, 'answer': '55'},
+        ]}, format='json')
+        lines = self.export(field=self.age.pk, number_min=50).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith(',55,,'))
+
+    @skipUnless(exports.pyarrow, 'pyarrow is not installed')
+    def test_parquet_export_is_typed(self):
+        table = exports.pyarrow.parquet.read_table(exports.pyarrow.BufferReader(self.export(export_format='parquet')))
+        self.assertEqual(table.column_names, ['response_id', 'submitted_at', 'Age', 'Start', 'Team'])
+        self.assertEqual(table.column('Age').to_pylist(), [20.0, 30.0, 40.0])
+        self.assertEqual(table.column('Start').to_pylist()[1], date(2023, 1, 15))
+
+    @mock.patch.object(exports, 'EXPORT_BUFFER_SIZE', 1)
+    async def test_asgi_export_streams_chunk_by_chunk(self):
+        token = await sync_to_async(AccessToken.for_user)(self.admin)
+        response = await self.async_client.get(
+            reverse('form-response-export', args=[self.form.pk]), headers={'authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 3)
+        lines = b''.join(chunks).decode().splitlines()
+        self.assertEqual(lines[0], 'response_id,submitted_at,Age,Start,Team')
+        self.assertEqual(len(lines), 4)
+
+
+class FormResponseArchivalTests(FormResponsesTestCase):
+    def setUp(self):
+        super().setUp()
+        # Age the first two responses past the cutoff
+        self.old_ids = list(FormResponse.objects.order_by('id').values_list('id', flat=True)[:2])
+        FormResponse.objects.filter(id__in=self.old_ids).update(created_at=timezone.now() - timedelta(days=400))
+
+    def test_old_responses_move_to_the_archive_in_batches(self):
+        out = io.StringIO()
+        call_command('archive_form_responses', '--days', '365', '--batch-size', '1', stdout=out)
+        self.assertIn('Archived 2 responses', out.getvalue())
+        self.assertEqual(FormResponse.objects.count(), 1)
+        self.assertEqual(FormResponseField.objects.count(), 3)
+        archived = ArchivedFormResponse.objects.get(id=self.old_ids[0])
+        self.assertEqual(archived.period, archived.created_at.strftime('%Y-%m'))
+        self.assertEqual(archived.response_fields.count(), 3)
+
+    def test_archive_is_readable_by_analytics_and_export(self):
+        archival.archive_form_responses(before=archival.archive_cutoff(365))
+        response = self.client.get(self.url, {'source': 'archive'})
+        self.assertEqual(response.data['responses'], 2)
+        fields = {field['label']: field for field in response.data['fields']}
+        self.assertEqual((fields['Age']['min'], fields['Age']['max']), (20, 30))
+        self.assertEqual(self.client.get(self.url).data['responses'], 1)
+
+        export = self.client.get(reverse('form-response-export', args=[self.form.pk]), {'source': 'all'})
+        lines = b''.join(export.streaming_content).decode().splitlines()
+        self.assertEqual([line.split(',')[0] for line in lines[1:]], [str(i) for i in self.old_ids] + [
+            str(FormResponse.objects.get().id),
+        ])
+        listing = self.client.get(reverse('form-response-list', args=[self.form.pk]), {'source': 'archive'})
+        self.assertEqual(len(listing.data['results']), 2)
+
+    def test_admin_changelist_is_ordered_from_an_index(self):
+        request = RequestFactory().get('/admin/')
+        request.user = CustomUser.objects.create_superuser(username='root', email='root@example.com', password='x')
+        changelist = admin.site._registry[ArchivedFormResponse].get_changelist_instance(request)
+        plan = changelist.queryset.explain()
+        self.assertIn('archived_response_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_dry_run_moves_nothing(self):
+        out = io.StringIO()
+        call_command('archive_form_responses', '--dry-run', stdout=out)
+        self.assertIn('2 responses', out.getvalue())
+        self.assertFalse(ArchivedFormResponse.objects.exists())
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = CustomUser.objects.create_user(username='ada', email='ada@example.com', password='Initial-pass-123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_user_is_loaded_once_per_ttl(self):
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('profile'))
+        self.assertEqual(response.data['data']['username'], 'ada')
+        self.assertEqual(len(queries), 0)
+
+    def test_saving_the_user_evicts_the_cache(self):
+        self.client.get(reverse('profile'))
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+    def test_password_change_evicts_the_cache(self):
+        self.client.get(reverse('profile'))
+        self.assertIsNotNone(user_cache.get(user_cache_key(self.user.pk)))
+        response = self.client.post(reverse('change-password'), {
+            'old_password': 'Initial-pass-123', 'new_password': 'Changed-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(user_cache.get(user_cache_key(self.user.pk)))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Changed-pass-456'))
+
+
+class PasswordHashPoolTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='ada', email='ada@example.com', password='Initial-pass-123')
+        self.client = APIClient()
+
+    def login(self, password):
+        return self.client.post(reverse('login'), {'username': 'ada', 'password': password}, format='json')
+
+    def test_login_hashes_in_the_pool(self):
+        completed = password_hashers.completed
+        self.assertEqual(self.login('Initial-pass-123').status_code, 200)
+        self.assertEqual(self.login('wrong-password').status_code, 401)
+        self.assertEqual(password_hashers.completed, completed + 2)
+
+    def test_failed_logins_send_user_login_failed(self):
+        failures = []
+
+        def receiver(sender, credentials, request=None, **kwargs):
+            failures.append((sender, credentials))
+
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+        self.assertEqual(self.login('Initial-pass-123').status_code, 200)
+        self.assertEqual(self.login('wrong-password').status_code, 401)
+        self.assertEqual([(sender, credentials['username']) for sender, credentials in failures], [('django.contrib.auth', 'ada')])
+        self.assertNotIn('wrong-password', failures[0][1].values())
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.AllowAllUsersModelBackend'])
+    def test_other_backends_go_through_authenticate(self):
+        self.user.is_active = False
+        self.user.save()
+        # AllowAllUsersModelBackend accepts inactive users; the pooled shortcut would not
+        self.assertEqual(self.login('Initial-pass-123').status_code, 200)
+
+    def test_register_stores_a_usable_password(self):
+        response = self.client.post(reverse('register'), {
+            'username': 'grace', 'email': 'grace@example.com', 'password': 'Another-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(CustomUser.objects.get(username='grace').check_password('Another-pass-456'))
+
+    def test_saturated_pool_sheds_load(self):
+        rejected = password_hashers.rejected
+        with mock.patch.object(password_hashers, 'workers', 0), mock.patch.object(password_hashers, 'max_queue', 0):
+            response = self.login('Initial-pass-123')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(password_hashers.rejected, rejected + 1)
+
+
+class AsyncViewTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.employees = create_employees(5)
+        self.factory = APIRequestFactory()
+
+    def call(self, view_class, path, method='get', data=None, **kwargs):
+        request = getattr(self.factory, method)(path, data, format='json')
+        force_authenticate(request, user=self.admin)
+        view = view_class.as_view()
+        return async_to_sync(view)(request, **kwargs) if iscoroutinefunction(view) else view(request, **kwargs)
+
+    def test_list_and_detail_match_the_sync_views(self):
+        for sync_view, async_view, kwargs in (
+            (EmployeeListView, AsyncEmployeeListView, {}),
+            (EmployeeDetailView, AsyncEmployeeDetailView, {'pk': self.employees[0].pk}),
+        ):
+            employee_cache.clear()
+            expected = self.call(sync_view, '/?page_size=2', **kwargs)
+            employee_cache.clear()
+            response = self.call(async_view, '/?page_size=2', **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, expected.data)
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.call(AsyncEmployeeDetailView, '/', pk=0).status_code, 404)
+
+    def test_profile(self):
+        response = self.call(AsyncProfileView, '/')
+        self.assertEqual(response.data['data']['username'], 'admin')
+
+    def test_cached_jwt_users_keep_the_request_on_the_event_loop(self):
+        user_cache.clear()
+        view = AsyncProfileView.as_view()
+        token = f'Bearer {AccessToken.for_user(self.admin)}'
+        with mock.patch('employee_app.authentication.sync_to_async', wraps=sync_to_async) as loads, \
+                mock.patch('employee_app.async_views.sync_to_async', wraps=sync_to_async) as checks:
+            # A cache miss queries the user in a thread
+            response = async_to_sync(view)(self.factory.get('/', HTTP_AUTHORIZATION=token))
+            self.assertEqual(response.data['data']['username'], 'admin')
+            self.assertEqual(loads.call_count, 1)
+            with self.assertNumQueries(0):
+                self.assertEqual(async_to_sync(view)(self.factory.get('/', HTTP_AUTHORIZATION=token)).status_code, 200)
+                self.assertEqual(async_to_sync(view)(self.factory.get('/')).status_code, 401)
+                self.assertEqual(async_to_sync(view)(self.factory.get('/', HTTP_AUTHORIZATION='Bearer x')).status_code, 401)
+        self.assertEqual(loads.call_count, 1)
+        checks.assert_not_called()
+
+    def test_submit_form_response(self):
+        form = Form.objects.create(title='Survey')
+        field = FormField.objects.create(form=form, label='Name', field_type='text', order=0)
+        payload = {'response_fields': [{'form_field': field.pk, 'answer': 'Ada'}]}
+        response = self.call(AsyncSubmitFormResponseView, '/', 'post', payload, form_id=form.pk)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(FormResponseField.objects.get().answer, 'Ada')
+        self.assertEqual(self.call(AsyncSubmitFormResponseView, '/', 'post', payload, form_id=0).status_code, 404)
+
+
+# The primary doubles as the "replica", so reads routed to it can be observed
+@override_settings(DATABASE_REPLICAS={
+    'ALIASES': ['default'], 'STICKY_SECONDS': 10,
+    'URL_NAMES': ['employee-list', 'employee-detail', 'form-analytics'], 'NAMESPACES': [],
+})
+class ReplicaReadCachingTests(FormResponsesTestCase):
+    def test_replica_reads_do_not_fill_the_employee_cache(self):
+        employee = create_employees(1)[0]
+        for url in (reverse('employee-list'), reverse('employee-detail', args=[employee.pk])):
+            with self.subTest(url=url):
+                self.client.get(url)
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(self.client.get(url).status_code, 200)
+                self.assertGreater(len(queries), 0)
+
+    def test_replica_reads_do_not_cache_the_form_schema(self):
+        form_schemas.clear()
+        self.client.get(self.url)
+        self.assertEqual(form_schemas.stats()['size'], 0)
+        # Schemas are built from the primary even inside a replica read
+        token = replica_alias.set('replica-that-does-not-exist')
+        try:
+            self.assertIn(self.age.pk, form_schemas.get(self.form.pk).fields)
+        finally:
+            replica_alias.reset(token)
+
+    def test_replica_analytics_are_not_taken_as_current(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len(queries), 1)  # Served within the staleness window
+        with mock.patch.object(analytics, 'ANALYTICS_MAX_STALENESS', 0):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url)
+        self.assertGreater(len(queries), 1)
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    def load_databases(self, **environ):
+        """
+        DATABASES as settings.py builds it under ``environ``.
+        """
+        with mock.patch.dict(os.environ, environ):
+            return runpy.run_path(str(settings.BASE_DIR / 'employee_project' / 'settings.py'))['DATABASES']
+
+    def test_switch_turns_the_tuning_off(self):
+        default = self.load_databases(DJANGO_SQLITE_TUNED='0', ASYNC_API_VIEWS='0')['default']
+        self.assertNotIn('OPTIONS', default)
+        self.assertNotIn('CONN_MAX_AGE', default)
+
+    def test_tuned_connections_use_wal_and_immediate_transactions(self):
+        default = self.load_databases(DJANGO_SQLITE_TUNED='1', ASYNC_API_VIEWS='0')['default']
+        self.assertEqual(default['CONN_MAX_AGE'], 600)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # A connection of its own, on a scratch file
+        scratch = {**default, 'NAME': os.path.join(directory, 'tuned.sqlite3')}
+        tuned = ConnectionHandler({'default': scratch, 'tuned': scratch})['tuned']
+        self.addCleanup(tuned.close)
+        with tuned.cursor() as cursor:
+            self.assertEqual(cursor.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(cursor.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+            self.assertEqual(cursor.execute('PRAGMA busy_timeout').fetchone()[0], 5000)
+        self.assertEqual(tuned.transaction_mode, 'IMMEDIATE')
+
+    def test_no_persistent_connections_under_asgi(self):
+        default = self.load_databases(DJANGO_SQLITE_TUNED='1', ASYNC_API_VIEWS='1')['default']
+        self.assertEqual(default['CONN_MAX_AGE'], 0)
+
+
+@override_settings(DATABASE_REPLICAS={
+    'ALIASES': ['replica'], 'STICKY_SECONDS': 10, 'URL_NAMES': ['employee-list'], 'NAMESPACES': ['admin'],
+})
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def route(self, method, path, user_id=None, status_code=200):
+        """
+        The database an Employee read would use while ``path`` is served.
+        """
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(CustomUser(pk=user_id))}'} if user_id else {}
+        request = getattr(RequestFactory(), method)(path, **headers)
+        request.resolver_match = resolve(path)
+        seen = {}
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            seen['alias'] = ReplicaRouter().db_for_read(Employee)
+            return HttpResponse(status=status_code)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(request)
+        return seen['alias']
+
+    def aroute(self, method, path, user_id=None, status_code=200):
+        """
+        route() with the middleware in async mode, as the ASGI handler runs it.
+        """
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(CustomUser(pk=user_id))}'} if user_id else {}
+        request = getattr(RequestFactory(), method)(path, **headers)
+        request.resolver_match = resolve(path)
+        seen = {}
+
+        async def get_response(request):
+            self.assertTrue(iscoroutinefunction(middleware.process_view))
+            await middleware.process_view(request, None, (), {})
+            seen['alias'] = ReplicaRouter().db_for_read(Employee)
+            return HttpResponse(status=status_code)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        async_to_sync(middleware)(request)
+        return seen['alias']
+
+    def test_listed_reads_go_to_a_replica(self):
+        self.assertEqual(self.route('get', reverse('employee-list')), 'replica')
+        self.assertEqual(self.route('get', reverse('admin:index')), 'replica')
+        self.assertIsNone(self.route('get', reverse('profile')))
+        self.assertIsNone(self.route('post', reverse('employee-list'), user_id=1))
+
+    def test_writers_stick_to_the_primary(self):
+        self.route('post', reverse('employee-list'), user_id=1, status_code=400)
+        self.assertEqual(self.route('get', reverse('employee-list'), user_id=1), 'replica')
+        self.route('post', reverse('employee-list'), user_id=1, status_code=201)
+        self.assertIsNone(self.route('get', reverse('employee-list'), user_id=1))
+        self.assertEqual(self.route('get', reverse('employee-list'), user_id=2), 'replica')
+
+    def test_async_requests_are_routed_without_a_thread(self):
+        self.assertEqual(self.aroute('get', reverse('employee-list')), 'replica')
+        self.assertIsNone(self.aroute('get', reverse('profile')))
+        self.aroute('post', reverse('employee-list'), user_id=1, status_code=201)
+        self.assertIsNone(self.aroute('get', reverse('employee-list'), user_id=1))
+        self.assertIsNone(self.route('get', reverse('employee-list'), user_id=1))
+        self.assertEqual(self.aroute('get', reverse('employee-list'), user_id=2), 'replica')
+
+    @override_settings(DEBUG=True)
+    def test_asgi_handler_does_not_adapt_the_middleware(self):
+        with mock.patch('django.core.handlers.base.logger') as logger:
+            handler = ASGIHandler()
+        adapted = [call.args[1] for call in logger.debug.call_args_list if 'adapted' in call.args[0]]
+        self.assertEqual(adapted, [])
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+
+    def test_async_streamed_bodies_read_from_the_replica(self):
+        async def body():
+            yield ReplicaRouter().db_for_read(Employee).encode()
+
+        request = RequestFactory().get(reverse('employee-list'))
+        request.resolver_match = resolve(request.path)
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            return StreamingHttpResponse(body())
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(request)
+        self.assertTrue(response.is_async)
+
+        async def consume():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(async_to_sync(consume)(), b'replica')
+
+    @override_settings(DATABASE_REPLICAS={'ALIASES': [], 'URL_NAMES': ['employee-list']})
+    def test_without_replicas_everything_uses_the_primary(self):
+        self.assertIsNone(self.route('get', reverse('employee-list')))
+
+
+class EventLoopMiddlewareTests(TestCase):
+    def hops(self, call):
+        """
+        How many times middleware (ours or MiddlewareMixin's) handed a hook
+        to a thread while ``call`` ran.
+        """
+        with mock.patch('employee_app.middleware.sync_to_async', wraps=sync_to_async) as ours, \
+                mock.patch('django.utils.deprecation.sync_to_async', wraps=sync_to_async) as stock:
+            call()
+        return ours.call_count + stock.call_count
+
+    def test_api_requests_never_leave_the_event_loop(self):
+        user = CustomUser.objects.create_user(username='ada', email='ada@example.com', password='Initial-pass-123')
+        headers = {'authorization': f'Bearer {AccessToken.for_user(user)}'}
+        client = AsyncClient()
+        self.assertEqual(self.hops(lambda: async_to_sync(client.get)(reverse('profile'), headers=headers)), 0)
+
+    def test_sessions_are_saved_in_a_thread(self):
+        def run(view):
+            async def get_response(request):
+                view(request)
+                return HttpResponse()
+            async_to_sync(SessionMiddleware(get_response))(RequestFactory().get('/'))
+
+        self.assertEqual(self.hops(lambda: run(lambda request: request.session.get('seen'))), 0)
+        self.assertEqual(self.hops(lambda: run(lambda request: request.session.__setitem__('seen', True))), 1)
+
+    def test_csrf_tokens_are_checked_in_a_thread_for_unsafe_requests_only(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        def view(request):
+            return HttpResponse()
+
+        middleware = CsrfViewMiddleware(get_response)
+        for method, callback, hops in (('get', view, 0), ('post', csrf_exempt(view), 0), ('post', view, 1)):
+            request = getattr(RequestFactory(), method)('/')
+            self.assertEqual(self.hops(lambda: async_to_sync(middleware.process_view)(request, callback, (), {})), hops)
+
+class QueryMetricsTests(EmployeeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for histogram in metrics.REQUEST_HISTOGRAMS:
+            histogram.clear()
+
+    def test_server_timing_reports_queries(self):
+        create_employees(3)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employee-list'))
+        self.assertEqual(response.status_code, 200)
+        timings = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timings)
+        self.assertIn('serialize;dur=', timings)
+        self.assertIn('render;dur=', timings)
+        self.assertIn('total;dur=', timings)
+
+    async def test_asgi_requests_count_queries_made_in_threads(self):
+        await sync_to_async(create_employees)(3)
+        url = reverse('employee-list')
+        token = await sync_to_async(AccessToken.for_user)(self.admin)
+        headers = {'authorization': f'Bearer {token}'}
+
+        def count_sync_queries():
+            with CaptureQueriesContext(connection) as queries:
+                Client().get(url, headers=headers)
+            return len(queries)
+        query_count = await sync_to_async(count_sync_queries)()
+        employee_cache.clear()
+        user_cache.clear()
+
+        # The ORM runs in sync_to_async() threads, on their own connections
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        timings = response['Server-Timing']
+        self.assertGreater(query_count, 0)
+        self.assertIn(f'desc="{query_count} queries"', timings)
+        self.assertIn('serialize;dur=', timings)
+        self.assertIn('render;dur=', timings)
+        body = '\n'.join(metrics.request_db_queries.expose())
+        self.assertIn('http_request_db_queries_count{view="employee-list",method="GET"} 2', body)
+        self.assertIn(f'http_request_db_queries_sum{{view="employee-list",method="GET"}} {2 * query_count}', body)
+
+    def test_metrics_endpoint_exposes_endpoint_histograms(self):
+        create_employees(2)
+        self.client.get(reverse('employee-list'))
+        self.client.get(reverse('employee-list'))
+        self.client.generic('PURGE', reverse('employee-list'))
+        self.admin.is_staff = True
+        self.admin.save()
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.admin.is_admin = True
+        self.admin.save()
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_db_queries_count{view="employee-list",method="GET"} 2', body)
+        self.assertIn('http_request_render_duration_seconds_count{view="employee-list",method="GET"} 2', body)
+        # The second read was answered from the response cache
+        self.assertIn('http_request_serialize_duration_seconds_count{view="employee-list",method="GET"} 1', body)
+        self.assertIn('http_request_duration_seconds_count{view="employee-list",method="other"} 1', body)
+        self.assertNotIn('PURGE', body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('queries', 'Queries.', ('view',), (1, 5))
+        for value in (0, 1, 3, 9):
+            histogram.observe(('list',), value)
+        self.assertEqual(histogram.expose()[2:], [
+            'queries_bucket{view="list",le="1.0"} 2',
+            'queries_bucket{view="list",le="5.0"} 3',
+            'queries_bucket{view="list",le="+Inf"} 4',
+            'queries_sum{view="list"} 13.0',
+            'queries_count{view="list"} 4',
+        ])
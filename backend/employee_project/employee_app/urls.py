@@ -1,5 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from .views import RegisterUserView, LoginUserView, ChangePasswordView, ProfileView, EmployeeListView, EmployeeDetailView, CreateFormView, SubmitFormResponseView
+from .views import RegisterUserView, LoginUserView, ChangePasswordView, ProfileView, EmployeeListView, EmployeeDetailView, EmployeeBulkImportView, EmployeeExportView, EmployeeChangesView, CreateFormView, FormDetailView, FormAnalyticsView, FormResponseListView, FormResponseExportView, SubmitFormResponseView, RuntimeStatsView, MetricsView
+from .views import AsyncProfileView, AsyncEmployeeListView, AsyncEmployeeDetailView, AsyncFormDetailView, AsyncSubmitFormResponseView
+
+# Under ASGI (see employee_project/asgi.py) the busiest endpoints are served
+# by their async counterparts
+if settings.ASYNC_API_VIEWS:
+    ProfileView, EmployeeListView, EmployeeDetailView, FormDetailView, SubmitFormResponseView = (
+        AsyncProfileView, AsyncEmployeeListView, AsyncEmployeeDetailView, AsyncFormDetailView, AsyncSubmitFormResponseView,
+    )
 
 urlpatterns = [
 
@@ -11,9 +20,20 @@ urlpatterns = [
 
     path('employees/', EmployeeListView.as_view(), name='employee-list'),
     path('employees/<int:pk>/', EmployeeDetailView.as_view(), name='employee-detail'),
+    path('employees/bulk/', EmployeeBulkImportView.as_view(), name='employee-bulk-import'),
+    path('employees/export/', EmployeeExportView.as_view(), name='employee-export'),
+    path('employees/changes/', EmployeeChangesView.as_view(), name='employee-changes'),
 
 
     path('form/create/', CreateFormView.as_view(), name='create-form'),
+    path('form/<int:form_id>/', FormDetailView.as_view(), name='form-detail'),
+    path('form/<int:form_id>/analytics/', FormAnalyticsView.as_view(), name='form-analytics'),
+    path('form/<int:form_id>/responses/', FormResponseListView.as_view(), name='form-response-list'),
+    path('form/<int:form_id>/responses/export/', FormResponseExportView.as_view(), name='form-response-export'),
     path('form/<int:form_id>/submit/', SubmitFormResponseView.as_view(), name='submit-form-response'),
 
+
+    path('stats/', RuntimeStatsView.as_view(), name='runtime-stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+
 ]
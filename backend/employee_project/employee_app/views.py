@@ -1,25 +1,55 @@
+import time
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Employee
-from .serializers import EmployeeSerializer
+from .serializers import EmployeeSerializer, EmployeeListItemSerializer
 from rest_framework.permissions import IsAuthenticated
 from .serializers import RegisterUserSerializer, LoginUserSerializer, ChangePasswordSerializer
 from django.contrib.auth.password_validation import validate_password
 from .models import CustomUser
-from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password, verify_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import AllowAny
-from .filters import EmployeeFilter  # Import EmployeeFilter
-from .serializers import FormSerializer, FormResponseSerializer
-from .models import Form, FormResponse
+from .filters import EmployeeFilter, FormResponseFilter  # Import EmployeeFilter
+from .serializers import FormSerializer, FormDetailSerializer, FormResponseSerializer
+from .models import Form, FormField, FormResponse
+from .pagination import EmployeeCursorPagination, FormResponseCursorPagination
+from . import analytics, archival, bulk, exports, metrics, sync
+from .async_views import AsyncAPIView
+from .authentication import user_cache
+from .cache import employee_cache, form_cache, form_responses, read_stamps
+from .form_schema import form_schemas
+from .hashing import PoolSaturated, authenticate_user, password_hashers
+from .conditional import make_etag, negotiated_etag, not_modified, set_validators
+from .permissions import IsAppAdmin
+from .renderers import PrometheusRenderer
+from .routers import reading_from_primary
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import ValidationError
+
+
+# Answer for password requests shed while the hashing pool is saturated
+def hashing_unavailable_response():
+    response_data = {
+        'statuscode': status.HTTP_503_SERVICE_UNAVAILABLE,
+        'title': 'Service Unavailable',
+        'data': {},
+        'errors': {'error': 'Too many password operations in progress.'},
+        'message': 'The server is busy. Please try again shortly.'
+    }
+    return Response(response_data, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'})
 
 
 # User Registration View
-class RegisterUserView(APIView):
+class RegisterUserView(AsyncAPIView):
     permission_classes = [AllowAny]  # Allow unauthenticated access to the registration view
 
-    def post(self, request):
+    async def post(self, request):
         # Check if the user is already authenticated
         if request.user.is_authenticated:
             response_data = {
@@ -32,18 +62,19 @@ class RegisterUserView(APIView):
             return Response(response_data, status=status.HTTP_403_FORBIDDEN)
 
         serializer = RegisterUserSerializer(data=request.data)
-        if serializer.is_valid():
+        # The uniqueness validators query the database
+        if await sync_to_async(serializer.is_valid)():
             try:
-                # Create a new user
-                user = CustomUser.objects.create_user(
-                    username=serializer.validated_data['username'],
-                    email=serializer.validated_data['email'],
-                    password=serializer.validated_data['password']
+                # Create a new user, hashing the password in the worker pool
+                user = CustomUser(
+                    username=CustomUser.normalize_username(serializer.validated_data['username']),
+                    email=CustomUser.objects.normalize_email(serializer.validated_data['email']),
+                    password=await password_hashers.run(make_password, serializer.validated_data['password']),
                 )
-                user.save()
+                await user.asave()
 
-                # Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
+                # Generate JWT tokens (the blacklist app records them in the database)
+                refresh = await sync_to_async(RefreshToken.for_user)(user)
 
                 response_data = {
                     'statuscode': status.HTTP_201_CREATED,
@@ -57,6 +88,9 @@ class RegisterUserView(APIView):
                 }
                 return Response(response_data, status=status.HTTP_201_CREATED)
 
+            except PoolSaturated:
+                return hashing_unavailable_response()
+
             except Exception as e:
                 response_data = {
                     'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -77,10 +111,10 @@ class RegisterUserView(APIView):
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 # User Login View
-class LoginUserView(APIView):
+class LoginUserView(AsyncAPIView):
     permission_classes = [AllowAny]  # Allow unauthenticated access to login
 
-    def post(self, request):
+    async def post(self, request):
         if request.user.is_authenticated:
             return Response({
                 'statuscode': status.HTTP_403_FORBIDDEN,
@@ -90,12 +124,15 @@ class LoginUserView(APIView):
         
         serializer = LoginUserSerializer(data=request.data)
         if serializer.is_valid():
-            user = authenticate(username=serializer.validated_data['username'], 
-                                password=serializer.validated_data['password'])
+            try:
+                user = await authenticate_user(serializer.validated_data['username'],
+                                               serializer.validated_data['password'], request=request._request)
+            except PoolSaturated:
+                return hashing_unavailable_response()
 
             if user:
-                # Create JWT token for the user
-                refresh = RefreshToken.for_user(user)
+                # Create JWT token for the user (the blacklist app records it in the database)
+                refresh = await sync_to_async(RefreshToken.for_user)(user)
 
                 response_data = {
                     'statuscode': status.HTTP_200_OK,
@@ -131,10 +168,10 @@ class LoginUserView(APIView):
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 # Password Change View
-class ChangePasswordView(APIView):
+class ChangePasswordView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
         
         if serializer.is_valid():
@@ -142,8 +179,15 @@ class ChangePasswordView(APIView):
             old_password = serializer.validated_data['old_password']
             new_password = serializer.validated_data['new_password']
 
-            # Check if old password is correct
-            if not user.check_password(old_password):
+            try:
+                # The cached authentication user is loaded without its password
+                await user.arefresh_from_db(fields=['password'])
+                # Check if old password is correct
+                is_correct, _ = await password_hashers.run(verify_password, old_password, user.password)
+            except PoolSaturated:
+                return hashing_unavailable_response()
+
+            if not is_correct:
                 response_data = {
                     'statuscode': status.HTTP_400_BAD_REQUEST,
                     'title': 'Bad Request',
@@ -156,8 +200,8 @@ class ChangePasswordView(APIView):
             try:
                 # Validate and update the password
                 validate_password(new_password, user)
-                user.set_password(new_password)
-                user.save()
+                user.password = await password_hashers.run(make_password, new_password)
+                await user.asave()
 
                 response_data = {
                     'statuscode': status.HTTP_200_OK,
@@ -168,6 +212,9 @@ class ChangePasswordView(APIView):
                 }
                 return Response(response_data, status=status.HTTP_200_OK)
 
+            except PoolSaturated:
+                return hashing_unavailable_response()
+
             except Exception as e:
                 response_data = {
                     'statuscode': status.HTTP_400_BAD_REQUEST,
@@ -235,46 +282,194 @@ class ProfileView(APIView):
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# Async counterpart served under ASGI
+class AsyncProfileView(AsyncAPIView, ProfileView):
+    async def get(self, request):
+        # Authentication already loaded every field the profile shows, so a
+        # request whose user is cached never leaves the event loop
+        return super().get(request)
+
+
+# Columns every list query loads besides the requested ones (cursor and ETag)
+LIST_REQUIRED_COLUMNS = ('id', 'hire_date', 'version')
+# Columns of the nested user rendered by UserSerializer
+NESTED_USER_COLUMNS = ('user', 'user__id', 'user__username', 'user__email', 'user__is_admin')
+
+
+def get_field_selection(request):
+    """
+    Parse the comma separated fields=/exclude= query parameters into the
+    EmployeeSerializer fields to render. Unknown names are a ValidationError.
+    """
+    available = EmployeeSerializer.Meta.fields
+    selected = list(available)
+    for param in ('fields', 'exclude'):
+        names = [name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()]
+        if not names:
+            continue
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}."]})
+        if param == 'fields':
+            selected = [name for name in selected if name in names]
+        else:
+            selected = [name for name in selected if name not in names]
+    return selected
+
+
+def row_value(row, name):
+    # Pages hold model instances, or dicts for .values() querysets
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
 
 class EmployeeListView(APIView):
     permission_classes = [IsAuthenticated]  # Enforce authentication for employee details
+    pagination_class = EmployeeCursorPagination  # Keyset pagination on (-hire_date, id)
+
+    def get_list_source(self, request):
+        """
+        Return ``(queryset, serializer_class, serializer_kwargs)`` for the
+        requested representation. Columns that won't be rendered are never
+        loaded from the database.
+        """
+        # view=slim: the list grid representation straight from .values()
+        if request.query_params.get('view') == 'slim':
+            columns = [*EmployeeListItemSerializer.Meta.fields, 'hire_date', 'version']
+            return Employee.objects.values(*columns), EmployeeListItemSerializer, {}
+
+        selected = get_field_selection(request)
+        columns = [name for name in selected if name != 'user']
+        employees = Employee.objects.all()
+        if 'user' in selected:
+            employees = employees.select_related('user')  # Fetch the nested user in the same query
+            columns += NESTED_USER_COLUMNS
+        return employees.only(*columns, *LIST_REQUIRED_COLUMNS), EmployeeSerializer, {'fields': selected}
     
-    def get(self, request):
-        try:
-            employees = Employee.objects.all()
+    def filter_employees(self, request, employees):
+        # Apply the dynamic filters if any query parameters are passed
+        employee_filter = EmployeeFilter(request.GET, queryset=employees)  # Pass query parameters to the filter
+        employees = employee_filter.qs  # Apply the filter and get the filtered queryset
 
-            # Apply the dynamic filters if any query parameters are passed
-            employee_filter = EmployeeFilter(request.GET, queryset=employees)  # Pass query parameters to the filter
-            employees = employee_filter.qs  # Apply the filter and get the filtered queryset
+        # Free-text searches are ordered by relevance instead of hire date
+        if employee_filter.form.cleaned_data.get('q'):
+            self.pagination_ordering = ('search_rank', 'id')
+        return employees
 
-            if not employees:
-                response_data = {
-                    'statuscode': status.HTTP_404_NOT_FOUND,
-                    'title': 'Not Found',
-                    'data': [],
-                    'errors': {"error": "No employees found."},
-                    'message': 'No employees available.',
-                }
-                return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+    def paginate(self, request, employees):
+        """
+        Apply the filters and keyset pagination; returns ``(page, paginator)``.
+        """
+        # Only the requested page is loaded from the database
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(self.filter_employees(request, employees), request, view=self)
+        return page, paginator
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # The body's format follows the Accept header
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get_page_etag(self, cache_key, page, paginator):
+        versions = [(row_value(row, 'id'), row_value(row, 'version')) for row in page]
+        return make_etag(cache_key, versions, paginator.get_pagination_data())
+
+    def serialize_page(self, request, cache_key, page, paginator, serializer_class, serializer_kwargs):
+        """
+        The cached representation of one page, or None when the first page is empty.
+        """
+        if not page and not request.query_params.get(paginator.cursor_query_param):
+            return None
+
+        with metrics.serializing(request):
+            data = list(serializer_class(page, many=True, **serializer_kwargs).data)
+        return {
+            'data': data,
+            'pagination': paginator.get_pagination_data(),
+            'etag': self.get_page_etag(cache_key, page, paginator),
+        }
+
+    def get_page_data(self, request, cache_key):
+        """
+        Filter, paginate and serialize one page of employees. Returns None
+        when the first page is empty.
+        """
+        employees, serializer_class, serializer_kwargs = self.get_list_source(request)
+        page, paginator = self.paginate(request, employees)
+        return self.serialize_page(request, cache_key, page, paginator, serializer_class, serializer_kwargs)
 
-            serializer = EmployeeSerializer(employees, many=True)
+    def page_response(self, request, page_data):
+        """
+        Respond with a page from get_page_data(): 200, 304 when the client's
+        ETag matches, or 404 when there were no employees.
+        """
+        if page_data is None:
             response_data = {
-                'statuscode': status.HTTP_200_OK,
-                'title': 'Success',
-                'data': serializer.data,
-                'errors': None,
-                'message': 'Employee list retrieved successfully.',
+                'statuscode': status.HTTP_404_NOT_FOUND,
+                'title': 'Not Found',
+                'data': [],
+                'errors': {"error": "No employees found."},
+                'message': 'No employees available.',
             }
-            return Response(response_data, status=status.HTTP_200_OK)
-        except Exception as e:
+            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+
+        etag = negotiated_etag(request, page_data['etag'])
+        response = not_modified(request, etag=etag)
+        if response is not None:
+            return response
+
+        response_data = {
+            'statuscode': status.HTTP_200_OK,
+            'title': 'Success',
+            'data': page_data['data'],
+            'pagination': page_data['pagination'],
+            'errors': None,
+            'message': 'Employee list retrieved successfully.',
+        }
+        return set_validators(Response(response_data, status=status.HTTP_200_OK), etag=etag)
+
+    def get_error_response(self, e):
+        if isinstance(e, ValidationError):
             response_data = {
-                'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
-                'title': 'Internal Server Error',
+                'statuscode': status.HTTP_400_BAD_REQUEST,
+                'title': 'Bad Request',
                 'data': [],
-                'errors': {"error": str(e)},
-                'message': 'An error occurred while fetching the employee list.',
+                'errors': e.detail,
+                'message': 'Invalid query parameters.',
             }
-            return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        response_data = {
+            'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'title': 'Internal Server Error',
+            'data': [],
+            'errors': {"error": str(e)},
+            'message': 'An error occurred while fetching the employee list.',
+        }
+        return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get(self, request):
+        try:
+            # Repeated queries are answered from the response cache
+            cache_key = employee_cache.make_query_key('list', request.query_params)
+            page_data = employee_cache.get(cache_key)
+            if page_data is None:
+                # Check the client's ETag against the ids and versions of the page
+                # before loading or serializing anything else
+                if request.META.get('HTTP_IF_NONE_MATCH'):
+                    page, paginator = self.paginate(request, Employee.objects.only('id', 'hire_date', 'version'))
+                    if page:
+                        etag = negotiated_etag(request, self.get_page_etag(cache_key, page, paginator))
+                        response = not_modified(request, etag=etag)
+                        if response is not None:
+                            return response
+
+                page_data = self.get_page_data(request, cache_key)
+                if page_data is not None and reading_from_primary():
+                    employee_cache.set(cache_key, page_data)
+
+            return self.page_response(request, page_data)
+        except Exception as e:
+            return self.get_error_response(e)
 
     def post(self, request):
         try:
@@ -308,22 +503,222 @@ class EmployeeListView(APIView):
             }
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class EmployeeDetailView(APIView):
-    permission_classes = [IsAuthenticated]  # Enforce authentication for employee details
+# Async counterpart served under ASGI: reads go through the async ORM
+class AsyncEmployeeListView(AsyncAPIView, EmployeeListView):
+    async def apaginate(self, request, employees):
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(self.filter_employees(request, employees), request, view=self)
+        return page, paginator
 
-    def get(self, request, pk):
+    async def aget_page_data(self, request, cache_key):
+        employees, serializer_class, serializer_kwargs = self.get_list_source(request)
+        page, paginator = await self.apaginate(request, employees)
+        return self.serialize_page(request, cache_key, page, paginator, serializer_class, serializer_kwargs)
+
+    async def get(self, request):
         try:
-            employee = Employee.objects.get(pk=pk)
-            serializer = EmployeeSerializer(employee)
+            cache_key = employee_cache.make_query_key('list', request.query_params)
+            page_data = await employee_cache.aget(cache_key)
+            if page_data is None:
+                if request.META.get('HTTP_IF_NONE_MATCH'):
+                    page, paginator = await self.apaginate(request, Employee.objects.only('id', 'hire_date', 'version'))
+                    if page:
+                        etag = negotiated_etag(request, self.get_page_etag(cache_key, page, paginator))
+                        response = not_modified(request, etag=etag)
+                        if response is not None:
+                            return response
+
+                page_data = await self.aget_page_data(request, cache_key)
+                if page_data is not None and reading_from_primary():
+                    await employee_cache.aset(cache_key, page_data)
+
+            return self.page_response(request, page_data)
+        except Exception as e:
+            return self.get_error_response(e)
+
+    async def post(self, request):
+        # Creating an employee (and its user) stays synchronous, in a thread
+        return await sync_to_async(super().post)(request)
+
+class EmployeeBulkImportView(APIView):
+    permission_classes = [IsAuthenticated]  # Enforce authentication for employee import
+
+    def post(self, request):
+        try:
+            # Accept either a CSV upload ('file') or a JSON array of employees
+            upload = request.FILES.get('file')
+            rows = bulk.parse_csv(upload) if upload else request.data
+
+            if not isinstance(rows, list) or not rows:
+                response_data = {
+                    'statuscode': status.HTTP_400_BAD_REQUEST,
+                    'title': 'Bad Request',
+                    'data': {},
+                    'errors': {"error": "Expected a non-empty JSON array or a CSV file upload."},
+                    'message': 'Employee import failed.',
+                }
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            if len(rows) > bulk.MAX_IMPORT_ROWS:
+                response_data = {
+                    'statuscode': status.HTTP_400_BAD_REQUEST,
+                    'title': 'Bad Request',
+                    'data': {},
+                    'errors': {"error": f"At most {bulk.MAX_IMPORT_ROWS} rows can be imported at once."},
+                    'message': 'Employee import failed.',
+                }
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            employee_ids, errors = bulk.import_employees(rows)
+            if errors:
+                response_data = {
+                    'statuscode': status.HTTP_400_BAD_REQUEST,
+                    'title': 'Bad Request',
+                    'data': {},
+                    'errors': errors,
+                    'message': 'Employee import failed. No rows were imported.',
+                }
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            response_data = {
+                'statuscode': status.HTTP_201_CREATED,
+                'title': 'Created',
+                'data': {
+                    'created': len(employee_ids),
+                    'ids': employee_ids,
+                },
+                'errors': None,
+                'message': 'Employees imported successfully.',
+            }
+            return Response(response_data, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            response_data = {
+                'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'title': 'Internal Server Error',
+                'data': {},
+                'errors': {"error": str(e)},
+                'message': 'An error occurred while importing employees.',
+            }
+            return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class EmployeeExportView(APIView):
+    permission_classes = [IsAuthenticated]  # Enforce authentication for employee export
+
+    def get(self, request):
+        # 'format' is reserved by DRF for renderer selection, so use 'export_format'
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in exports.EXPORT_CONTENT_TYPES:
+            response_data = {
+                'statuscode': status.HTTP_400_BAD_REQUEST,
+                'title': 'Bad Request',
+                'data': [],
+                'errors': {"export_format": f"Choose one of: {', '.join(exports.EXPORT_CONTENT_TYPES)}."},
+                'message': 'Unsupported export format.',
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+        # Same filters as the employee list
+        employees = EmployeeFilter(request.GET, queryset=Employee.objects.all()).qs
+
+        response = StreamingHttpResponse(
+            exports.streaming_body(request, exports.stream_employees(employees, export_format)),
+            content_type=exports.EXPORT_CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="employees.{export_format}"'
+        return response
+
+class EmployeeChangesView(APIView):
+    permission_classes = [IsAuthenticated]  # Enforce authentication for employee sync
+
+    def get(self, request):
+        try:
+            # Without a token, hand out the current watermark to start syncing from
+            if 'since' not in request.query_params:
+                response_data = {
+                    'statuscode': status.HTTP_200_OK,
+                    'title': 'Success',
+                    'data': {'updated': [], 'deleted': [], 'next_token': sync.current_token(), 'has_more': False},
+                    'errors': None,
+                    'message': 'Sync token issued.',
+                }
+                return Response(response_data, status=status.HTTP_200_OK)
+
+            since = sync.parse_token(request.query_params['since'])
+            try:
+                limit = min(int(request.query_params.get('limit', sync.DEFAULT_CHANGES_LIMIT)), sync.MAX_CHANGES_LIMIT)
+            except ValueError:
+                limit = sync.DEFAULT_CHANGES_LIMIT
+
             response_data = {
                 'statuscode': status.HTTP_200_OK,
                 'title': 'Success',
-                'data': serializer.data,
+                'data': sync.get_changes(since, limit=max(limit, 1)),
                 'errors': None,
-                'message': 'Employee details retrieved successfully.',
+                'message': 'Employee changes retrieved successfully.',
             }
             return Response(response_data, status=status.HTTP_200_OK)
-        except Employee.DoesNotExist:
+        except ValidationError as e:
+            response_data = {
+                'statuscode': status.HTTP_400_BAD_REQUEST,
+                'title': 'Bad Request',
+                'data': {},
+                'errors': e.detail,
+                'message': 'Invalid sync token.',
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            response_data = {
+                'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'title': 'Internal Server Error',
+                'data': {},
+                'errors': {"error": str(e)},
+                'message': 'An error occurred while fetching employee changes.',
+            }
+            return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class EmployeeDetailView(APIView):
+    permission_classes = [IsAuthenticated]  # Enforce authentication for employee details
+
+    def get_etag(self, pk, version):
+        return make_etag('employee', pk, version)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # The body's format follows the Accept header
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get_cache_entry(self, employee, fields):
+        with metrics.serializing(self.request):
+            data = dict(EmployeeSerializer(employee, fields=fields).data)
+        return {
+            'data': data,
+            'etag': self.get_etag(employee.pk, employee.version),
+            'last_modified': employee.updated_at,
+        }
+
+    def detail_response(self, request, cached):
+        """
+        Respond with an entry from get_cache_entry(): 200, or 304 when the
+        client's validators match.
+        """
+        etag = negotiated_etag(request, cached['etag'])
+        response = not_modified(request, etag=etag, last_modified=cached['last_modified'])
+        if response is not None:
+            return response
+
+        response_data = {
+            'statuscode': status.HTTP_200_OK,
+            'title': 'Success',
+            'data': cached['data'],
+            'errors': None,
+            'message': 'Employee details retrieved successfully.',
+        }
+        response = Response(response_data, status=status.HTTP_200_OK)
+        return set_validators(response, etag=etag, last_modified=cached['last_modified'])
+
+    def get_error_response(self, e):
+        if isinstance(e, Employee.DoesNotExist):
             response_data = {
                 'statuscode': status.HTTP_404_NOT_FOUND,
                 'title': 'Not Found',
@@ -332,19 +727,50 @@ class EmployeeDetailView(APIView):
                 'message': 'No employee found with the given ID.',
             }
             return Response(response_data, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
+        if isinstance(e, ValidationError):
             response_data = {
-                'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
-                'title': 'Internal Server Error',
+                'statuscode': status.HTTP_400_BAD_REQUEST,
+                'title': 'Bad Request',
                 'data': [],
-                'errors': {"error": str(e)},
-                'message': 'An error occurred while fetching the employee details.',
+                'errors': e.detail,
+                'message': 'Invalid query parameters.',
             }
-            return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        response_data = {
+            'statuscode': status.HTTP_500_INTERNAL_SERVER_ERROR,
+            'title': 'Internal Server Error',
+            'data': [],
+            'errors': {"error": str(e)},
+            'message': 'An error occurred while fetching the employee details.',
+        }
+        return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def get(self, request, pk):
+        try:
+            cache_key = employee_cache.make_query_key(f'detail:{pk}', request.query_params)
+            cached = employee_cache.get(cache_key)
+            if cached is None:
+                # Conditional requests are answered from the version and timestamp alone
+                if request.META.get('HTTP_IF_NONE_MATCH') or request.META.get('HTTP_IF_MODIFIED_SINCE'):
+                    version, updated_at = Employee.objects.values_list('version', 'updated_at').get(pk=pk)
+                    etag = negotiated_etag(request, self.get_etag(pk, version))
+                    response = not_modified(request, etag=etag, last_modified=updated_at)
+                    if response is not None:
+                        return response
+
+                fields = get_field_selection(request)
+                employee = Employee.objects.select_related('user').get(pk=pk)
+                cached = self.get_cache_entry(employee, fields)
+                if reading_from_primary():
+                    employee_cache.set(cache_key, cached)
+
+            return self.detail_response(request, cached)
+        except Exception as e:
+            return self.get_error_response(e)
 
     def put(self, request, pk):
         try:
-            employee = Employee.objects.get(pk=pk)
+            employee = Employee.objects.select_related('user').get(pk=pk)
             serializer = EmployeeSerializer(employee, data=request.data)
             if serializer.is_valid():
                 serializer.save()
@@ -385,7 +811,7 @@ class EmployeeDetailView(APIView):
 
     def patch(self, request, pk):
         try:
-            employee = Employee.objects.get(pk=pk)
+            employee = Employee.objects.select_related('user').get(pk=pk)
             serializer = EmployeeSerializer(employee, data=request.data, partial=True)
             if serializer.is_valid():
                 serializer.save()
@@ -426,7 +852,7 @@ class EmployeeDetailView(APIView):
 
     def delete(self, request, pk):
         try:
-            employee = Employee.objects.get(pk=pk)
+            employee = Employee.objects.select_related('user').get(pk=pk)
             employee.delete()
             response_data = {
                 'statuscode': status.HTTP_204_NO_CONTENT,
@@ -456,6 +882,40 @@ class EmployeeDetailView(APIView):
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 
+# Async counterpart served under ASGI
+class AsyncEmployeeDetailView(AsyncAPIView, EmployeeDetailView):
+    async def get(self, request, pk):
+        try:
+            cache_key = employee_cache.make_query_key(f'detail:{pk}', request.query_params)
+            cached = await employee_cache.aget(cache_key)
+            if cached is None:
+                if request.META.get('HTTP_IF_NONE_MATCH') or request.META.get('HTTP_IF_MODIFIED_SINCE'):
+                    version, updated_at = await Employee.objects.values_list('version', 'updated_at').aget(pk=pk)
+                    etag = negotiated_etag(request, self.get_etag(pk, version))
+                    response = not_modified(request, etag=etag, last_modified=updated_at)
+                    if response is not None:
+                        return response
+
+                fields = get_field_selection(request)
+                employee = await Employee.objects.select_related('user').aget(pk=pk)
+                cached = self.get_cache_entry(employee, fields)
+                if reading_from_primary():
+                    await employee_cache.aset(cache_key, cached)
+
+            return self.detail_response(request, cached)
+        except Exception as e:
+            return self.get_error_response(e)
+
+    # Updates go through the nested serializer and its transaction, in a thread
+    async def put(self, request, pk):
+        return await sync_to_async(super().put)(request, pk)
+
+    async def patch(self, request, pk):
+        return await sync_to_async(super().patch)(request, pk)
+
+    async def delete(self, request, pk):
+        return await sync_to_async(super().delete)(request, pk)
+
 
 # View to create a dynamic form with fields and sections
 class CreateFormView(APIView):
@@ -466,7 +926,211 @@ class CreateFormView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-# View to submit form responses
+# View to read a form definition. The rendered body is cached per form,
+# version and media type, so repeat reads skip the database and rendering.
+class FormDetailView(APIView):
+    def get_queryset(self):
+        unsectioned = FormField.objects.filter(section__isnull=True)
+        return Form.objects.prefetch_related(
+            'sections__fields',
+            Prefetch('fields', queryset=unsectioned, to_attr='unsectioned_fields'),
+        )
+
+    def get_form(self, form_id):
+        return self.get_queryset().get(pk=form_id)
+
+    def get_cache_key(self, request, form_id):
+        # The form's version is checked through its generation stamp
+        return form_cache.make_key('detail', form_id, request.accepted_media_type)
+
+    def cached_response(self, request, body, etag):
+        """
+        304 when the client's ETag matches, or the cached body; None when
+        the form has to be loaded.
+        """
+        response = not_modified(request, etag=etag)
+        if response is not None or body is None:
+            return response
+
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = HttpResponse(body, content_type=content_type)
+        patch_vary_headers(response, ['Accept'])
+        return set_validators(response, etag=etag)
+
+    def render_form(self, request, form):
+        """
+        ``(body, data)`` for ``form``. The body is None for the browsable
+        API, which renders per request and is never cached.
+        """
+        renderer = request.accepted_renderer
+        with metrics.serializing(request):
+            data = FormDetailSerializer(form).data
+        if renderer.format == 'api':
+            return None, data
+        return renderer.render(data, request.accepted_media_type, self.get_renderer_context()), data
+
+    def form_response(self, request, body, data, etag):
+        if body is None:
+            return set_validators(Response(data, status=status.HTTP_200_OK), etag=etag)
+        return self.cached_response(request, body, etag)
+
+    def get(self, request, form_id):
+        # One round trip: the form's version, the cache generation and the body
+        cache_key = self.get_cache_key(request, form_id)
+        body, stamps = form_cache.lookup(cache_key, [form_schemas.generation_stamp(form_id)])
+        etag = make_etag('form', form_id, stamps[1])
+        response = self.cached_response(request, body, etag)
+        if response is not None:
+            return response
+
+        try:
+            form = self.get_form(form_id)
+        except Form.DoesNotExist:
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        body, data = self.render_form(request, form)
+        if body is not None and reading_from_primary():
+            form_cache.store(cache_key, body, stamps)
+        return self.form_response(request, body, data, etag)
+
+
+# Async counterpart served under ASGI: cache hits never leave the event loop
+class AsyncFormDetailView(AsyncAPIView, FormDetailView):
+    async def get(self, request, form_id):
+        cache_key = self.get_cache_key(request, form_id)
+        body, stamps = await form_cache.alookup(cache_key, [form_schemas.generation_stamp(form_id)])
+        etag = make_etag('form', form_id, stamps[1])
+        response = self.cached_response(request, body, etag)
+        if response is not None:
+            return response
+
+        try:
+            form = await self.get_queryset().aget(pk=form_id)
+        except Form.DoesNotExist:
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        body, data = self.render_form(request, form)
+        if body is not None and reading_from_primary():
+            await form_cache.astore(cache_key, body, stamps)
+        return self.form_response(request, body, data, etag)
+
+def get_response_source(request, allow_all=False):
+    """
+    Read ``source`` (live, archive, or with ``allow_all`` also all) and
+    return the archival.RESPONSE_SOURCES keys to read, oldest first.
+    """
+    source = request.query_params.get('source', 'live')
+    choices = [*archival.RESPONSE_SOURCES, *(['all'] if allow_all else [])]
+    if source not in choices:
+        raise ValidationError({'source': [f"Choose one of: {', '.join(choices)}."]})
+    return ['archive', 'live'] if source == 'all' else [source]
+
+# Per-field statistics over a form's responses, computed with aggregate
+# queries and cached until the form changes or its responses do
+class FormAnalyticsView(APIView):
+    def get(self, request, form_id):
+        try:
+            bins = int(request.query_params.get('bins', analytics.DEFAULT_HISTOGRAM_BINS))
+        except ValueError:
+            bins = 0
+        if not 1 <= bins <= analytics.MAX_HISTOGRAM_BINS:
+            return Response(
+                {'error': f'bins must be an integer between 1 and {analytics.MAX_HISTOGRAM_BINS}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            source, = get_response_source(request)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        title = Form.objects.filter(pk=form_id).values_list('title', flat=True).first()
+        if title is None:
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Keyed by the form definition; new responses only make a cached
+        # summary stale once it is older than ANALYTICS_MAX_STALENESS
+        (generation, version), _ = read_stamps([
+            form_responses.generation_stamp(form_id), form_schemas.generation_stamp(form_id),
+        ])
+        cache_key = form_cache.make_key('analytics', source, form_id, version, bins)
+        cached = form_cache.get(cache_key)
+        if cached is None or (
+            cached['generation'] != generation
+            and time.time() - cached['computed_at'] >= analytics.ANALYTICS_MAX_STALENESS
+        ):
+            summary = analytics.summarize_form(form_schemas.get(form_id), bins=bins, source=source)
+            # A replica may lag the generation, so its summary only lives out
+            # the staleness window and is never taken as current
+            current = generation if reading_from_primary() else None
+            cached = {'summary': summary, 'generation': current, 'computed_at': time.time()}
+            form_cache.set(cache_key, cached)
+        summary = cached['summary']
+
+        return Response({'id': form_id, 'title': title, 'source': source, **summary}, status=status.HTTP_200_OK)
+
+# View to list a form's responses, newest first, optionally filtered by
+# the answer to one field (see FormResponseFilter)
+class FormResponseListView(APIView):
+    pagination_class = FormResponseCursorPagination
+
+    def get(self, request, form_id):
+        if not Form.objects.filter(pk=form_id).exists():
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            source, = get_response_source(request)
+            response_model, _ = archival.RESPONSE_SOURCES[source]
+            response_filter = FormResponseFilter(request.GET, queryset=response_model.objects.filter(form_id=form_id))
+            if not response_filter.is_valid():
+                raise ValidationError(response_filter.errors)
+            responses = response_filter.qs.prefetch_related('response_fields')
+
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(responses, request, view=self)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            **paginator.get_pagination_data(),
+            'results': FormResponseSerializer(page, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+# View to download a form's responses as a wide table, one column per field
+class FormResponseExportView(APIView):
+    def get(self, request, form_id):
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in exports.FORM_EXPORT_CONTENT_TYPES:
+            return Response(
+                {'export_format': f"Choose one of: {', '.join(exports.FORM_EXPORT_CONTENT_TYPES)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Form.objects.filter(pk=form_id).exists():
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Same filters as the response list, over the live and/or archived responses
+        try:
+            sources = []
+            for source in get_response_source(request, allow_all=True):
+                response_model, _ = archival.RESPONSE_SOURCES[source]
+                response_filter = FormResponseFilter(request.GET, queryset=response_model.objects.filter(form_id=form_id))
+                if not response_filter.is_valid():
+                    raise ValidationError(response_filter.errors)
+                sources.append(response_filter.qs)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            exports.streaming_body(request, exports.stream_form_responses(form_id, sources, export_format)),
+            content_type=exports.FORM_EXPORT_CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="form-{form_id}-responses.{export_format}"'
+        return response
+
+# View to submit form responses; accepts one response object or a list of them
 class SubmitFormResponseView(APIView):
     def post(self, request, form_id):
         try:
@@ -474,9 +1138,90 @@ class SubmitFormResponseView(APIView):
         except Form.DoesNotExist:
             return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = FormResponseSerializer(data=request.data)
+        if not isinstance(request.data, list):
+            return self.post_single(request.data, form)
+        return self.post_batch(request.data, form)
+
+    def post_single(self, data, form):
+        serializer = FormResponseSerializer(data=data, context={'form': form})
         if serializer.is_valid():
             serializer.save(form=form)  # Save the form response
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def post_batch(self, items, form):
+        if not items or len(items) > bulk.MAX_SUBMIT_RESPONSES:
+            response_data = {
+                'statuscode': status.HTTP_400_BAD_REQUEST,
+                'title': 'Bad Request',
+                'data': {},
+                'errors': {"error": f"Expected between 1 and {bulk.MAX_SUBMIT_RESPONSES} responses."},
+                'message': 'Form responses were not submitted.',
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+        _, created, errors = bulk.submit_form_responses(form, items)
+        if not created:
+            response_status, title, message = status.HTTP_400_BAD_REQUEST, 'Bad Request', 'No form responses were valid.'
+        elif errors:
+            response_status, title, message = status.HTTP_207_MULTI_STATUS, 'Multi-Status', 'Some form responses were rejected.'
+        else:
+            response_status, title, message = status.HTTP_201_CREATED, 'Created', 'Form responses submitted successfully.'
+
+        response_data = {
+            'statuscode': response_status,
+            'title': title,
+            'data': {'created': created},
+            'errors': errors or None,
+            'message': message,
+        }
+        return Response(response_data, status=response_status)
+
+
+# Async counterpart served under ASGI
+class AsyncSubmitFormResponseView(AsyncAPIView, SubmitFormResponseView):
+    async def post(self, request, form_id):
+        try:
+            form = await Form.objects.aget(id=form_id)
+        except Form.DoesNotExist:
+            return Response({'error': 'Form not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Saving needs a transaction, which the async ORM can't open, so
+        # validation and the inserts run together in a thread
+        if not isinstance(request.data, list):
+            return await sync_to_async(self.post_single)(request.data, form)
+        return await sync_to_async(self.post_batch)(request.data, form)
+
+
+# Runtime counters for the in-process caches
+class RuntimeStatsView(APIView):
+    permission_classes = [IsAppAdmin]  # Admins only
+
+    def get(self, request):
+        response_data = {
+            'statuscode': status.HTTP_200_OK,
+            'title': 'Success',
+            'data': {
+                'employee_cache': employee_cache.stats(),
+                'form_schemas': form_schemas.stats(),
+                'form_cache': form_cache.stats(),
+                'auth_user_cache': user_cache.stats(),
+                'password_hashers': password_hashers.stats(),
+            },
+            'errors': None,
+            'message': 'Runtime statistics retrieved successfully.',
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+# Per-endpoint request histograms (see middleware.QueryMetricsMiddleware)
+class MetricsView(APIView):
+    permission_classes = [IsAppAdmin]  # Admins only
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(
+            metrics.render_metrics(), status=status.HTTP_200_OK,
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
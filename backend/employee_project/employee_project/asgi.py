@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_project.settings')
+# Serve the async counterparts of the API views (see ASYNC_API_VIEWS)
+os.environ.setdefault('ASYNC_API_VIEWS', '1')
 
 application = get_asgi_application()
@@ -1,4 +1,6 @@
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -36,14 +38,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
+    'employee_app.middleware.QueryMetricsMiddleware',  # Outermost, so it times the whole stack
+    # Django's middleware, subclassed to run on the event loop under ASGI
+    'employee_app.middleware.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'employee_app.middleware.SessionMiddleware',
+    'employee_app.middleware.CommonMiddleware',
+    'employee_app.middleware.CsrfViewMiddleware',
+    'employee_app.middleware.AuthenticationMiddleware',
+    'employee_app.middleware.MessageMiddleware',
+    'employee_app.middleware.XFrameOptionsMiddleware',
+    'employee_app.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'employee_project.urls'
@@ -65,6 +70,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'employee_project.wsgi.application'
+ASGI_APPLICATION = 'employee_project.asgi.application'
+
+# Route the profile, employee, form detail and form submission endpoints to
+# their async views; asgi.py turns this on, WSGI keeps the synchronous ones
+ASYNC_API_VIEWS = os.environ.get('ASYNC_API_VIEWS', '0') == '1'
 
 
 # Database
@@ -77,6 +87,58 @@ DATABASES = {
     }
 }
 
+# Production mode for SQLite, off by default (DJANGO_SQLITE_TUNED=1 turns it on)
+SQLITE_TUNING = {
+    'ENABLED': os.environ.get('DJANGO_SQLITE_TUNED', '0') == '1',
+    # Run on every new connection
+    'PRAGMAS': {
+        'journal_mode': 'WAL',  # Readers no longer wait for a writer, and vice versa
+        'synchronous': 'NORMAL',  # Durable in WAL mode except on power loss; no fsync per commit
+        'mmap_size': 256 * 1024 * 1024,  # Read pages through the OS page cache
+        'cache_size': -64 * 1024,  # Negative means KiB: 64 MiB of page cache per connection
+        'temp_store': 'MEMORY',
+    },
+    'BUSY_TIMEOUT': 5,  # Seconds to wait on a lock before "database is locked" (sqlite3 busy_timeout)
+    # Take the write lock at BEGIN, so a transaction that reads first can't
+    # fail to upgrade its lock half way through
+    'TRANSACTION_MODE': 'IMMEDIATE',
+    # Persistent connections; Django advises against them under ASGI, where
+    # each request may run on a different thread
+    'CONN_MAX_AGE': 0 if ASYNC_API_VIEWS else 600,
+}
+
+if SQLITE_TUNING['ENABLED']:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': SQLITE_TUNING['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_TUNING['PRAGMAS'].items()),
+            'timeout': SQLITE_TUNING['BUSY_TIMEOUT'],
+            'transaction_mode': SQLITE_TUNING['TRANSACTION_MODE'],
+        },
+    })
+
+
+# Read replicas. Safe requests to URL_NAMES and NAMESPACES read from one of
+# ALIASES, except for users who wrote within the last STICKY_SECONDS. For
+# local testing, list SQLite files in DJANGO_SQLITE_REPLICAS (comma
+# separated) and keep them in sync with `manage.py sync_replica`.
+DATABASE_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': 10,
+    'CACHE_ALIAS': 'default',  # Holds the sticky marks; must be shared by all processes
+    'URL_NAMES': [
+        'employee-list', 'employee-detail', 'employee-export',
+        'form-analytics', 'form-response-list', 'form-response-export',
+    ],
+    'NAMESPACES': ['admin'],
+}
+
+for _index, _path in enumerate(filter(None, os.environ.get('DJANGO_SQLITE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{_index}'] = {**DATABASES['default'], 'NAME': _path, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS['ALIASES'].append(f'replica{_index}')
+
+DATABASE_ROUTERS = ['employee_app.routers.ReplicaRouter']
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -127,13 +189,26 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # for testing endpoints that require JWT tokens.
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT Authentication
+        'employee_app.authentication.CachedJWTAuthentication',  # JWT Authentication with a cached user lookup
     ),
 
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',  # Require authentication by default
     ],
 
+    # orjson for JSON (stdlib json if orjson is missing), MessagePack when installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'employee_app.renderers.ORJSONRenderer',
+        *(['employee_app.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'employee_app.renderers.ORJSONParser',
+        *(['employee_app.renderers.MessagePackParser'] if find_spec('msgpack') else []),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,  # Optional pagination settings
@@ -150,6 +225,65 @@ REST_FRAMEWORK = {
 # }
 
 
+# Cache backend for API response caching. LocMemCache is per process; point
+# this at Redis or Memcached so invalidations reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Employee list/detail response cache (in-process LRU in front of CACHES)
+EMPLOYEE_CACHE = {
+    'ALIAS': 'default',
+    'LRU_SIZE': 256,  # Entries kept in each process
+    'TIMEOUT': 300,  # Seconds an entry lives in the shared backend
+}
+
+# Users resolved by CachedJWTAuthentication, kept per process
+AUTH_USER_CACHE = {
+    'LRU_SIZE': 1024,  # Users kept in each process
+    'TTL': 60,  # Seconds before a cached user is re-read (bounds staleness across processes)
+}
+
+# Worker threads that run password hashing for login, registration and
+# password changes; requests beyond WORKERS + MAX_QUEUE get a 503
+PASSWORD_HASH_POOL = {
+    'WORKERS': max(1, (os.cpu_count() or 2) // 2),
+    'MAX_QUEUE': 16,
+}
+
+# Compiled per-form validators used when submitting form responses
+FORM_SCHEMA_CACHE = {
+    'ALIAS': 'default',  # Holds the per-form generation numbers
+    'LRU_SIZE': 512,  # Schemas kept in each process
+}
+
+# Archival of old form responses (manage.py archive_form_responses, or
+# employee_app.archival.scheduled_archive from a scheduler)
+FORM_RESPONSE_ARCHIVE = {
+    'AFTER_DAYS': 365,  # Responses older than this move to the archive tables
+    'BATCH_SIZE': 500,  # Responses moved per transaction
+}
+
+# Rendered form definitions served by GET /api/form/<id>/ and form analytics
+FORM_CACHE = {
+    'ALIAS': 'default',
+    'LRU_SIZE': 256,  # Rendered bodies kept in each process
+    'TIMEOUT': 3600,  # Seconds a body lives in the shared backend
+    'ANALYTICS_MAX_STALENESS': 30,  # Seconds cached analytics may lag behind new responses
+}
+
+
+# Per-request query counts and timings (employee_app.middleware.QueryMetricsMiddleware),
+# served as per-endpoint histograms by GET /api/metrics/
+QUERY_METRICS = {
+    'SERVER_TIMING': True,  # Add a Server-Timing header to every response
+    'DURATION_BUCKETS': (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),  # Seconds
+    'QUERY_COUNT_BUCKETS': (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500),
+}
+
+
 # Allow CORS for frontend development
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',  # React/Vue/Angular frontend